@@ -14,7 +14,7 @@ type AuditQueryParams = {
   start?: string;
   end?: string;
   decision?: "ALLOW" | "DENY";
-  page: number;
+  cursor?: string;
   limit: number;
 };
 
@@ -61,7 +61,6 @@ export async function GET(request: Request) {
   loadEnv();
 
   const { searchParams } = new URL(request.url);
-  const page = Math.max(parseInt(searchParams.get("page") || "1", 10), 1);
   const limit = Math.min(Math.max(parseInt(searchParams.get("limit") || "50", 10), 1), 200);
 
   const params: AuditQueryParams = {
@@ -69,7 +68,7 @@ export async function GET(request: Request) {
     start: searchParams.get("start") || undefined,
     end: searchParams.get("end") || undefined,
     decision: (searchParams.get("decision") as "ALLOW" | "DENY" | null) || undefined,
-    page,
+    cursor: searchParams.get("cursor") || undefined,
     limit,
   };
 
@@ -77,63 +76,51 @@ export async function GET(request: Request) {
     "-c",
     [
       "import json, sys",
-      "from modules.metadata.app.db import connection_cursor",
+      "from datetime import datetime",
+      "from modules.metadata.app.repository import AuditLogRepository",
       "params = json.loads(sys.argv[1])",
       "actor = params.get('actor')",
       "start = params.get('start')",
       "end = params.get('end')",
       "decision = params.get('decision')",
-      "page = int(params.get('page', 1))",
       "limit = int(params.get('limit', 50))",
-      "offset = (page - 1) * limit",
-      "where = []",
-      "values = []",
-      "if actor:",
-      "    where.append(\"actor = %s\")",
-      "    values.append(actor)",
-      "if start:",
-      "    where.append(\"created_at >= %s\")",
-      "    values.append(start)",
-      "if end:",
-      "    where.append(\"created_at <= %s\")",
-      "    values.append(end)",
-      "if decision in ('ALLOW', 'DENY'):",
-      "    # audit.details is expected to contain decision: {decision: ALLOW|DENY, reasons: [...]}",
-      "    where.append(\"details->'decision'->>'decision' = %s\")",
-      "    values.append(decision)",
-      "where_clause = f\" WHERE {' AND '.join(where)}\" if where else \"\"",
-      "count_query = f\"SELECT COUNT(*) AS count FROM audit_log{where_clause}\"",
-      "data_query = f\"\"\"",
-      "SELECT",
-      "    audit_id,",
-      "    actor,",
-      "    action,",
-      "    document_id,",
-      "    version_id,",
-      "    model_version,",
-      "    index_version,",
-      "    details,",
-      "    created_at",
-      "FROM audit_log",
-      "{where_clause}",
-      "ORDER BY created_at DESC",
-      "LIMIT %s OFFSET %s",
-      "\"\"\"",
-      "with connection_cursor(dict_cursor=True) as cur:",
-      "    cur.execute(count_query, values)",
-      "    total = int(cur.fetchone().get('count', 0))",
-      "    cur.execute(data_query, values + [limit, offset])",
-      "    entries = [dict(r) for r in cur.fetchall()]",
-      "    cur.execute(\"SELECT DISTINCT actor FROM audit_log ORDER BY actor\")",
-      "    actors = [r['actor'] for r in cur.fetchall()]",
-      "print(json.dumps({'entries': entries, 'total': total, 'page': page, 'limit': limit, 'actors': actors}, default=str))",
+      "cursor = None",
+      "if params.get('cursor'):",
+      "    created_at, audit_id = params['cursor'].rsplit('|', 1)",
+      "    cursor = (datetime.fromisoformat(created_at), int(audit_id))",
+      "# Keyset page on (created_at, audit_id), newest first; one extra row tells whether another page exists.",
+      "# Rows come from audit_log_expanded, so details carry their interned context again.",
+      "# The window is [start, end): end is exclusive, like AuditLogRepository.query and the rollup days.",
+      "decision = decision if decision in ('ALLOW', 'DENY') else None",
+      "since = datetime.fromisoformat(start) if start else None",
+      "until = datetime.fromisoformat(end) if end else None",
+      "rows = AuditLogRepository.query(",
+      "    actor=actor or None,",
+      "    decision=decision,",
+      "    since=since,",
+      "    until=until,",
+      "    cursor=cursor,",
+      "    limit=limit + 1,",
+      "    # The page shows AUTHZ_BATCH counts only, not every allowed and denied id.",
+      "    decision_sets=False,",
+      ")",
+      "entries = rows[:limit]",
+      "next_cursor = None",
+      "if len(rows) > limit:",
+      "    last = entries[-1]",
+      "    next_cursor = f\"{last['created_at'].isoformat()}|{last['audit_id']}\"",
+      "# Totals and the actor list come from audit_daily_rollup (audit_maintenance rollup) for whole",
+      "# days it has completed; partial days at the window edges and days not rolled up yet are counted live.",
+      "total = AuditLogRepository.event_total(actor=actor or None, decision=decision, since=since, until=until)",
+      "actors = AuditLogRepository.event_actors()",
+      "print(json.dumps({'entries': entries, 'total': total, 'next_cursor': next_cursor, 'limit': limit, 'actors': actors}, default=str))",
     ].join("\n"),
     JSON.stringify(params),
   ];
 
   try {
     const output = await runPython(script);
-    const parsed = output ? JSON.parse(output) : { entries: [], total: 0, actors: [] };
+    const parsed = output ? JSON.parse(output) : { entries: [], total: 0, next_cursor: null, actors: [] };
     return Response.json(parsed);
   } catch (err) {
     const message = err instanceof Error ? err.message : "failed to load audit log";
@@ -21,7 +21,7 @@ type AuditEntry = {
 type ApiResponse = {
   entries: AuditEntry[];
   total: number;
-  page: number;
+  next_cursor: string | null;
   limit: number;
   actors: string[];
   error?: string;
@@ -46,6 +46,20 @@ function decisionFromDetails(details?: Record<string, any> | null): "ALLOW" | "D
   return null;
 }
 
+function batchSummary(details?: Record<string, any> | null): string | null {
+  if (!details || typeof details.evaluated_count !== "number") return null;
+  return `${details.allowed_count ?? 0} allowed / ${details.denied_count ?? 0} denied of ${details.evaluated_count}`;
+}
+
+function contextSummary(details?: Record<string, any> | null): string | null {
+  // Interned contexts are re-attached by the audit_log_expanded view the route reads.
+  const context = details?.context;
+  if (!context || typeof context !== "object") return null;
+  const roles = Array.isArray(context.roles) ? context.roles.join(", ") : "—";
+  const projects = Array.isArray(context.project_codes) && context.project_codes.length ? context.project_codes.join(", ") : "—";
+  return `roles ${roles} · projects ${projects} · classification ${context.classification ?? "—"}`;
+}
+
 function querySummary(details?: Record<string, any> | null): string {
   if (!details) return "—";
   if (typeof details.query === "string" && details.query.trim()) return details.query.trim();
@@ -66,7 +80,10 @@ export default function AuditPage() {
   const [entries, setEntries] = useState<AuditEntry[]>([]);
   const [actors, setActors] = useState<string[]>([]);
   const [total, setTotal] = useState(0);
-  const [page, setPage] = useState(1);
+  // Keyset pagination: cursors[i] fetches page i + 1 (null for the newest page).
+  const [cursors, setCursors] = useState<(string | null)[]>([null]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const page = cursors.length;
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const [filters, setFilters] = useState<Filters>({
@@ -79,23 +96,22 @@ export default function AuditPage() {
   const totalPages = useMemo(() => Math.max(1, Math.ceil(total / PAGE_LIMIT)), [total]);
 
   useEffect(() => {
-    fetchAudit();
+    fetchAudit(cursors[cursors.length - 1]);
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, [page]);
+  }, [cursors]);
 
   const applyFilters = () => {
-    setPage(1);
-    fetchAudit(1);
+    setCursors([null]);
   };
 
-  async function fetchAudit(forcedPage?: number) {
+  async function fetchAudit(cursor: string | null) {
     setLoading(true);
     setError(null);
     try {
       const params = new URLSearchParams({
-        page: String(forcedPage ?? page),
         limit: String(PAGE_LIMIT),
       });
+      if (cursor) params.set("cursor", cursor);
       if (filters.actor) params.set("actor", filters.actor);
       if (filters.start) params.set("start", filters.start);
       if (filters.end) params.set("end", filters.end);
@@ -109,6 +125,7 @@ export default function AuditPage() {
       const data = (await res.json()) as ApiResponse;
       setEntries(data.entries || []);
       setTotal(Number(data.total || 0));
+      setNextCursor(data.next_cursor || null);
       setActors(data.actors || []);
     } catch (err) {
       setError(err instanceof Error ? err.message : "Failed to load audit log");
@@ -145,7 +162,9 @@ export default function AuditPage() {
         <div className="flex flex-wrap items-center justify-between gap-3">
           <div>
             <p className="panel-heading">Filters</p>
-            <p className="mt-1 text-xs text-ink-500">Actor list is sourced from all audit records, not just the current page.</p>
+            <p className="mt-1 text-xs text-ink-500">
+              Actor list and totals come from the daily audit rollup, topped up with a live count for days it has not covered yet. The end time is exclusive.
+            </p>
           </div>
           <button
             type="button"
@@ -184,7 +203,7 @@ export default function AuditPage() {
           </label>
 
           <label className="flex flex-col gap-1 text-sm text-ink-700">
-            End (UTC)
+            End (UTC, exclusive)
             <input
               type="datetime-local"
               value={filters.end}
@@ -275,6 +294,12 @@ export default function AuditPage() {
                         <div className="max-w-xl break-words" title={querySummary(entry.details)}>
                           {querySummary(entry.details)}
                         </div>
+                        {batchSummary(entry.details) ? (
+                          <div className="mt-1 text-xs text-ink-500">Batch: {batchSummary(entry.details)}</div>
+                        ) : null}
+                        {contextSummary(entry.details) ? (
+                          <div className="mt-1 text-xs text-ink-500">Context: {contextSummary(entry.details)}</div>
+                        ) : null}
                         {entry.details?.decision?.reasons?.length ? (
                           <div className="mt-1 text-xs text-ink-500">
                             Reasons: {(entry.details.decision.reasons as string[]).join(", ")}
@@ -301,19 +326,19 @@ export default function AuditPage() {
           <div className="flex items-center gap-2">
             <button
               type="button"
-              onClick={() => setPage((p) => Math.max(1, p - 1))}
+              onClick={() => setCursors((prev) => (prev.length > 1 ? prev.slice(0, -1) : prev))}
               disabled={page === 1}
               className="rounded-full border border-ink-200 px-3 py-1 text-xs font-semibold uppercase tracking-[0.2em] text-ink-700 disabled:opacity-50"
             >
               Prev
             </button>
             <span className="text-xs text-ink-600">
-              Page {page} / {totalPages}
+              Page {page} / {Math.max(page, totalPages)}
             </span>
             <button
               type="button"
-              onClick={() => setPage((p) => Math.min(totalPages, p + 1))}
-              disabled={page >= totalPages}
+              onClick={() => nextCursor && setCursors((prev) => [...prev, nextCursor])}
+              disabled={!nextCursor}
               className="rounded-full border border-ink-200 px-3 py-1 text-xs font-semibold uppercase tracking-[0.2em] text-ink-700 disabled:opacity-50"
             >
               Next
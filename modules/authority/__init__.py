@@ -1,11 +1,19 @@
 from .app.context import AuthorityContext
-from .app.engine import AccessDecision, evaluate_document_access, get_allowed_document_ids
+from .app.engine import (
+	AccessDecision,
+	evaluate_document_access,
+	evaluate_documents_access,
+	get_allowed_acl_groups,
+	get_allowed_document_ids,
+)
 from .app.policy import validate_authority_level, load_default_context
 
 __all__ = [
 	"AuthorityContext",
 	"AccessDecision",
 	"evaluate_document_access",
+	"evaluate_documents_access",
+	"get_allowed_acl_groups",
 	"get_allowed_document_ids",
 	"validate_authority_level",
 	"load_default_context",
@@ -0,0 +1,114 @@
+"""LRU/TTL cache of per-context allowed sets, keyed by the security-relevant context."""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+from .config import settings
+from .context import AuthorityContext
+from .rule_index import AllowedSummary
+
+T = TypeVar("T")
+
+
+def context_cache_key(context: AuthorityContext) -> str:
+    """
+    Canonical hash of the fields evaluation depends on. ``user`` is left out
+    and roles/project codes are compared as sets, so contexts that differ
+    only in those ways share an entry.
+    """
+    canonical = {
+        "roles": sorted(set(context.roles or [])),
+        "project_codes": sorted(set(context.project_codes or [])),
+        "discipline": context.discipline,
+        "classification": context.classification,
+        "commercial_sensitivity": context.commercial_sensitivity,
+    }
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class AllowedSetCache(Generic[T]):
+    """
+    Values computed for a context against one rules version, keyed by
+    (rules version, context_cache_key).
+
+    Entries are only served for the version they were computed at, and the
+    first lookup with another version drops every entry, so a rule or
+    document write is never masked by the cache and stale entries do not
+    linger. Least recently used entries are
+    evicted beyond ``max_entries``, and entries expire after ``ttl`` seconds.
+    """
+
+    def __init__(self, *, max_entries: int = 256, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[Hashable, str], Tuple[float, T]]" = OrderedDict()
+        self._version: Optional[Hashable] = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "invalidations": 0,
+        }
+
+    def get_or_compute(self, version: Optional[Hashable], context: AuthorityContext, compute: Callable[[], T]) -> T:
+        if self.max_entries <= 0 or version is None:
+            return compute()
+        key = (version, context_cache_key(context))
+        now = time.monotonic()
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    self._stats["invalidations"] += 1
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] >= self.ttl:
+                del self._entries[key]
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[1]
+            self._stats["misses"] += 1
+
+        value = compute()
+        with self._lock:
+            if version == self._version:
+                self._entries[key] = (now, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = len(self._entries)
+        lookups = snapshot["hits"] + snapshot["misses"]
+        snapshot["hit_rate_pct"] = round(100 * snapshot["hits"] / lookups) if lookups else 0
+        return snapshot
+
+
+# Allowed bitmaps and batch-audit counts, shared by every caller; per-document
+# decisions are never cached.
+allowed_set_cache: "AllowedSetCache[AllowedSummary]" = AllowedSetCache(
+    max_entries=settings.allowed_cache_size, ttl=settings.allowed_cache_ttl
+)
+
+
+def cache_stats() -> Dict[str, int]:
+    return allowed_set_cache.stats()
@@ -0,0 +1,134 @@
+"""Roaring-style compressed bitmap of document ordinals."""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+_CHUNK_BITS = 16
+_LOW_MASK = (1 << _CHUNK_BITS) - 1
+# Above this many members a chunk is cheaper as a 8 KiB bitset than a uint16 array.
+_ARRAY_MAX = 4096
+
+# A chunk is a sorted array('H') of low bits (sparse) or an int bitset (dense).
+_Chunk = Union[array, int]
+
+
+def _to_chunk(lows: Iterable[int]) -> _Chunk:
+    values = sorted(set(lows))
+    if len(values) <= _ARRAY_MAX:
+        return array("H", values)
+    buffer = bytearray(1 << (_CHUNK_BITS - 3))
+    for low in values:
+        buffer[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _dense(chunk: _Chunk) -> int:
+    if isinstance(chunk, int):
+        return chunk
+    buffer = bytearray(1 << (_CHUNK_BITS - 3))
+    for low in chunk:
+        buffer[low >> 3] |= 1 << (low & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def _shrink(bits: int) -> _Chunk:
+    if bits.bit_count() > _ARRAY_MAX:
+        return bits
+    return array("H", _iter_bits(bits))
+
+
+def _iter_bits(bits: int) -> Iterator[int]:
+    digits = bin(bits)[:1:-1]
+    position = digits.find("1")
+    while position != -1:
+        yield position
+        position = digits.find("1", position + 1)
+
+
+def _chunk_len(chunk: _Chunk) -> int:
+    return chunk.bit_count() if isinstance(chunk, int) else len(chunk)
+
+
+class DocBitmap:
+    """
+    Immutable set of non-negative ints split into 2^16-wide chunks keyed by
+    their high bits. Sparse chunks are sorted uint16 arrays and dense ones
+    are bitsets, so a set costs roughly two bytes per member or one bit per
+    possible member, whichever is smaller.
+    """
+
+    __slots__ = ("_chunks",)
+
+    def __init__(self, chunks: Optional[Dict[int, _Chunk]] = None):
+        self._chunks: Dict[int, _Chunk] = chunks or {}
+
+    @classmethod
+    def from_ordinals(cls, ordinals: Iterable[int]) -> "DocBitmap":
+        grouped: Dict[int, list] = {}
+        for ordinal in ordinals:
+            grouped.setdefault(ordinal >> _CHUNK_BITS, []).append(ordinal & _LOW_MASK)
+        return cls({key: _to_chunk(lows) for key, lows in grouped.items()})
+
+    def __or__(self, other: "DocBitmap") -> "DocBitmap":
+        chunks = dict(self._chunks)
+        for key, chunk in other._chunks.items():
+            mine = chunks.get(key)
+            if mine is None:
+                chunks[key] = chunk
+            elif isinstance(mine, int) or isinstance(chunk, int):
+                chunks[key] = _dense(mine) | _dense(chunk)
+            else:
+                chunks[key] = _to_chunk(set(mine).union(chunk))
+        return DocBitmap(chunks)
+
+    def __and__(self, other: "DocBitmap") -> "DocBitmap":
+        chunks: Dict[int, _Chunk] = {}
+        for key, mine in self._chunks.items():
+            theirs = other._chunks.get(key)
+            if theirs is None:
+                continue
+            if isinstance(mine, int) and isinstance(theirs, int):
+                result = _shrink(mine & theirs)
+            elif isinstance(mine, int) or isinstance(theirs, int):
+                sparse, dense = (theirs, mine) if isinstance(mine, int) else (mine, theirs)
+                result = array("H", (low for low in sparse if dense >> low & 1))
+            else:
+                result = array("H", sorted(set(mine).intersection(theirs)))
+            if _chunk_len(result):
+                chunks[key] = result
+        return DocBitmap(chunks)
+
+    def __iter__(self) -> Iterator[int]:
+        for key in sorted(self._chunks):
+            chunk = self._chunks[key]
+            base = key << _CHUNK_BITS
+            lows = _iter_bits(chunk) if isinstance(chunk, int) else chunk
+            for low in lows:
+                yield base | low
+
+    def __len__(self) -> int:
+        return sum(_chunk_len(chunk) for chunk in self._chunks.values())
+
+    def __bool__(self) -> bool:
+        return bool(self._chunks)
+
+    def __contains__(self, ordinal: int) -> bool:
+        chunk = self._chunks.get(ordinal >> _CHUNK_BITS)
+        if chunk is None:
+            return False
+        low = ordinal & _LOW_MASK
+        if isinstance(chunk, int):
+            return bool(chunk >> low & 1)
+        position = bisect_left(chunk, low)
+        return position < len(chunk) and chunk[position] == low
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, DocBitmap) and list(self) == list(other)
+
+    def nbytes(self) -> int:
+        """Approximate payload size of the chunks."""
+        return sum(
+            (1 << (_CHUNK_BITS - 3)) if isinstance(chunk, int) else 2 * len(chunk)
+            for chunk in self._chunks.values()
+        )
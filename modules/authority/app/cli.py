@@ -12,7 +12,7 @@ from .config import settings
 from .context import AuthorityContext
 from .engine import evaluate_document_access, get_allowed_document_ids
 from .policy import load_default_context, validate_authority_level
-from .repository import fetch_documents_with_rules
+from .repository import fetch_documents_with_rules, prune_rules_changes
 
 
 def _parse_list(value: str) -> List[str]:
@@ -55,6 +55,11 @@ def cmd_eval_batch(args: argparse.Namespace) -> None:
         print(doc_id)
 
 
+def cmd_prune_rules_changes(args: argparse.Namespace) -> None:
+    removed = prune_rules_changes(args.keep_hours * 3600)
+    print(f"removed={removed}")
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Authority evaluation CLI")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -72,6 +77,10 @@ def build_parser() -> argparse.ArgumentParser:
     _add_context_args(p_batch)
     p_batch.set_defaults(func=cmd_eval_batch)
 
+    p_prune = sub.add_parser("prune-rules-changes", help="Delete old authority_rules_changes records")
+    p_prune.add_argument("--keep-hours", type=float, default=24, help="Keep changes newer than this (default 24)")
+    p_prune.set_defaults(func=cmd_prune_rules_changes)
+
     return parser
 
 
@@ -26,6 +26,33 @@ class Settings(BaseSettings):
         "PLK_CONTEXT_COMMERCIAL_SENSITIVITY"
     )
 
+    # How get_allowed_document_ids audits its decisions: "per_document" (one
+    # AUTHZ_ALLOW/AUTHZ_DENY row each), "batch" (one AUTHZ_BATCH row) or
+    # "batch_with_denials" (AUTHZ_BATCH plus an AUTHZ_DENY row per denial).
+    # Candidate sets no larger than authz_audit_per_document_max are always
+    # audited per document.
+    authz_audit_policy: str = os.getenv("PLK_AUTHZ_AUDIT_POLICY", "batch")
+    authz_audit_per_document_max: int = int(os.getenv("PLK_AUTHZ_AUDIT_PER_DOCUMENT_MAX", "0"))
+
+    # get_allowed_document_ids evaluates against a process-local compiled rule
+    # index, rebuilt once triggers record a change to documents or access_rules
+    # in authority_rules_changes that its snapshot does not see. Changes are
+    # checked at most every rule_index_check_interval seconds (0 = every call).
+    rule_index_enabled: bool = os.getenv("PLK_AUTHORITY_RULE_INDEX", "true").lower() == "true"
+    rule_index_check_interval: float = float(os.getenv("PLK_AUTHORITY_RULE_INDEX_CHECK_INTERVAL", "0"))
+
+    # How the search CLIs restrict their engine query: "document_ids" (an exact
+    # terms filter on the allowed ids) or "acl_groups" (the context's matching
+    # ACL group ids; only for indexes built with the acl_groups field and
+    # reindexed after rule changes, hits are still checked against the ids).
+    index_filter: str = os.getenv("PLK_AUTHORITY_INDEX_FILTER", "document_ids")
+
+    # With the rule index, allowed bitmaps and batch-audit counts are cached per
+    # (rules version, normalized context) with the user excluded; 0 entries
+    # disables the cache.
+    allowed_cache_size: int = int(os.getenv("PLK_AUTHORITY_ALLOWED_CACHE_SIZE", "256"))
+    allowed_cache_ttl: float = float(os.getenv("PLK_AUTHORITY_ALLOWED_CACHE_TTL", "300"))
+
     model_config = SettingsConfigDict(env_prefix="")
 
 
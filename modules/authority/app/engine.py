@@ -2,13 +2,17 @@
 
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Set
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set
 
 from modules.metadata.app.audit import audit_logger  # type: ignore
 
+from .allowed_cache import allowed_set_cache
+from .config import settings
 from .context import AuthorityContext
 from .policy import ALLOWED_AUTHORITY_LEVELS, AccessRule, rule_match_reason
 from .repository import fetch_documents_with_rules
+from .rule_index import AllowedSummary, RuleIndex, get_rule_index
 
 
 @dataclass(frozen=True)
@@ -59,6 +63,23 @@ def evaluate_document_access(
     return decision
 
 
+def evaluate_documents_access(
+    context: AuthorityContext, document_ids: Iterable[str], *, query_id: Optional[str] = None
+) -> Dict[str, AccessDecision]:
+    """
+    Decide access for a candidate set: one rules query for all ids, in-memory
+    evaluation, and one audit flush (shaped by authz_audit_policy).
+    Returns decisions keyed by document_id, in first-seen order.
+    """
+    unique_ids = list(dict.fromkeys(document_ids))
+    if not unique_ids:
+        return {}
+    grouped = _group_rows(fetch_documents_with_rules(unique_ids))
+    decisions = {doc_id: _evaluate_grouped_document(context, doc_id, grouped) for doc_id in unique_ids}
+    _audit_decisions(context, list(decisions.values()), query_id)
+    return decisions
+
+
 def _evaluate_grouped_document(
     context: AuthorityContext, document_id: str, grouped: Dict[str, Dict]
 ) -> AccessDecision:
@@ -92,14 +113,85 @@ def _evaluate_grouped_document(
     return AccessDecision(document_id=document_id, allowed=False, reasons=reasons)
 
 
+def _audit_policy() -> str:
+    policy = settings.authz_audit_policy
+    if policy not in ("per_document", "batch", "batch_with_denials"):
+        raise ValueError(f"Unknown authz audit policy: {policy}")
+    return policy
+
+
+def _audit_decisions(
+    context: AuthorityContext, decisions: List[AccessDecision], query_id: Optional[str]
+) -> None:
+    policy = _audit_policy()
+    with audit_logger.buffered():
+        if policy == "per_document" or len(decisions) <= settings.authz_audit_per_document_max:
+            for decision in decisions:
+                if decision.allowed:
+                    audit_logger.authz_allow(context=context, decision=decision, query_id=query_id)
+                else:
+                    audit_logger.authz_deny(context=context, decision=decision, query_id=query_id)
+            return
+        audit_logger.authz_batch(context=context, decisions=decisions, query_id=query_id)
+        if policy == "batch_with_denials":
+            for decision in decisions:
+                if not decision.allowed:
+                    audit_logger.authz_deny(context=context, decision=decision, query_id=query_id)
+
+
+def _audit_index_summary(
+    index: RuleIndex, context: AuthorityContext, summary: AllowedSummary, query_id: Optional[str]
+) -> None:
+    """
+    Audit an index evaluation. The AUTHZ_BATCH row is built from the
+    summary's counts and bitmaps; per-document decisions are evaluated only
+    for the rows a policy writes per document, so a cache hit under the
+    batch policy does no per-document work.
+    """
+    policy = _audit_policy()
+    if policy == "per_document" or len(index.document_ids) <= settings.authz_audit_per_document_max:
+        _audit_decisions(context, [AccessDecision(*row) for row in index.decisions(context)], query_id)
+        return
+    document_ids = index.document_ids
+    with audit_logger.buffered():
+        audit_logger.authz_batch_summary(
+            context=context,
+            allowed_count=summary.allowed_count,
+            denied_count=summary.denied_count,
+            deny_reasons=dict(summary.deny_reasons),
+            allowed_document_ids=(document_ids[ordinal] for ordinal in summary.allowed),
+            denied_document_ids=(document_ids[ordinal] for ordinal in chain.from_iterable(summary.denied)),
+            query_id=query_id,
+        )
+        if policy == "batch_with_denials":
+            for row in index.decisions(context, chain.from_iterable(summary.denied)):
+                audit_logger.authz_deny(context=context, decision=AccessDecision(*row), query_id=query_id)
+
+
+def get_allowed_acl_groups(context: AuthorityContext) -> Optional[List[str]]:
+    """
+    ACL group ids matched by the context, for filtering indexes by
+    ``acl_groups`` instead of enumerating document ids. None, meaning filter
+    by document id, unless PLK_AUTHORITY_INDEX_FILTER=acl_groups and the rule
+    index is enabled: indexes built before the field existed, or not
+    reindexed since a grant, would otherwise drop allowed documents. Not
+    audited; pair it with get_allowed_document_ids.
+    """
+    if settings.index_filter not in ("document_ids", "acl_groups"):
+        raise ValueError(f"Unknown authority index filter: {settings.index_filter}")
+    if settings.index_filter != "acl_groups" or not settings.rule_index_enabled:
+        return None
+    return get_rule_index().matching_acl_groups(context)
+
+
 def get_allowed_document_ids(context: AuthorityContext, *, query_id: Optional[str] = None) -> Set[str]:
+    if settings.rule_index_enabled:
+        index = get_rule_index()
+        summary = allowed_set_cache.get_or_compute(index.version, context, lambda: index.summary(context))
+        # Cache hits skip evaluation, not auditing: every query is still recorded.
+        _audit_index_summary(index, context, summary, query_id)
+        return {index.document_ids[ordinal] for ordinal in summary.allowed}
     grouped = _group_rows(fetch_documents_with_rules())
-    allowed: Set[str] = set()
-    for doc_id in grouped.keys():
-        decision = _evaluate_grouped_document(context, doc_id, grouped)
-        if decision.allowed:
-            audit_logger.authz_allow(context=context, decision=decision, query_id=query_id)
-            allowed.add(doc_id)
-        else:
-            audit_logger.authz_deny(context=context, decision=decision, query_id=query_id)
-    return allowed
+    decisions = [_evaluate_grouped_document(context, doc_id, grouped) for doc_id in grouped.keys()]
+    _audit_decisions(context, decisions, query_id)
+    return {decision.document_id for decision in decisions if decision.allowed}
@@ -0,0 +1,172 @@
+"""
+Authority attributes for search indexes and context-to-filter compilation.
+
+Chunks are indexed with their document's ``authority_level`` and its access
+rules (``access_rules``: project_code, discipline, classification,
+commercial_sensitivity, allowed_roles). The filters below express
+``rule_match_reason`` natively so OpenSearch and Qdrant drop denied chunks
+before ranking: a chunk passes when its authority level is known and any
+one rule matches, where an empty rule attribute matches every context.
+They prune candidates only; results are still verified by the engine.
+
+Each distinct combination of rule attributes is also an ACL group with a
+stable id. Chunks carry the groups of their document's rules
+(``acl_groups``), so a context can instead be filtered by the few groups it
+matches (see RuleIndex.matching_acl_groups) rather than by enumerating
+allowed document ids.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .context import AuthorityContext
+from .policy import ALLOWED_AUTHORITY_LEVELS
+from .repository import fetch_documents_with_rules
+
+RULE_ATTRIBUTES = ("project_code", "discipline", "classification", "commercial_sensitivity")
+
+# OpenSearch mapping for the fields added by ``document_authority_fields``.
+OPENSEARCH_MAPPING: Dict[str, Any] = {
+    "authority_level": {"type": "keyword"},
+    "acl_groups": {"type": "keyword"},
+    "access_rules": {
+        "type": "nested",
+        "properties": {
+            "rule_id": {"type": "long"},
+            **{name: {"type": "keyword"} for name in RULE_ATTRIBUTES},
+            "allowed_roles": {"type": "keyword"},
+        },
+    },
+}
+
+# Qdrant payload fields worth a keyword index for the filter below.
+QDRANT_INDEXED_FIELDS = ["authority_level", "acl_groups"] + [
+    f"access_rules[].{name}" for name in RULE_ATTRIBUTES + ("allowed_roles",)
+]
+
+_DENIED = {"authority_level": None, "access_rules": [], "acl_groups": []}
+
+
+def acl_group_id(
+    project_code: Optional[str],
+    discipline: Optional[str],
+    classification: Optional[str],
+    commercial_sensitivity: Optional[str],
+    allowed_roles: Iterable[str],
+) -> str:
+    """Stable id of a rule-attribute combination; empty attributes count as unset."""
+    canonical = [
+        project_code or None,
+        discipline or None,
+        classification or None,
+        commercial_sensitivity or None,
+        sorted(set(allowed_roles or [])),
+    ]
+    digest = hashlib.sha256(json.dumps(canonical, separators=(",", ":")).encode("utf-8")).hexdigest()
+    return f"acl_{digest[:16]}"
+
+
+def document_authority_fields(document_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Authority attributes to denormalize into index documents, keyed by document_id."""
+    unique_ids = list(dict.fromkeys(doc_id for doc_id in document_ids if doc_id))
+    if not unique_ids:
+        return {}
+    fields: Dict[str, Dict[str, Any]] = {}
+    for row in fetch_documents_with_rules(unique_ids):
+        entry = fields.setdefault(
+            row["document_id"],
+            {"authority_level": (row.get("authority_level") or "").upper() or None, "access_rules": []},
+        )
+        if row.get("rule_id") is None:
+            continue
+        rule = {"rule_id": row["rule_id"], "allowed_roles": sorted(row.get("allowed_roles") or [])}
+        for name in RULE_ATTRIBUTES:
+            # Empty strings are wildcards in rule_match_reason; index them as absent.
+            rule[name] = row.get("rule_project_code" if name == "project_code" else name) or None
+        entry["access_rules"].append(rule)
+    for entry in fields.values():
+        groups = set()
+        # Documents with an unknown authority level are denied whatever their rules say.
+        if entry["authority_level"] in ALLOWED_AUTHORITY_LEVELS:
+            groups = {
+                acl_group_id(*(rule[name] for name in RULE_ATTRIBUTES), rule["allowed_roles"])
+                for rule in entry["access_rules"]
+            }
+        entry["acl_groups"] = sorted(groups)
+    return fields
+
+
+def authority_fields_for(fields: Dict[str, Dict[str, Any]], document_id: Optional[str]) -> Dict[str, Any]:
+    """Fields for one document; unknown documents get values no filter matches."""
+    return dict(fields.get(document_id or "", _DENIED))
+
+
+def _context_values(context: AuthorityContext) -> Dict[str, List[str]]:
+    single = {
+        "discipline": context.discipline,
+        "classification": context.classification,
+        "commercial_sensitivity": context.commercial_sensitivity,
+    }
+    values = {name: [value] if value else [] for name, value in single.items()}
+    values["project_code"] = sorted(set(context.project_codes or []))
+    return values
+
+
+def opensearch_filter(context: AuthorityContext) -> Dict[str, Any]:
+    """Bool filter clause matching chunks the context may see."""
+    roles = sorted(set(context.roles or []))
+    if not roles:
+        return {"bool": {"must_not": {"match_all": {}}}}
+    rule_clauses: List[Dict[str, Any]] = []
+    for name, values in _context_values(context).items():
+        field = f"access_rules.{name}"
+        unset = {"bool": {"must_not": {"exists": {"field": field}}}}
+        if values:
+            rule_clauses.append({"bool": {"should": [unset, {"terms": {field: values}}], "minimum_should_match": 1}})
+        else:
+            rule_clauses.append(unset)
+    rule_clauses.append({"terms": {"access_rules.allowed_roles": roles}})
+    return {
+        "bool": {
+            "filter": [
+                {"terms": {"authority_level": sorted(ALLOWED_AUTHORITY_LEVELS)}},
+                {"nested": {"path": "access_rules", "query": {"bool": {"filter": rule_clauses}}}},
+            ]
+        }
+    }
+
+
+def qdrant_filter(context: AuthorityContext) -> Dict[str, Any]:
+    """Qdrant filter (as accepted by ``query_filter``) matching points the context may see."""
+    roles = sorted(set(context.roles or []))
+    if not roles:
+        return {"must": [{"has_id": []}]}
+    rule_conditions: List[Dict[str, Any]] = []
+    for name, values in _context_values(context).items():
+        unset = {"is_empty": {"key": name}}
+        if values:
+            rule_conditions.append({"should": [unset, {"key": name, "match": {"any": values}}]})
+        else:
+            rule_conditions.append(unset)
+    rule_conditions.append({"key": "allowed_roles", "match": {"any": roles}})
+    return {
+        "must": [
+            {"key": "authority_level", "match": {"any": sorted(ALLOWED_AUTHORITY_LEVELS)}},
+            {"nested": {"key": "access_rules", "filter": {"must": rule_conditions}}},
+        ]
+    }
+
+
+def opensearch_acl_filter(acl_groups: Sequence[str]) -> Dict[str, Any]:
+    """Filter clause for chunks in any of ``acl_groups``."""
+    if not acl_groups:
+        return {"bool": {"must_not": {"match_all": {}}}}
+    return {"terms": {"acl_groups": sorted(acl_groups)}}
+
+
+def qdrant_acl_filter(acl_groups: Sequence[str]) -> Dict[str, Any]:
+    """Qdrant filter for points in any of ``acl_groups``."""
+    if not acl_groups:
+        return {"must": [{"has_id": []}]}
+    return {"must": [{"key": "acl_groups", "match": {"any": sorted(acl_groups)}}]}
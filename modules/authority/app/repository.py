@@ -1,8 +1,51 @@
 """Data access for authority evaluation (metadata DB only)."""
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from modules.metadata.app.db import connection_cursor  # type: ignore
+from psycopg2 import extensions
+
+from modules.metadata.app.db import connection_cursor, execute_prepared  # type: ignore
+
+
+_RULES_SELECT = """
+    SELECT
+        d.document_id,
+        d.authority_level,
+        d.project_code AS document_project_code,
+        ar.rule_id,
+        ar.project_code AS rule_project_code,
+        ar.discipline,
+        ar.classification,
+        ar.commercial_sensitivity,
+        ar.allowed_roles
+    FROM documents d
+    LEFT JOIN access_rules ar ON ar.document_id = d.document_id
+"""
+
+_SNAPSHOT_SELECT = "SELECT pg_current_snapshot()::text AS snapshot"
+
+# True once a change to documents or access_rules committed that the snapshot
+# does not see, or changes it might not see were pruned.
+_CHANGED_SELECT = """
+    SELECT COALESCE(w.pruned_through >= pg_snapshot_xmin($1::pg_snapshot), FALSE)
+        OR EXISTS (
+            SELECT 1 FROM authority_rules_changes c
+            WHERE c.xid >= pg_snapshot_xmin($1::pg_snapshot)
+              AND NOT pg_visible_in_snapshot(c.xid, $1::pg_snapshot)
+        )
+    FROM authority_rules_watermark w
+"""
+
+
+def _fetch_rules(cur, document_ids: Optional[List[str]] = None) -> List[Dict]:
+    if document_ids:
+        # One statement text for any number of ids keeps the prepared plan reusable.
+        execute_prepared(
+            cur, "authority_rules_by_documents", _RULES_SELECT + " WHERE d.document_id = ANY($1)", (list(document_ids),)
+        )
+    else:
+        execute_prepared(cur, "authority_rules_all", _RULES_SELECT, ())
+    return [dict(row) for row in cur.fetchall()]
 
 
 def fetch_documents_with_rules(document_ids: Optional[List[str]] = None) -> List[Dict]:
@@ -12,29 +55,33 @@ def fetch_documents_with_rules(document_ids: Optional[List[str]] = None) -> List
     No policy filtering occurs here; callers must apply authority rules.
     If document_ids is provided, limit the query to that set.
     """
-    query = (
-        """
-        SELECT
-            d.document_id,
-            d.authority_level,
-            d.project_code AS document_project_code,
-            ar.rule_id,
-            ar.project_code AS rule_project_code,
-            ar.discipline,
-            ar.classification,
-            ar.commercial_sensitivity,
-            ar.allowed_roles
-        FROM documents d
-        LEFT JOIN access_rules ar ON ar.document_id = d.document_id
-        """
-    )
-    params: tuple = ()
-    if document_ids:
-        placeholders = ",".join(["%s"] * len(document_ids))
-        query += f" WHERE d.document_id IN ({placeholders})"
-        params = tuple(document_ids)
-
-    with connection_cursor(dict_cursor=True) as cur:
-        cur.execute(query, params)
-        rows = cur.fetchall()
-        return [dict(row) for row in rows]
+    with connection_cursor(dict_cursor=True, read_only=True) as cur:
+        return _fetch_rules(cur, document_ids)
+
+
+def rules_changed_since(snapshot: str) -> bool:
+    """Whether documents or access_rules changed outside ``snapshot`` (see fetch_rules_snapshot)."""
+    with connection_cursor(read_only=True) as cur:
+        execute_prepared(cur, "authority_rules_changed", _CHANGED_SELECT, (snapshot,))
+        return cur.fetchone()[0]
+
+
+def fetch_rules_snapshot() -> Tuple[str, List[Dict]]:
+    """
+    Every document/rule row and the snapshot they were read in (as text),
+    from one repeatable-read transaction on one connection. The snapshot is
+    the rules version: rules_changed_since tells when it is out of date.
+    """
+    with connection_cursor(dict_cursor=True, read_only=True) as cur:
+        if cur.connection.get_transaction_status() == extensions.TRANSACTION_STATUS_IDLE:
+            cur.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        execute_prepared(cur, "authority_rules_snapshot", _SNAPSHOT_SELECT, ())
+        snapshot = cur.fetchone()["snapshot"]
+        return snapshot, _fetch_rules(cur)
+
+
+def prune_rules_changes(keep_seconds: float) -> int:
+    """Delete change records older than ``keep_seconds``; indexes read before them rebuild once."""
+    with connection_cursor() as cur:
+        cur.execute("SELECT authority_rules_prune_changes(make_interval(secs => %s))", (keep_seconds,))
+        return cur.fetchone()[0]
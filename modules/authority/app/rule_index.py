@@ -0,0 +1,254 @@
+"""Process-local compiled access-rule index, rebuilt when the rules change."""
+
+import threading
+import time
+from functools import reduce
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .bitmap import DocBitmap
+from .config import settings
+from .context import AuthorityContext
+from .filters import acl_group_id
+from .policy import ALLOWED_AUTHORITY_LEVELS, AccessRule, rule_match_reason
+from .repository import fetch_rules_snapshot, rules_changed_since
+
+# (document_id, allowed, reasons, matched_rule_ids), the fields of AccessDecision.
+DecisionRow = Tuple[str, bool, List[str], List[int]]
+
+_RuleKey = Tuple[Optional[str], Optional[str], Optional[str], Optional[str], FrozenSet[str]]
+
+
+class AllowedSummary(NamedTuple):
+    """
+    A context's allowed documents plus what a batch audit records about the
+    rest, computed per access class: the bitmaps of denied classes (shared
+    with the index, not copied) and how many denied documents had each
+    reason kind.
+    """
+
+    allowed: DocBitmap
+    denied: Tuple[DocBitmap, ...]
+    deny_reasons: Dict[str, int]
+
+    @property
+    def allowed_count(self) -> int:
+        return len(self.allowed)
+
+    @property
+    def denied_count(self) -> int:
+        return sum(len(bits) for bits in self.denied)
+
+
+class RuleIndex:
+    """
+    Access rules compiled for set-based evaluation.
+
+    Documents get dense ordinals, and rules sharing the same matching
+    attributes (project_code, discipline, classification,
+    commercial_sensitivity, allowed_roles) form one ACL group. Documents
+    with the same set of groups form one access class, mapped to a
+    compressed bitmap of its members; documents with an unknown authority
+    level all share a class that never matches, as in the per-document
+    evaluation. A context is matched once per group instead of once per
+    rule, and groups are indexed by role so ``allowed_bits`` only tests
+    groups reachable from the context's roles, then unions the classes
+    containing them: the work grows with groups and classes, not documents.
+    """
+
+    def __init__(self, rows: List[Dict], *, version: Optional[str] = None):
+        self.version = version
+        ordinals: Dict[str, int] = {}
+        self.document_ids: List[str] = []
+        valid: Dict[int, bool] = {}
+        group_keys: Dict[_RuleKey, int] = {}
+        self._groups: List[AccessRule] = []
+        self._document_rules: List[List[Tuple[Optional[int], int]]] = []
+
+        for row in rows:
+            document_id = row.get("document_id")
+            if not document_id:
+                continue
+            ordinal = ordinals.get(document_id)
+            if ordinal is None:
+                ordinal = ordinals[document_id] = len(self.document_ids)
+                self.document_ids.append(document_id)
+                self._document_rules.append([])
+            valid[ordinal] = (row.get("authority_level") or "").upper() in ALLOWED_AUTHORITY_LEVELS
+            if row.get("rule_id") is None:
+                continue
+            roles = frozenset(row.get("allowed_roles") or [])
+            # Empty attributes are wildcards, the same as NULL.
+            key = (
+                row.get("rule_project_code") or None,
+                row.get("discipline") or None,
+                row.get("classification") or None,
+                row.get("commercial_sensitivity") or None,
+                roles,
+            )
+            group = group_keys.get(key)
+            if group is None:
+                group = group_keys[key] = len(self._groups)
+                self._groups.append(
+                    AccessRule(
+                        rule_id=None,
+                        project_code=key[0],
+                        discipline=key[1],
+                        classification=key[2],
+                        commercial_sensitivity=key[3],
+                        allowed_roles=sorted(roles),
+                    )
+                )
+            self._document_rules[ordinal].append((row.get("rule_id"), group))
+
+        self._valid_flags = [valid[ordinal] for ordinal in range(len(self.document_ids))]
+        self._group_ids = [acl_group_id(*key[:4], key[4]) for key in group_keys]
+        self._groups_by_role: Dict[str, List[int]] = {}
+        for group, rule in enumerate(self._groups):
+            for role in rule.allowed_roles:
+                self._groups_by_role.setdefault(role, []).append(group)
+
+        class_keys: Dict[Tuple[bool, FrozenSet[int]], int] = {}
+        class_members: List[List[int]] = []
+        self._class_keys: List[Tuple[bool, FrozenSet[int]]] = []
+        self._classes_by_group: Dict[int, List[int]] = {}
+        for ordinal, rules in enumerate(self._document_rules):
+            is_valid = self._valid_flags[ordinal]
+            groups = frozenset(group for _, group in rules) if is_valid else frozenset()
+            cls = class_keys.get((is_valid, groups))
+            if cls is None:
+                cls = class_keys[(is_valid, groups)] = len(self._class_keys)
+                self._class_keys.append((is_valid, groups))
+                class_members.append([])
+                for group in groups:
+                    self._classes_by_group.setdefault(group, []).append(cls)
+            class_members[cls].append(ordinal)
+        self._class_bits = [DocBitmap.from_ordinals(members) for members in class_members]
+
+    @property
+    def stats(self) -> Dict[str, object]:
+        return {
+            "version": self.version,
+            "documents": len(self.document_ids),
+            "rules": sum(len(rules) for rules in self._document_rules),
+            "groups": len(self._groups),
+            "classes": len(self._class_keys),
+            "bitmap_bytes": sum(bits.nbytes() for bits in self._class_bits),
+        }
+
+    def _matching_groups(self, context: AuthorityContext) -> List[int]:
+        candidates = {group for role in context.roles for group in self._groups_by_role.get(role, ())}
+        return sorted(group for group in candidates if rule_match_reason(self._groups[group], context)[0])
+
+    def _matching_classes(self, context: AuthorityContext) -> List[int]:
+        return sorted(
+            {cls for group in self._matching_groups(context) for cls in self._classes_by_group.get(group, ())}
+        )
+
+    def allowed_bits(self, context: AuthorityContext) -> DocBitmap:
+        """Ordinals of allowed documents: the union of classes containing a matching group."""
+        classes = [self._class_bits[cls] for cls in self._matching_classes(context)]
+        return reduce(DocBitmap.__or__, classes, DocBitmap())
+
+    def allowed_ids(self, context: AuthorityContext) -> Set[str]:
+        return {self.document_ids[ordinal] for ordinal in self.allowed_bits(context)}
+
+    def summary(self, context: AuthorityContext) -> AllowedSummary:
+        """
+        ``allowed_bits`` plus the denied classes and their reason kinds, as the
+        row-by-row evaluation would report them: ``unknown_authority``,
+        ``no_access_rules``, each failing rule's reason, or ``no_rule_match``.
+        """
+        matching = set(self._matching_classes(context))
+        allowed = reduce(DocBitmap.__or__, (self._class_bits[cls] for cls in sorted(matching)), DocBitmap())
+        verdicts: Dict[int, Tuple[bool, Optional[str]]] = {}
+        denied: List[DocBitmap] = []
+        deny_reasons: Dict[str, int] = {}
+        for cls, (is_valid, groups) in enumerate(self._class_keys):
+            if cls in matching:
+                continue
+            if not is_valid:
+                kinds = {"unknown_authority"}
+            elif not groups:
+                kinds = {"no_access_rules"}
+            else:
+                for group in groups:
+                    if group not in verdicts:
+                        verdicts[group] = rule_match_reason(self._groups[group], context)
+                kinds = {verdicts[group][1] for group in groups if verdicts[group][1]} or {"no_rule_match"}
+            bits = self._class_bits[cls]
+            denied.append(bits)
+            for kind in kinds:
+                deny_reasons[kind] = deny_reasons.get(kind, 0) + len(bits)
+        return AllowedSummary(allowed, tuple(denied), deny_reasons)
+
+    def matching_acl_groups(self, context: AuthorityContext) -> List[str]:
+        """
+        ACL group ids the context matches. Chunks indexed with
+        ``acl_groups`` (see filters.document_authority_fields) pass a filter on
+        these exactly when their document is in ``allowed_ids``.
+        """
+        return [self._group_ids[group] for group in self._matching_groups(context)]
+
+    def decisions(self, context: AuthorityContext, ordinals: Optional[Iterable[int]] = None) -> List[DecisionRow]:
+        """
+        Per-document decisions with the same reasons as the row-by-row
+        evaluation, for every document or only the given ordinals.
+        """
+        verdicts = [rule_match_reason(rule, context) for rule in self._groups]
+        rows: List[DecisionRow] = []
+        for ordinal in range(len(self.document_ids)) if ordinals is None else ordinals:
+            document_id = self.document_ids[ordinal]
+            if not self._valid_flags[ordinal]:
+                rows.append((document_id, False, ["unknown_authority"], []))
+                continue
+            rules = self._document_rules[ordinal]
+            if not rules:
+                rows.append((document_id, False, ["no_access_rules"], []))
+                continue
+            failures: List[str] = []
+            for rule_id, group in rules:
+                matched, reason = verdicts[group]
+                if matched:
+                    rows.append(
+                        (document_id, True, ["rule_match"], [rule_id] if rule_id is not None else [])
+                    )
+                    break
+                if reason:
+                    failures.append(f"rule_{rule_id}:{reason}")
+            else:
+                rows.append((document_id, False, failures or ["no_rule_match"], []))
+        return rows
+
+
+_index: Optional[RuleIndex] = None
+_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_rule_index() -> RuleIndex:
+    """
+    Return the process-wide index, rebuilding it once documents or
+    access_rules changed outside the snapshot it was built from. Changes are
+    checked at most every ``rule_index_check_interval`` seconds (0 = on
+    every call).
+    """
+    global _index, _checked_at
+    index = _index
+    if index is not None and time.monotonic() - _checked_at < settings.rule_index_check_interval:
+        return index
+    stale = index is None or index.version is None or rules_changed_since(index.version)
+    with _index_lock:
+        if stale and _index is index:
+            # Rows and the snapshot labelling them come from one transaction, so
+            # a change is never recorded as seen before its rows are.
+            snapshot, rows = fetch_rules_snapshot()
+            _index = RuleIndex(rows, version=snapshot)
+        _checked_at = time.monotonic()
+        return _index
+
+
+def invalidate_rule_index() -> None:
+    """Drop the compiled index so the next use rebuilds it."""
+    global _index
+    with _index_lock:
+        _index = None
@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.authority.app import engine  # type: ignore
+from modules.authority.app.allowed_cache import AllowedSetCache, context_cache_key  # type: ignore
+from modules.authority.app.context import AuthorityContext  # type: ignore
+from modules.authority.app.rule_index import RuleIndex  # type: ignore
+from modules.metadata.app import audit as audit_module  # type: ignore
+
+
+def _ctx(user="ann", roles=("viewer",), projects=("P1",), **kwargs):
+    return AuthorityContext(user=user, roles=list(roles), project_codes=list(projects), **kwargs)
+
+
+def test_cache_key_ignores_user_and_ordering():
+    assert context_cache_key(_ctx("ann", ["viewer", "admin"], ["P2", "P1"])) == context_cache_key(
+        _ctx("bob", ["admin", "viewer", "admin"], ["P1", "P2"])
+    )
+    assert context_cache_key(_ctx()) != context_cache_key(_ctx(classification="secret"))
+
+
+def test_cache_counts_hits_and_drops_entries_on_new_version():
+    cache = AllowedSetCache(max_entries=4, ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute(1, _ctx("ann"), compute) == 1
+    assert cache.get_or_compute(1, _ctx("bob"), compute) == 1
+    assert cache.get_or_compute(2, _ctx("bob"), compute) == 2
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"], stats["size"]) == (1, 2, 1, 1)
+
+
+def test_cache_evicts_least_recently_used_and_expires(monkeypatch):
+    cache = AllowedSetCache(max_entries=2, ttl=60)
+    for roles in (["a"], ["b"], ["a"], ["c"]):
+        cache.get_or_compute(1, _ctx(roles=roles), lambda: roles)
+    assert cache.stats()["evictions"] == 1
+    assert cache.get_or_compute(1, _ctx(roles=["a"]), lambda: "recomputed") == ["a"]
+
+    cache.ttl = 0
+    assert cache.get_or_compute(1, _ctx(roles=["a"]), lambda: "recomputed") == "recomputed"
+    assert cache.stats()["expirations"] == 1
+
+
+def test_allowed_ids_served_from_cache_but_still_audited(monkeypatch):
+    rows = [
+        {"document_id": "doc-a", "authority_level": "AUTHORITATIVE", "rule_id": 1, "allowed_roles": ["viewer"]},
+        {"document_id": "doc-b", "authority_level": "AUTHORITATIVE", "rule_id": None},
+    ]
+    index = RuleIndex(rows, version=7)
+    evaluations = []
+    original = index.summary
+    monkeypatch.setattr(index, "summary", lambda context: evaluations.append(1) or original(context))
+    monkeypatch.setattr(index, "decisions", lambda context: pytest.fail("batch audit needs no per-document decisions"))
+    monkeypatch.setattr(engine, "get_rule_index", lambda: index)
+    monkeypatch.setattr(engine, "allowed_set_cache", AllowedSetCache(max_entries=8, ttl=60))
+    monkeypatch.setattr(engine.settings, "authz_audit_policy", "batch")
+    events = []
+    monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", events.append)
+
+    first = engine.get_allowed_document_ids(_ctx("ann"), query_id="q1")
+    first.add("tampered")
+    second = engine.get_allowed_document_ids(_ctx("bob"), query_id="q2")
+
+    assert second == {"doc-a"}
+    assert len(evaluations) == 1
+    assert [(e.actor, e.details["query_id"]) for e in events] == [("ann", "q1"), ("bob", "q2")]
+    assert events[1].details["deny_reasons"] == {"no_access_rules": 1}
+    assert engine.allowed_set_cache.stats()["hits"] == 1
+
+
+def test_cache_entries_hold_shared_bitmaps_and_denials_audit_only_denied(monkeypatch):
+    rows = [
+        {"document_id": "doc-a", "authority_level": "AUTHORITATIVE", "rule_id": 1, "allowed_roles": ["viewer"]},
+        {"document_id": "doc-b", "authority_level": "AUTHORITATIVE", "rule_id": None},
+    ]
+    index = RuleIndex(rows, version=7)
+    evaluated = []
+    original = index.decisions
+
+    def decisions(context, ordinals=None):
+        evaluated.append(list(ordinals))
+        return original(context, evaluated[-1])
+
+    monkeypatch.setattr(index, "decisions", decisions)
+    monkeypatch.setattr(engine, "get_rule_index", lambda: index)
+    cache = AllowedSetCache(max_entries=8, ttl=60)
+    monkeypatch.setattr(engine, "allowed_set_cache", cache)
+    monkeypatch.setattr(engine.settings, "authz_audit_policy", "batch_with_denials")
+    events = []
+    monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", events.append)
+
+    for query_id in ("q1", "q2"):
+        engine.get_allowed_document_ids(_ctx("ann"), query_id=query_id)
+
+    assert evaluated == [[1], [1]]
+    assert [e.action for e in events] == ["AUTHZ_BATCH", "AUTHZ_DENY"] * 2
+    ((key, (_, summary)),) = cache._entries.items()
+    assert key == (7, context_cache_key(_ctx()))
+    assert all(any(bits is shared for shared in index._class_bits) for bits in summary.denied)
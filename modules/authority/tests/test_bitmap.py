@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.authority.app.bitmap import DocBitmap  # type: ignore
+
+
+def test_sparse_and_dense_chunks_hold_the_same_members():
+    sparse = set(range(0, 200_000, 97))
+    dense = set(range(65_536, 65_536 + 10_000))
+
+    sparse_bits = DocBitmap.from_ordinals(sparse)
+    dense_bits = DocBitmap.from_ordinals(dense)
+
+    assert list(sparse_bits) == sorted(sparse)
+    assert list(dense_bits) == sorted(dense)
+    assert len(dense_bits) == 10_000
+    # 10k members fit an 8 KiB bitset rather than a 20 KB array.
+    assert dense_bits.nbytes() == 8192
+    assert 97 in sparse_bits and 98 not in sparse_bits
+    assert 65_536 + 9_999 in dense_bits and 65_536 + 10_000 not in dense_bits
+
+
+def test_union_and_intersection_match_set_semantics():
+    a = set(range(0, 150_000, 3)) | {1 << 20}
+    b = set(range(60_000, 70_000)) | {5, 1 << 21}
+
+    left, right = DocBitmap.from_ordinals(a), DocBitmap.from_ordinals(b)
+
+    assert list(left | right) == sorted(a | b)
+    assert list(left & right) == sorted(a & b)
+    assert left & DocBitmap() == DocBitmap()
+    assert not DocBitmap.from_ordinals([])
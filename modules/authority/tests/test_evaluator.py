@@ -10,10 +10,18 @@ ROOT = Path(__file__).resolve().parents[3]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from modules.authority.app import engine  # type: ignore
 from modules.authority.app.context import AuthorityContext  # type: ignore
-from modules.authority.app.engine import evaluate_document_access, get_allowed_document_ids  # type: ignore
+from modules.authority.app.engine import (  # type: ignore
+    evaluate_document_access,
+    evaluate_documents_access,
+    get_allowed_document_ids,
+)
 from modules.authority.app.policy import validate_authority_level  # type: ignore
+from modules.authority.app.rule_index import RuleIndex  # type: ignore
+from modules.metadata.app import audit as audit_module  # type: ignore
 from modules.metadata.app import models  # type: ignore
+from modules.metadata.app.bootstrap import apply_migrations  # type: ignore
 from modules.metadata.app.config import settings  # type: ignore
 from modules.metadata.app.repository import (  # type: ignore
     AccessRuleRepository,
@@ -44,6 +52,11 @@ pytestmark = pytest.mark.skipif(
 )
 
 
+@pytest.fixture(scope="module", autouse=True)
+def migrated():
+    apply_migrations()
+
+
 @pytest.fixture()
 def cleanup_ids():
     created_ids = []
@@ -156,3 +169,107 @@ def test_get_allowed_document_ids_respects_default_deny(cleanup_ids):
     allowed = get_allowed_document_ids(context, query_id=str(uuid.uuid4()))
     assert allowed_doc in allowed
     assert denied_doc not in allowed
+
+
+def test_evaluate_documents_access_decides_candidate_set(cleanup_ids):
+    allowed_doc = _insert_doc("AUTHORITATIVE")
+    denied_doc = _insert_doc("AUTHORITATIVE")
+    cleanup_ids.extend([allowed_doc, denied_doc])
+    _add_rule(allowed_doc, project_code="P1", discipline="eng", roles=["viewer"])
+
+    context = AuthorityContext(user="hana", roles=["viewer"], project_codes=["P1"], discipline="eng")
+    missing_doc = f"missing-{uuid.uuid4()}"
+    decisions = evaluate_documents_access(
+        context, [denied_doc, allowed_doc, denied_doc, missing_doc], query_id=str(uuid.uuid4())
+    )
+
+    assert list(decisions) == [denied_doc, allowed_doc, missing_doc]
+    assert decisions[allowed_doc].allowed
+    assert decisions[denied_doc].reasons == ["no_access_rules"]
+    assert decisions[missing_doc].reasons == ["document_not_found"]
+
+
+def _capture_audit(monkeypatch, policy: str):
+    monkeypatch.setattr(engine.settings, "authz_audit_policy", policy)
+    rows = [
+        {"document_id": "doc-a", "authority_level": "AUTHORITATIVE", "rule_id": 1, "allowed_roles": ["viewer"]},
+        {"document_id": "doc-b", "authority_level": "AUTHORITATIVE", "rule_id": None},
+        {"document_id": "doc-c", "authority_level": "UNKNOWN", "rule_id": 2, "allowed_roles": ["viewer"]},
+    ]
+    monkeypatch.setattr(engine, "fetch_documents_with_rules", lambda document_ids=None: rows)
+    monkeypatch.setattr(engine, "get_rule_index", lambda: RuleIndex(rows))
+    events = []
+    monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", events.append)
+    return events
+
+
+def test_batch_policy_writes_one_aggregated_event(monkeypatch):
+    events = _capture_audit(monkeypatch, "batch")
+    context = AuthorityContext(user="gina", roles=["viewer"])
+
+    allowed = get_allowed_document_ids(context, query_id="q-batch")
+
+    assert allowed == {"doc-a"}
+    assert [event.action for event in events] == ["AUTHZ_BATCH"]
+    details = events[0].details
+    assert details["allowed_document_ids"] == ["doc-a"]
+    assert details["denied_document_ids"] == ["doc-b", "doc-c"]
+    assert (details["evaluated_count"], details["denied_count"]) == (3, 2)
+    assert details["deny_reasons"] == {"no_access_rules": 1, "unknown_authority": 1}
+
+
+def test_batch_event_lists_every_denied_document(monkeypatch):
+    events = _capture_audit(monkeypatch, "batch")
+
+    get_allowed_document_ids(AuthorityContext(user="gina", roles=["editor"]), query_id="q-all-denied")
+
+    details = events[0].details
+    assert (details["allowed_count"], details["denied_count"]) == (0, 3)
+    assert details["allowed_document_ids"] == []
+    assert details["denied_document_ids"] == ["doc-a", "doc-b", "doc-c"]
+    # Rule-specific reasons are counted by kind, once per document.
+    assert details["deny_reasons"] == {"role_mismatch": 1, "no_access_rules": 1, "unknown_authority": 1}
+
+
+@pytest.mark.parametrize(
+    "policy,expected",
+    [
+        ("per_document", ["AUTHZ_ALLOW", "AUTHZ_DENY", "AUTHZ_DENY"]),
+        ("batch_with_denials", ["AUTHZ_BATCH", "AUTHZ_DENY", "AUTHZ_DENY"]),
+    ],
+)
+def test_policies_requiring_per_document_rows(monkeypatch, policy, expected):
+    events = _capture_audit(monkeypatch, policy)
+
+    get_allowed_document_ids(AuthorityContext(user="gina", roles=["viewer"]), query_id="q-policy")
+
+    assert [event.action for event in events] == expected
+
+
+def test_small_candidate_sets_stay_per_document(monkeypatch):
+    events = _capture_audit(monkeypatch, "batch")
+    monkeypatch.setattr(engine.settings, "authz_audit_per_document_max", 3)
+
+    get_allowed_document_ids(AuthorityContext(user="gina", roles=["viewer"]), query_id="q-small")
+
+    assert [event.action for event in events] == ["AUTHZ_ALLOW", "AUTHZ_DENY", "AUTHZ_DENY"]
+
+
+def test_evaluate_documents_access_fetches_once_and_audits_in_bulk(monkeypatch):
+    events = _capture_audit(monkeypatch, "batch")
+    fetched = []
+    rows = engine.fetch_documents_with_rules()
+
+    def fake_fetch(document_ids=None):
+        fetched.append(document_ids)
+        return rows
+
+    monkeypatch.setattr(engine, "fetch_documents_with_rules", fake_fetch)
+
+    decisions = evaluate_documents_access(
+        AuthorityContext(user="gina", roles=["viewer"]), ["doc-a", "doc-b", "doc-a"], query_id="q-candidates"
+    )
+
+    assert fetched == [["doc-a", "doc-b"]]
+    assert {doc_id: decision.allowed for doc_id, decision in decisions.items()} == {"doc-a": True, "doc-b": False}
+    assert [event.action for event in events] == ["AUTHZ_BATCH"]
@@ -0,0 +1,111 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.authority.app import filters  # type: ignore
+from modules.authority.app.context import AuthorityContext  # type: ignore
+
+
+def test_document_authority_fields_denormalizes_rules(monkeypatch):
+    monkeypatch.setattr(
+        filters,
+        "fetch_documents_with_rules",
+        lambda document_ids: [
+            {
+                "document_id": "doc-a",
+                "authority_level": "authoritative",
+                "rule_id": 1,
+                "rule_project_code": "P1",
+                "discipline": "",
+                "classification": None,
+                "commercial_sensitivity": "low",
+                "allowed_roles": ["viewer", "admin"],
+            },
+            {"document_id": "doc-b", "authority_level": "DRAFT", "rule_id": None},
+        ],
+    )
+
+    fields = filters.document_authority_fields(["doc-a", "doc-b", "doc-a", None])
+
+    assert fields["doc-a"] == {
+        "authority_level": "AUTHORITATIVE",
+        "access_rules": [
+            {
+                "rule_id": 1,
+                "project_code": "P1",
+                "discipline": None,
+                "classification": None,
+                "commercial_sensitivity": "low",
+                "allowed_roles": ["admin", "viewer"],
+            }
+        ],
+        "acl_groups": [filters.acl_group_id("P1", None, None, "low", ["viewer", "admin"])],
+    }
+    assert fields["doc-b"] == {
+        "authority_level": "DRAFT",
+        "access_rules": [],
+        "acl_groups": [],
+    }
+    assert filters.authority_fields_for(fields, "doc-missing") == {
+        "authority_level": None,
+        "access_rules": [],
+        "acl_groups": [],
+    }
+
+
+def test_acl_group_id_is_stable_and_treats_empty_as_unset():
+    group = filters.acl_group_id("P1", "", None, "low", ["viewer", "admin", "viewer"])
+
+    assert group == filters.acl_group_id("P1", None, "", "low", ["admin", "viewer"])
+    assert group != filters.acl_group_id("P1", None, None, "high", ["admin", "viewer"])
+    assert group.startswith("acl_") and len(group) == 20
+
+
+def test_opensearch_filter_requires_one_fully_matching_rule():
+    ctx = AuthorityContext(user="u", roles=["viewer"], project_codes=["P2", "P1"], discipline="eng")
+
+    clause = filters.opensearch_filter(ctx)
+
+    level, nested = clause["bool"]["filter"]
+    assert set(level["terms"]["authority_level"]) == {"AUTHORITATIVE", "DRAFT", "REFERENCE", "EXTERNAL"}
+    rule_clauses = nested["nested"]["query"]["bool"]["filter"]
+    project = rule_clauses[3]["bool"]["should"]
+    assert project[1] == {"terms": {"access_rules.project_code": ["P1", "P2"]}}
+    # Context without a classification only matches rules without one.
+    assert rule_clauses[1] == {"bool": {"must_not": {"exists": {"field": "access_rules.classification"}}}}
+    assert rule_clauses[-1] == {"terms": {"access_rules.allowed_roles": ["viewer"]}}
+
+
+def test_filters_deny_everything_without_roles():
+    ctx = AuthorityContext(user="u", roles=[], project_codes=["P1"])
+
+    assert filters.opensearch_filter(ctx) == {"bool": {"must_not": {"match_all": {}}}}
+    assert filters.qdrant_filter(ctx) == {"must": [{"has_id": []}]}
+
+
+def test_qdrant_filter_is_a_valid_nested_filter():
+    qmodels = pytest.importorskip("qdrant_client.http.models")
+    ctx = AuthorityContext(user="u", roles=["viewer"], project_codes=["P1"], classification="secret")
+
+    parsed = qmodels.Filter.model_validate(filters.qdrant_filter(ctx))
+
+    nested = parsed.must[1].nested
+    assert nested.key == "access_rules"
+    assert nested.filter.must[-1].match.any == ["viewer"]
+
+
+def test_acl_filters_match_groups_or_nothing():
+    assert filters.opensearch_acl_filter(["acl_b", "acl_a"]) == {"terms": {"acl_groups": ["acl_a", "acl_b"]}}
+    assert filters.opensearch_acl_filter([]) == {"bool": {"must_not": {"match_all": {}}}}
+    assert filters.qdrant_acl_filter([]) == {"must": [{"has_id": []}]}
+
+    qmodels = pytest.importorskip("qdrant_client.http.models")
+    parsed = qmodels.Filter.model_validate(filters.qdrant_acl_filter(["acl_a"]))
+    assert parsed.must[0].key == "acl_groups"
@@ -0,0 +1,277 @@
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.authority.app import engine, rule_index  # type: ignore
+from modules.authority.app.context import AuthorityContext  # type: ignore
+from modules.authority.app.filters import acl_group_id  # type: ignore
+from modules.authority.app.rule_index import RuleIndex  # type: ignore
+from modules.metadata.app.bootstrap import apply_migrations  # type: ignore
+from modules.metadata.app.config import settings  # type: ignore
+from modules.metadata.app.db import connection_cursor  # type: ignore
+
+
+def _rule(doc, rule_id, *, project=None, discipline=None, classification=None, sensitivity=None, roles=()):
+    return {
+        "document_id": doc,
+        "authority_level": "AUTHORITATIVE",
+        "rule_id": rule_id,
+        "rule_project_code": project,
+        "discipline": discipline,
+        "classification": classification,
+        "commercial_sensitivity": sensitivity,
+        "allowed_roles": list(roles),
+    }
+
+
+_ROWS = [
+    _rule("doc-1", 1, project="P1", discipline="eng", roles=["viewer"]),
+    _rule("doc-1", 2, project="P2", roles=["admin"]),
+    _rule("doc-2", 3, project="P1", discipline="eng", roles=["viewer"]),
+    _rule("doc-3", 4, classification="secret", roles=["viewer"]),
+    _rule("doc-4", 5, sensitivity="high", roles=["viewer", "admin"]),
+    _rule("doc-5", 6, roles=[]),
+    {"document_id": "doc-6", "authority_level": "AUTHORITATIVE", "rule_id": None},
+    {**_rule("doc-7", 7, roles=["viewer"]), "authority_level": "RUMOUR"},
+    _rule("doc-8", 8, project="P2", discipline="ops", roles=["viewer"]),
+]
+
+_CONTEXTS = [
+    AuthorityContext(user="a", roles=["viewer"], project_codes=["P1"], discipline="eng"),
+    AuthorityContext(user="b", roles=["admin"], project_codes=["P2"], discipline="ops", commercial_sensitivity="high"),
+    AuthorityContext(user="c", roles=["viewer"], project_codes=["P1", "P2"], discipline="ops", classification="secret"),
+    AuthorityContext(user="d", roles=[], project_codes=["P1"]),
+]
+
+
+@pytest.mark.parametrize("context", _CONTEXTS, ids=lambda ctx: ctx.user)
+def test_index_matches_row_by_row_evaluation(context):
+    grouped = engine._group_rows(_ROWS)
+    expected = [engine._evaluate_grouped_document(context, doc_id, grouped) for doc_id in grouped]
+    index = RuleIndex(_ROWS)
+
+    assert [engine.AccessDecision(*row) for row in index.decisions(context)] == expected
+    assert index.allowed_ids(context) == {d.document_id for d in expected if d.allowed}
+
+
+@pytest.mark.parametrize("context", _CONTEXTS, ids=lambda ctx: ctx.user)
+def test_summary_counts_match_per_document_decisions(context):
+    index = RuleIndex(_ROWS)
+    decisions = [engine.AccessDecision(*row) for row in index.decisions(context)]
+    denied = [d for d in decisions if not d.allowed]
+    expected_reasons = {}
+    for decision in denied:
+        for kind in {reason.split(":", 1)[-1] for reason in decision.reasons}:
+            expected_reasons[kind] = expected_reasons.get(kind, 0) + 1
+
+    summary = index.summary(context)
+
+    assert summary.allowed == index.allowed_bits(context)
+    assert (summary.allowed_count, summary.denied_count) == (len(decisions) - len(denied), len(denied))
+    assert summary.deny_reasons == expected_reasons
+    denied_ids = {index.document_ids[ordinal] for bits in summary.denied for ordinal in bits}
+    assert denied_ids == {d.document_id for d in denied}
+
+
+def test_index_groups_rules_with_identical_attributes():
+    stats = RuleIndex(_ROWS).stats
+    assert (stats["documents"], stats["rules"], stats["groups"]) == (8, 8, 7)
+
+
+def test_documents_with_identical_rule_sets_share_an_access_class():
+    rows = _ROWS + [
+        # Same group as doc-2 (rule ids differ) and an unknown authority level like doc-7.
+        _rule("doc-9", 9, project="P1", discipline="eng", roles=["viewer"]),
+        {**_rule("doc-10", 10, project="P9", roles=["admin"]), "authority_level": None},
+    ]
+    index = RuleIndex(rows)
+
+    assert index.stats["classes"] == 8
+    for context in _CONTEXTS:
+        allowed = index.allowed_ids(context)
+        assert ("doc-9" in allowed) == ("doc-2" in allowed)
+        assert "doc-10" not in allowed
+        assert allowed - {"doc-9"} == RuleIndex(_ROWS).allowed_ids(context)
+
+
+@pytest.mark.parametrize("context", _CONTEXTS, ids=lambda ctx: ctx.user)
+def test_acl_groups_select_exactly_the_allowed_documents(context):
+    index = RuleIndex(_ROWS)
+    groups = set(index.matching_acl_groups(context))
+
+    # What an engine filter on indexed acl_groups would return.
+    selected = {
+        row["document_id"]
+        for row in _ROWS
+        if row["rule_id"] is not None
+        and row["authority_level"] == "AUTHORITATIVE"
+        and acl_group_id(
+            row["rule_project_code"],
+            row["discipline"],
+            row["classification"],
+            row["commercial_sensitivity"],
+            row["allowed_roles"],
+        )
+        in groups
+    }
+    assert selected == index.allowed_ids(context)
+
+
+def test_acl_group_filter_is_opt_in(monkeypatch):
+    index = RuleIndex(_ROWS)
+    monkeypatch.setattr(engine, "get_rule_index", lambda: index)
+    context = _CONTEXTS[0]
+
+    # Indexes without (fresh) acl_groups must keep the exact document_id filter.
+    assert engine.get_allowed_acl_groups(context) is None
+
+    monkeypatch.setattr(engine.settings, "index_filter", "acl_groups")
+    assert engine.get_allowed_acl_groups(context) == index.matching_acl_groups(context)
+
+    monkeypatch.setattr(engine.settings, "index_filter", "groups")
+    with pytest.raises(ValueError):
+        engine.get_allowed_acl_groups(context)
+
+
+def _db_available() -> bool:
+    try:
+        conn = psycopg2.connect(
+            dbname=settings.db_name,
+            user=settings.db_user,
+            password=settings.db_password,
+            host=settings.db_host,
+            port=settings.db_port,
+            connect_timeout=1,
+        )
+        conn.close()
+        return True
+    except Exception:
+        return False
+
+
+@pytest.mark.skipif(not _db_available(), reason="Postgres not available")
+def test_index_rebuilds_when_rules_change(monkeypatch):
+    apply_migrations()
+    monkeypatch.setattr(rule_index.settings, "rule_index_check_interval", 0.0)
+    rule_index.invalidate_rule_index()
+    doc_id = f"doc-{uuid.uuid4()}"
+    context = AuthorityContext(user="idx", roles=["viewer"], project_codes=[doc_id])
+    try:
+        with connection_cursor() as cur:
+            cur.execute(
+                "INSERT INTO documents (document_id, title, document_type, authority_level) "
+                "VALUES (%s, 'Index', 'TEST', 'AUTHORITATIVE')",
+                (doc_id,),
+            )
+        first = rule_index.get_rule_index()
+        assert doc_id not in first.allowed_ids(context)
+        assert rule_index.get_rule_index() is first
+
+        with connection_cursor() as cur:
+            cur.execute(
+                "INSERT INTO access_rules (document_id, project_code, allowed_roles) VALUES (%s, %s, %s)",
+                (doc_id, doc_id, ["viewer"]),
+            )
+        rebuilt = rule_index.get_rule_index()
+        assert rebuilt is not first and rebuilt.version != first.version
+        assert doc_id in rebuilt.allowed_ids(context)
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM access_rules WHERE document_id = %s", (doc_id,))
+            cur.execute("DELETE FROM documents WHERE document_id = %s", (doc_id,))
+        rule_index.invalidate_rule_index()
+
+
+@pytest.mark.skipif(not _db_available(), reason="Postgres not available")
+def test_rules_snapshot_reads_version_and_rows_in_one_transaction(monkeypatch):
+    apply_migrations()
+    from modules.authority.app import repository  # type: ignore
+
+    statements = []
+    original = repository.execute_prepared
+
+    def spy(cur, name, sql, params=()):
+        cur.execute("SHOW transaction_isolation")
+        isolation = cur.fetchone()["transaction_isolation"]
+        statements.append((isolation, cur.connection.get_backend_pid()))
+        return original(cur, name, sql, params)
+
+    monkeypatch.setattr(repository, "execute_prepared", spy)
+    version, rows = repository.fetch_rules_snapshot()
+    monkeypatch.undo()
+
+    assert all("rule_id" in row for row in rows)
+    assert statements[:2] == [("repeatable read", statements[0][1])] * 2
+    assert repository.rules_changed_since(version) is False
+
+
+def _connect():
+    return psycopg2.connect(
+        dbname=settings.db_name,
+        user=settings.db_user,
+        password=settings.db_password,
+        host=settings.db_host,
+        port=settings.db_port,
+    )
+
+
+@pytest.mark.skipif(not _db_available(), reason="Postgres not available")
+def test_concurrent_rule_writers_do_not_wait_for_each_other():
+    apply_migrations()
+    from modules.authority.app import repository  # type: ignore
+
+    doc_ids = [f"doc-{uuid.uuid4()}" for _ in range(2)]
+    writers = [_connect() for _ in doc_ids]
+    try:
+        for conn, doc_id in zip(writers, doc_ids):
+            with conn.cursor() as cur:
+                # A shared counter row would block the second writer until the first commits.
+                cur.execute("SET lock_timeout = '2s'")
+                cur.execute(
+                    "INSERT INTO documents (document_id, title, document_type, authority_level) "
+                    "VALUES (%s, 'Writers', 'TEST', 'AUTHORITATIVE')",
+                    (doc_id,),
+                )
+        snapshot, _ = repository.fetch_rules_snapshot()
+        assert repository.rules_changed_since(snapshot) is False
+        writers[1].commit()
+        assert repository.rules_changed_since(snapshot) is True
+        writers[0].commit()
+    finally:
+        for conn in writers:
+            conn.rollback()
+            conn.close()
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM documents WHERE document_id = ANY(%s)", (doc_ids,))
+
+
+@pytest.mark.skipif(not _db_available(), reason="Postgres not available")
+def test_pruned_changes_invalidate_older_snapshots():
+    apply_migrations()
+    from modules.authority.app import repository  # type: ignore
+
+    before, _ = repository.fetch_rules_snapshot()
+    doc_id = f"doc-{uuid.uuid4()}"
+    try:
+        with connection_cursor() as cur:
+            cur.execute(
+                "INSERT INTO documents (document_id, title, document_type, authority_level) "
+                "VALUES (%s, 'Prune', 'TEST', 'AUTHORITATIVE')",
+                (doc_id,),
+            )
+        after, _ = repository.fetch_rules_snapshot()
+        assert repository.prune_rules_changes(0) >= 1
+
+        assert repository.rules_changed_since(before) is True
+        assert repository.rules_changed_since(after) is False
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM documents WHERE document_id = %s", (doc_id,))
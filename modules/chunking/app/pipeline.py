@@ -62,10 +62,8 @@ def chunk_extracted_text(artefact_id: str) -> Tuple[int, list[str]]:
     content = _load_artefact_content(artefact["storage_path"])
     chunks = create_chunks(artefact_id, content)
 
-    inserted_ids = []
-    for ch in chunks:
-        ChunkRepository.insert(ch)
-        inserted_ids.append(ch.chunk_id)
+    ChunkRepository.bulk_insert(chunks)
+    inserted_ids = [ch.chunk_id for ch in chunks]
 
     return len(chunks), inserted_ids
 
@@ -27,6 +27,12 @@ class Settings(BaseSettings):
     qdrant_collection: str = os.getenv("QDRANT_COLLECTION", "plk_chunks_v1")
 
     default_top_k: int = int(os.getenv("HYBRID_TOP_K", "10"))
+    # Filter candidates inside OpenSearch/Qdrant using the authority attributes
+    # denormalized at index time. Off by default: indexes built before those
+    # fields existed would match nothing, and the fields are a snapshot, so
+    # both indexes must be rebuilt before enabling it and after access-rule
+    # changes, or newly granted documents stay filtered out.
+    authority_prefilter: bool = os.getenv("HYBRID_AUTHORITY_PREFILTER", "false").lower() == "true"
 
     model_config = SettingsConfigDict(env_prefix="")
 
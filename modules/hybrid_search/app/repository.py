@@ -1,21 +1,36 @@
 """Read-only helpers for chunk retrieval."""
 
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
-from modules.metadata.app.db import connection_cursor  # type: ignore
+from modules.metadata.app.db import connection_cursor, execute_prepared  # type: ignore
 
 
 def get_chunk_with_document(chunk_id: str) -> Optional[Dict]:
     query = (
         """
-        SELECT c.chunk_id, c.content, c.artefact_id, dv.document_id
+        SELECT c.chunk_id, c.content, c.artefact_id, c.document_id
         FROM chunks c
-        JOIN artefacts a ON c.artefact_id = a.artefact_id
-        JOIN document_versions dv ON a.version_id = dv.version_id
-        WHERE c.chunk_id = %s
+        WHERE c.chunk_id = $1
         """
     )
-    with connection_cursor(dict_cursor=True) as cur:
-        cur.execute(query, (chunk_id,))
+    with connection_cursor(dict_cursor=True, read_only=True) as cur:
+        execute_prepared(cur, "chunk_with_document_by_id", query, (chunk_id,))
         row = cur.fetchone()
         return dict(row) if row else None
+
+
+def get_chunks_with_documents(chunk_ids: Iterable[str]) -> Dict[str, Dict]:
+    """Resolve many chunks in one round trip; returns rows keyed by chunk_id."""
+    ids = sorted({chunk_id for chunk_id in chunk_ids if chunk_id})
+    if not ids:
+        return {}
+    query = (
+        """
+        SELECT c.chunk_id, c.content, c.artefact_id, c.document_id
+        FROM chunks c
+        WHERE c.chunk_id = ANY($1)
+        """
+    )
+    with connection_cursor(dict_cursor=True, read_only=True) as cur:
+        execute_prepared(cur, "chunks_with_documents_by_ids", query, (ids,))
+        return {row["chunk_id"]: dict(row) for row in cur.fetchall()}
@@ -1,11 +1,12 @@
 """Hybrid search combining lexical (OpenSearch) and semantic (Qdrant)."""
 
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from uuid import uuid4
 
 from modules.authority.app.context import AuthorityContext  # type: ignore
-from modules.authority.app.engine import AccessDecision, evaluate_document_access  # type: ignore
+from modules.authority.app.engine import evaluate_documents_access  # type: ignore
+from modules.authority.app.filters import opensearch_filter, qdrant_filter  # type: ignore
 from modules.authority.app.policy import load_default_context  # type: ignore
 from modules.metadata.app.audit import audit_logger  # type: ignore
 from modules.vector_indexing.app.embeddings import embed_text  # type: ignore
@@ -16,7 +17,7 @@ from qdrant_client.http import models as qmodels
 from .config import settings
 from .opensearch_client import get_client as get_os_client
 from .qdrant_client import get_client as get_qdrant_client
-from .repository import get_chunk_with_document
+from .repository import get_chunks_with_documents
 
 
 def _normalize_scores(items: List[Dict], key: str) -> None:
@@ -29,7 +30,7 @@ def _normalize_scores(items: List[Dict], key: str) -> None:
         item[f"normalized_{key}"] = (item.get(key) or 0.0) / max_score
 
 
-def _search_lexical(query: str, top_k: int) -> List[Dict]:
+def _search_lexical(query: str, top_k: int, *, context: Optional[AuthorityContext] = None) -> List[Dict]:
     client: OpenSearch = get_os_client()
     body = {
         "query": {
@@ -38,6 +39,8 @@ def _search_lexical(query: str, top_k: int) -> List[Dict]:
             }
         }
     }
+    if context is not None and settings.authority_prefilter:
+        body["query"]["bool"]["filter"] = [opensearch_filter(context)]
     resp = client.search(index=settings.opensearch_index, body=body, size=top_k)
     hits = resp.get("hits", {}).get("hits", [])
     results: List[Dict] = []
@@ -56,7 +59,7 @@ def _search_lexical(query: str, top_k: int) -> List[Dict]:
     return results
 
 
-def _search_semantic(query: str, top_k: int) -> List[Dict]:
+def _search_semantic(query: str, top_k: int, *, context: Optional[AuthorityContext] = None) -> List[Dict]:
     client: QdrantClient = get_qdrant_client()
     vector = embed_text(query)
 
@@ -66,6 +69,7 @@ def _search_semantic(query: str, top_k: int) -> List[Dict]:
         limit=top_k,
         with_payload=True,
         with_vectors=False,
+        query_filter=qdrant_filter(context) if context is not None and settings.authority_prefilter else None,
     )
     points: List[qmodels.ScoredPoint] = getattr(response, "points", [])
 
@@ -86,19 +90,26 @@ def _search_semantic(query: str, top_k: int) -> List[Dict]:
     return results
 
 
-def _hydrate_entry(entry: Dict) -> None:
-    """Fill missing content/document/artefact from metadata DB."""
-    if entry.get("content") and entry.get("document_id") and entry.get("artefact_id"):
-        return
-    row = get_chunk_with_document(entry["chunk_id"])
-    if not row:
+def _needs_hydration(entry: Dict) -> bool:
+    return not (entry.get("content") and entry.get("document_id") and entry.get("artefact_id"))
+
+
+def _hydrate_entries(entries: Iterable[Dict]) -> None:
+    """Fill missing content/document/artefact from metadata DB in one lookup."""
+    pending = [entry for entry in entries if _needs_hydration(entry)]
+    if not pending:
         return
-    if not entry.get("content"):
-        entry["content"] = row.get("content")
-    if not entry.get("document_id"):
-        entry["document_id"] = row.get("document_id")
-    if not entry.get("artefact_id"):
-        entry["artefact_id"] = row.get("artefact_id")
+    rows = get_chunks_with_documents(entry["chunk_id"] for entry in pending)
+    for entry in pending:
+        row = rows.get(entry["chunk_id"])
+        if not row:
+            continue
+        if not entry.get("content"):
+            entry["content"] = row.get("content")
+        if not entry.get("document_id"):
+            entry["document_id"] = row.get("document_id")
+        if not entry.get("artefact_id"):
+            entry["artefact_id"] = row.get("artefact_id")
 
 
 def _require_value(value: object, label: str) -> None:
@@ -161,8 +172,22 @@ def hybrid_search(
     """
     Hybrid search with authority enforcement.
     
-    Retrieves candidates, evaluates authority per document, and filters denied results.
+    Retrieves authority-prefiltered candidates, evaluates authority for the
+    candidate set, and filters denied results.
+    In buffered audit mode the query's events are written in one batch before
+    the response is returned.
     """
+    with audit_logger.buffered():
+        return _hybrid_search(query, context, top_k, query_id=query_id)
+
+
+def _hybrid_search(
+    query: str,
+    context: Optional[AuthorityContext],
+    top_k: Optional[int],
+    *,
+    query_id: Optional[str],
+) -> Dict:
     ctx = context or load_default_context()
     k = top_k or settings.default_top_k
     qid = query_id or str(uuid4())
@@ -175,8 +200,10 @@ def hybrid_search(
     )
     audit_logger.search_query(actor=ctx.user, query=query, context=ctx, query_id=qid)
 
-    lex = _search_lexical(query, k)
-    sem = _search_semantic(query, k)
+    # Engines prune denied chunks natively; evaluate_documents_access below
+    # still verifies every candidate against the current rules.
+    lex = _search_lexical(query, k, context=ctx)
+    sem = _search_semantic(query, k, context=ctx)
     audit_logger.search_executed(
         actor=ctx.user,
         query_id=qid,
@@ -215,21 +242,23 @@ def hybrid_search(
                 "lexical_norm": 0.0,
             }
 
+    _hydrate_entries(merged.values())
+
+    for entry in merged.values():
+        if not entry.get("document_id"):
+            raise RuntimeError("Missing required field: document_id")
+    # One rules query and one audit flush for the whole candidate set.
+    decisions = evaluate_documents_access(
+        ctx, [entry["document_id"] for entry in merged.values()], query_id=qid
+    )
+
     results: List[Dict] = []
-    decisions: Dict[str, AccessDecision] = {}
     denied_count = 0
     for entry in merged.values():
         lexical_norm = entry.get("lexical_norm", 0.0)
         semantic_norm = entry.get("semantic_norm", 0.0)
         final_score = 0.5 * lexical_norm + 0.5 * semantic_norm
-        _hydrate_entry(entry)
-        doc_id = entry.get("document_id")
-        if not doc_id:
-            raise RuntimeError("Missing required field: document_id")
-        decision = decisions.get(doc_id)
-        if decision is None:
-            decision = evaluate_document_access(ctx, doc_id, query_id=qid)
-            decisions[doc_id] = decision
+        decision = decisions[entry["document_id"]]
         if not decision.allowed:
             denied_count += 1
             continue
@@ -21,7 +21,7 @@ from modules.metadata.app import audit as audit_module  # type: ignore
 def test_hybrid_search_filters_denied_high_score(monkeypatch):
     monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", lambda event: None)
 
-    def fake_lex(query: str, top_k: int):
+    def fake_lex(query: str, top_k: int, *, context=None):
         return [
             {
                 "chunk_id": "chunk-denied",
@@ -41,17 +41,20 @@ def test_hybrid_search_filters_denied_high_score(monkeypatch):
             },
         ]
 
-    def fake_sem(query: str, top_k: int):
+    def fake_sem(query: str, top_k: int, *, context=None):
         return []
 
-    def fake_eval(context: AuthorityContext, document_id: str, *, query_id=None):
-        if document_id == "doc-denied":
-            return AccessDecision(document_id=document_id, allowed=False, reasons=["no_access_rules"])
-        return AccessDecision(document_id=document_id, allowed=True, matched_rule_ids=[1])
+    def fake_eval(context: AuthorityContext, document_ids, *, query_id=None):
+        return {
+            document_id: AccessDecision(document_id=document_id, allowed=False, reasons=["no_access_rules"])
+            if document_id == "doc-denied"
+            else AccessDecision(document_id=document_id, allowed=True, matched_rule_ids=[1])
+            for document_id in document_ids
+        }
 
     monkeypatch.setattr(hybrid_search, "_search_lexical", fake_lex)
     monkeypatch.setattr(hybrid_search, "_search_semantic", fake_sem)
-    monkeypatch.setattr(hybrid_search, "evaluate_document_access", fake_eval)
+    monkeypatch.setattr(hybrid_search, "evaluate_documents_access", fake_eval)
 
     ctx = AuthorityContext(user="tester", roles=["viewer"], project_codes=["P1"], discipline="eng")
     response = hybrid_search.hybrid_search("query", context=ctx, top_k=2)
@@ -69,3 +72,98 @@ def test_audit_failure_aborts_hybrid_search(monkeypatch):
 
     with pytest.raises(audit_module.AuditLogError):
         hybrid_search.hybrid_search("query", context=AuthorityContext(user="tester"), top_k=1)
+
+
+def _single_hit_search(monkeypatch):
+    def fake_lex(query: str, top_k: int, *, context=None):
+        return [
+            {
+                "chunk_id": "chunk-allowed",
+                "document_id": "doc-allowed",
+                "artefact_id": "art-allowed",
+                "content": "allowed content",
+                "lexical_score": 1.0,
+                "normalized_lexical_score": 1.0,
+            }
+        ]
+
+    def fake_eval(context: AuthorityContext, document_ids, *, query_id=None):
+        decisions = {}
+        for document_id in document_ids:
+            decision = AccessDecision(document_id=document_id, allowed=True, matched_rule_ids=[1])
+            audit_module.audit_logger.authz_allow(context=context, decision=decision, query_id=query_id)
+            decisions[document_id] = decision
+        return decisions
+
+    monkeypatch.setattr(hybrid_search, "_search_lexical", fake_lex)
+    monkeypatch.setattr(hybrid_search, "_search_semantic", lambda query, top_k, *, context=None: [])
+    monkeypatch.setattr(hybrid_search, "evaluate_documents_access", fake_eval)
+
+
+def test_buffered_audit_writes_query_events_in_one_batch(monkeypatch):
+    _single_hit_search(monkeypatch)
+    monkeypatch.setattr(audit_module.settings, "audit_mode", "buffered")
+    batches = []
+
+    def fail_single(_event):
+        raise AssertionError("buffered mode must not insert events one by one")
+
+    monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", fail_single)
+    monkeypatch.setattr(
+        audit_module.AuditLogRepository, "insert_events", lambda events: batches.append(list(events))
+    )
+
+    response = hybrid_search.hybrid_search("query", context=AuthorityContext(user="tester"), top_k=1)
+
+    assert len(response["results"]) == 1
+    assert len(batches) == 1
+    actions = [event.action for event in batches[0]]
+    assert actions[0] == "QUERY_RECEIVED"
+    assert "AUTHZ_ALLOW" in actions
+    assert actions[-1] == "RESPONSE_RETURNED"
+    assert {event.details["query_id"] for event in batches[0]} == {response["query_id"]}
+
+
+def test_buffered_audit_flush_failure_aborts_hybrid_search(monkeypatch):
+    _single_hit_search(monkeypatch)
+    monkeypatch.setattr(audit_module.settings, "audit_mode", "buffered")
+
+    def raise_insert(_events):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(audit_module.AuditLogRepository, "insert_events", raise_insert)
+
+    with pytest.raises(audit_module.AuditLogError):
+        hybrid_search.hybrid_search("query", context=AuthorityContext(user="tester"), top_k=1)
+
+
+def test_engine_queries_carry_authority_prefilter(monkeypatch):
+    ctx = AuthorityContext(user="tester", roles=["viewer"], project_codes=["P1"])
+    captured = {}
+
+    class FakeOpenSearch:
+        def search(self, index, body, size):
+            captured["opensearch"] = body
+            return {"hits": {"hits": []}}
+
+    class FakeQdrant:
+        def query_points(self, **kwargs):
+            captured["qdrant"] = kwargs.get("query_filter")
+            return type("Response", (), {"points": []})()
+
+    monkeypatch.setattr(hybrid_search, "get_os_client", lambda: FakeOpenSearch())
+    monkeypatch.setattr(hybrid_search, "get_qdrant_client", lambda: FakeQdrant())
+    monkeypatch.setattr(hybrid_search, "embed_text", lambda text: [0.0])
+    monkeypatch.setattr(hybrid_search.settings, "authority_prefilter", True)
+
+    hybrid_search._search_lexical("query", 5, context=ctx)
+    hybrid_search._search_semantic("query", 5, context=ctx)
+
+    assert captured["opensearch"]["query"]["bool"]["filter"] == [hybrid_search.opensearch_filter(ctx)]
+    assert captured["qdrant"] == hybrid_search.qdrant_filter(ctx)
+
+    monkeypatch.setattr(hybrid_search.settings, "authority_prefilter", False)
+    hybrid_search._search_lexical("query", 5, context=ctx)
+    hybrid_search._search_semantic("query", 5, context=ctx)
+    assert "filter" not in captured["opensearch"]["query"]["bool"]
+    assert captured["qdrant"] is None
@@ -21,7 +21,7 @@ from modules.metadata.app import audit as audit_module  # type: ignore
 def test_response_contract_and_explanations(monkeypatch):
     monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", lambda event: None)
 
-    def fake_lex(query: str, top_k: int):
+    def fake_lex(query: str, top_k: int, *, context=None):
         return [
             {
                 "chunk_id": "chunk-1",
@@ -33,7 +33,7 @@ def test_response_contract_and_explanations(monkeypatch):
             }
         ]
 
-    def fake_sem(query: str, top_k: int):
+    def fake_sem(query: str, top_k: int, *, context=None):
         return [
             {
                 "chunk_id": "chunk-1",
@@ -44,14 +44,17 @@ def test_response_contract_and_explanations(monkeypatch):
             }
         ]
 
-    def fake_eval(context: AuthorityContext, document_id: str, *, query_id=None):
-        return AccessDecision(
-            document_id=document_id, allowed=True, reasons=["rule_match"], matched_rule_ids=[42]
-        )
+    def fake_eval(context: AuthorityContext, document_ids, *, query_id=None):
+        return {
+            document_id: AccessDecision(
+                document_id=document_id, allowed=True, reasons=["rule_match"], matched_rule_ids=[42]
+            )
+            for document_id in document_ids
+        }
 
     monkeypatch.setattr(hybrid_search, "_search_lexical", fake_lex)
     monkeypatch.setattr(hybrid_search, "_search_semantic", fake_sem)
-    monkeypatch.setattr(hybrid_search, "evaluate_document_access", fake_eval)
+    monkeypatch.setattr(hybrid_search, "evaluate_documents_access", fake_eval)
 
     ctx = AuthorityContext(user="tester", roles=["viewer"], project_codes=["P1"], discipline="eng")
     response = hybrid_search.hybrid_search("alpha", context=ctx, top_k=1, query_id="test-query-id")
@@ -78,7 +81,7 @@ def test_response_contract_and_explanations(monkeypatch):
 def test_missing_explanation_fails(monkeypatch):
     monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", lambda event: None)
 
-    def fake_lex(query: str, top_k: int):
+    def fake_lex(query: str, top_k: int, *, context=None):
         return [
             {
                 "chunk_id": "chunk-1",
@@ -90,17 +93,20 @@ def test_missing_explanation_fails(monkeypatch):
             }
         ]
 
-    def fake_sem(query: str, top_k: int):
+    def fake_sem(query: str, top_k: int, *, context=None):
         return []
 
-    def fake_eval(context: AuthorityContext, document_id: str, *, query_id=None):
-        return AccessDecision(
-            document_id=document_id, allowed=True, reasons=["rule_match"], matched_rule_ids=[1]
-        )
+    def fake_eval(context: AuthorityContext, document_ids, *, query_id=None):
+        return {
+            document_id: AccessDecision(
+                document_id=document_id, allowed=True, reasons=["rule_match"], matched_rule_ids=[1]
+            )
+            for document_id in document_ids
+        }
 
     monkeypatch.setattr(hybrid_search, "_search_lexical", fake_lex)
     monkeypatch.setattr(hybrid_search, "_search_semantic", fake_sem)
-    monkeypatch.setattr(hybrid_search, "evaluate_document_access", fake_eval)
+    monkeypatch.setattr(hybrid_search, "evaluate_documents_access", fake_eval)
 
     ctx = AuthorityContext(user="tester", roles=["viewer"], project_codes=["P1"], discipline="eng")
     with pytest.raises(RuntimeError):
@@ -110,3 +116,48 @@ def test_missing_explanation_fails(monkeypatch):
 def test_missing_query_id_rejected():
     with pytest.raises(RuntimeError):
         hybrid_search._build_response(query_id="", timestamp="now", query="alpha", results=[])
+
+
+def test_semantic_only_hits_hydrated_in_one_lookup(monkeypatch):
+    monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", lambda event: None)
+
+    def fake_sem(query: str, top_k: int, *, context=None):
+        return [
+            {
+                "chunk_id": f"chunk-{i}",
+                "document_id": None,
+                "artefact_id": None,
+                "semantic_score": 1.0,
+                "normalized_semantic_score": 1.0,
+            }
+            for i in range(3)
+        ]
+
+    lookups = []
+
+    def fake_lookup(chunk_ids):
+        ids = list(chunk_ids)
+        lookups.append(ids)
+        return {
+            chunk_id: {"chunk_id": chunk_id, "content": "semantic content", "artefact_id": "art-1", "document_id": "doc-1"}
+            for chunk_id in ids
+        }
+
+    def fake_eval(context: AuthorityContext, document_ids, *, query_id=None):
+        return {
+            document_id: AccessDecision(
+                document_id=document_id, allowed=True, reasons=["rule_match"], matched_rule_ids=[7]
+            )
+            for document_id in document_ids
+        }
+
+    monkeypatch.setattr(hybrid_search, "_search_lexical", lambda query, top_k, *, context=None: [])
+    monkeypatch.setattr(hybrid_search, "_search_semantic", fake_sem)
+    monkeypatch.setattr(hybrid_search, "get_chunks_with_documents", fake_lookup)
+    monkeypatch.setattr(hybrid_search, "evaluate_documents_access", fake_eval)
+
+    ctx = AuthorityContext(user="tester", roles=["viewer"], project_codes=["P1"], discipline="eng")
+    response = hybrid_search.hybrid_search("alpha", context=ctx, top_k=3, query_id="qid")
+
+    assert lookups == [["chunk-0", "chunk-1", "chunk-2"]]
+    assert [r["document_id"] for r in response["results"]] == ["doc-1"] * 3
@@ -4,6 +4,8 @@ from typing import List
 
 from opensearchpy import OpenSearch, helpers, exceptions
 
+from modules.authority.app.filters import OPENSEARCH_MAPPING  # type: ignore
+
 from .config import settings
 
 
@@ -26,6 +28,8 @@ CHUNK_INDEX_BODY = {
             "chunk_index": {"type": "integer"},
             "char_start": {"type": "integer"},
             "char_end": {"type": "integer"},
+            # Denormalized authority attributes for native filtering.
+            **OPENSEARCH_MAPPING,
         }
     },
 }
@@ -1,20 +1,24 @@
 """Lexical indexing pipeline."""
 
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterator, List, Optional
 
 from .opensearch_client import bulk_index, create_index, delete_index, get_client
 from .config import settings
 
+from modules.authority.app.filters import authority_fields_for, document_authority_fields  # type: ignore
 from modules.metadata.app.repository import ChunkRepository  # type: ignore
 
+BATCH_SIZE = 500
 
-def _load_all_chunks_with_lineage() -> List[Dict[str, Any]]:
-    # Fetch all chunks and resolve document_id via artefact -> version -> document join
-    rows = ChunkRepository.list_all_with_lineage()
-    return rows
 
+def _load_all_chunks_with_lineage() -> Iterator[Dict[str, Any]]:
+    # Stream all chunks with their denormalised document_id
+    return ChunkRepository.iter_all_with_lineage()
 
-def _to_opensearch_doc(row: Dict[str, Any]) -> Dict[str, Any]:
+
+def _to_opensearch_doc(
+    row: Dict[str, Any], authority: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
     meta = row.get("metadata") or {}
     return {
         "chunk_id": row["chunk_id"],
@@ -24,6 +28,7 @@ def _to_opensearch_doc(row: Dict[str, Any]) -> Dict[str, Any]:
         "chunk_index": meta.get("chunk_index"),
         "char_start": meta.get("char_start"),
         "char_end": meta.get("char_end"),
+        **authority_fields_for(authority or {}, row["document_id"]),
     }
 
 
@@ -32,8 +37,20 @@ def index_all_chunks() -> int:
     delete_index(client, settings.index_name)
     create_index(client, settings.index_name)
 
-    rows = _load_all_chunks_with_lineage()
-    docs = [_to_opensearch_doc(r) for r in rows]
-    if docs:
-        bulk_index(client, settings.index_name, docs)
-    return len(docs)
+    total = 0
+    rows: List[Dict[str, Any]] = []
+    for row in _load_all_chunks_with_lineage():
+        rows.append(row)
+        if len(rows) == BATCH_SIZE:
+            total += _index_batch(client, rows)
+            rows = []
+    if rows:
+        total += _index_batch(client, rows)
+    return total
+
+
+def _index_batch(client, rows: List[Dict[str, Any]]) -> int:
+    # One authority lookup per batch for the documents it touches.
+    authority = document_authority_fields(row["document_id"] for row in rows)
+    bulk_index(client, settings.index_name, [_to_opensearch_doc(row, authority) for row in rows])
+    return len(rows)
@@ -11,7 +11,8 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from modules.authority.app.context import AuthorityContext  # type: ignore
-from modules.authority.app.engine import get_allowed_document_ids  # type: ignore
+from modules.authority.app.engine import get_allowed_acl_groups, get_allowed_document_ids  # type: ignore
+from modules.authority.app.filters import opensearch_acl_filter  # type: ignore
 from modules.authority.app.policy import load_default_context  # type: ignore
 from modules.metadata.app.audit import audit_logger  # type: ignore
 from .config import settings
@@ -39,17 +40,26 @@ def search(query: str, *, size: int = 5, context: AuthorityContext | None = None
         )
         return
 
+    # A handful of ACL group ids instead of every allowed document id, when opted in.
+    acl_groups = get_allowed_acl_groups(ctx)
+    if acl_groups is None:
+        authority_filter = {"terms": {"document_id": list(allowed_doc_ids)}}
+    else:
+        authority_filter = opensearch_acl_filter(acl_groups)
+
     client: OpenSearch = get_client()
     body = {
         "query": {
             "bool": {
                 "must": {"match": {"content": query}},
-                "filter": [{"terms": {"document_id": list(allowed_doc_ids)}}],
+                "filter": [authority_filter],
             }
         }
     }
     resp = client.search(index=settings.index_name, body=body, size=size)
     hits = resp.get("hits", {}).get("hits", [])
+    # Groups are indexed per chunk and can lag rule changes; the allowed set is authoritative.
+    hits = [h for h in hits if h.get("_source", {}).get("document_id") in allowed_doc_ids]
     if not hits:
         print("No results")
         audit_logger.search_results_returned(
@@ -15,6 +15,7 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from modules.metadata.app import models as md_models  # type: ignore
+from modules.metadata.app.db import transaction  # type: ignore
 from modules.metadata.app.repository import (  # type: ignore
     DocumentRepository,
     DocumentVersionRepository,
@@ -152,14 +153,17 @@ def ingest_txt(document_id: str, title: str, path: Path, document_type: str, aut
         content_type="application/json",
     )
 
+    # Stage 8: Enhanced artefact metadata
+    extractor_name = extraction_result.get("metadata", {}).get("extractor", "unknown")
+    extractor_version = extraction_result.get("metadata", {}).get("version", "unknown")
+    confidence_score = extraction_result.get("confidence")
+
     doc = md_models.Document(
         document_id=document_id,
         title=title,
         document_type=document_type,
         authority_level=authority_level,
     )
-    DocumentRepository.insert(doc)
-
     version = md_models.DocumentVersion(
         version_id=version_id,
         document_id=document_id,
@@ -167,13 +171,6 @@ def ingest_txt(document_id: str, title: str, path: Path, document_type: str, aut
         source_path=str(path),
         checksum=checksum,
     )
-    DocumentVersionRepository.insert(version)
-
-    # Stage 8: Enhanced artefact metadata
-    extractor_name = extraction_result.get("metadata", {}).get("extractor", "unknown")
-    extractor_version = extraction_result.get("metadata", {}).get("version", "unknown")
-    confidence_score = extraction_result.get("confidence")
-    
     artefact = md_models.Artefact(
         artefact_id=artefact_id,
         version_id=version_id,
@@ -183,7 +180,13 @@ def ingest_txt(document_id: str, title: str, path: Path, document_type: str, aut
         tool_version=extractor_version,
         confidence_level=extraction_result["status"].upper(),  # SUCCESS, PARTIAL, FAILED
     )
-    ArtefactRepository.insert(artefact)
+
+    # One connection and one commit for the document/version/artefact rows;
+    # callers may wrap several ingests in transaction() to batch the commit.
+    with transaction():
+        DocumentRepository.insert(doc)
+        DocumentVersionRepository.insert(version)
+        ArtefactRepository.insert(artefact)
     
     # Print success details to stdout for UI capture
     print(json.dumps({
@@ -0,0 +1,70 @@
+"""Async (psycopg 3) connection pool mirroring db.connection_cursor."""
+
+import asyncio
+import contextlib
+from typing import Dict, Optional
+
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row, tuple_row
+from psycopg_pool import AsyncConnectionPool
+
+from .config import settings
+
+_pool: Optional[AsyncConnectionPool] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+_pool_lock: Optional[asyncio.Lock] = None
+
+
+def _conninfo() -> str:
+    return make_conninfo(
+        dbname=settings.db_name,
+        user=settings.db_user,
+        password=settings.db_password,
+        host=settings.db_host,
+        port=settings.db_port,
+    )
+
+
+async def get_async_pool() -> AsyncConnectionPool:
+    """Return the pool bound to the running event loop, opening it on first use."""
+    global _pool, _pool_loop, _pool_lock
+    loop = asyncio.get_running_loop()
+    if _pool is not None and _pool_loop is loop:
+        return _pool
+    if _pool_loop is not loop:
+        # Pools cannot be shared across event loops; drop one left by a closed loop.
+        _pool, _pool_loop, _pool_lock = None, loop, asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            pool = AsyncConnectionPool(
+                _conninfo(),
+                min_size=settings.pool_min_size,
+                max_size=settings.pool_max_size,
+                timeout=settings.pool_timeout,
+                max_idle=settings.pool_max_idle,
+                check=AsyncConnectionPool.check_connection,
+                open=False,
+            )
+            await pool.open()
+            _pool = pool
+    return _pool
+
+
+async def close_async_pool() -> None:
+    global _pool, _pool_loop, _pool_lock
+    pool, _pool, _pool_loop, _pool_lock = _pool, None, None, None
+    if pool is not None:
+        await pool.close()
+
+
+async def async_pool_stats() -> Dict[str, int]:
+    return (await get_async_pool()).get_stats()
+
+
+@contextlib.asynccontextmanager
+async def connection_cursor(*, dict_cursor: bool = False):
+    """Async context manager yielding a pooled cursor with automatic commit/rollback."""
+    pool = await get_async_pool()
+    async with pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row if dict_cursor else tuple_row) as cur:
+            yield cur
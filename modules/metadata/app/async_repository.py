@@ -0,0 +1,301 @@
+"""Async counterparts of the metadata repositories for asyncio services."""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from psycopg.types.json import Jsonb
+
+from .async_db import connection_cursor
+from .models import AccessRule, AuditLog, Chunk, Document
+from .repository import (
+    _context_ids,
+    _decision_set_ids,
+    _remember_contexts,
+    _remember_decision_sets,
+    _split_context,
+    _split_decision_set,
+)
+
+
+class AsyncDocumentRepository:
+    @staticmethod
+    async def insert(doc: Document) -> None:
+        async with connection_cursor() as cur:
+            await cur.execute(
+                """
+                INSERT INTO documents (
+                    document_id,
+                    title,
+                    document_type,
+                    authority_level,
+                    owner,
+                    project_code,
+                    status
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (document_id) DO NOTHING
+                """,
+                (
+                    doc.document_id,
+                    doc.title,
+                    doc.document_type,
+                    doc.authority_level,
+                    doc.owner,
+                    doc.project_code,
+                    doc.status,
+                ),
+            )
+
+    @staticmethod
+    async def get(document_id: str) -> Optional[Dict[str, Any]]:
+        async with connection_cursor(dict_cursor=True) as cur:
+            await cur.execute(
+                """
+                SELECT
+                    document_id,
+                    title,
+                    document_type,
+                    authority_level,
+                    owner,
+                    project_code,
+                    status,
+                    created_at
+                FROM documents
+                WHERE document_id = %s
+                """,
+                (document_id,),
+            )
+            row = await cur.fetchone()
+            return dict(row) if row else None
+
+    @staticmethod
+    async def update_status(document_id: str, status: str) -> int:
+        async with connection_cursor() as cur:
+            await cur.execute(
+                """
+                UPDATE documents
+                SET status = %s
+                WHERE document_id = %s
+                """,
+                (status, document_id),
+            )
+            return cur.rowcount
+
+
+class AsyncChunkRepository:
+    @staticmethod
+    async def insert(chunk: Chunk) -> None:
+        async with connection_cursor() as cur:
+            await cur.execute(
+                """
+                INSERT INTO chunks (
+                    chunk_id,
+                    artefact_id,
+                    chunk_type,
+                    content,
+                    metadata,
+                    version_id,
+                    document_id
+                ) VALUES (
+                    %s, %s, %s, %s, %s,
+                    (SELECT a.version_id FROM artefacts a WHERE a.artefact_id = %s),
+                    (
+                        SELECT dv.document_id
+                        FROM artefacts a
+                        JOIN document_versions dv ON a.version_id = dv.version_id
+                        WHERE a.artefact_id = %s
+                    )
+                )
+                ON CONFLICT (chunk_id) DO NOTHING
+                """,
+                (
+                    chunk.chunk_id,
+                    chunk.artefact_id,
+                    chunk.chunk_type,
+                    chunk.content,
+                    Jsonb(chunk.metadata),
+                    chunk.artefact_id,
+                    chunk.artefact_id,
+                ),
+            )
+
+    @staticmethod
+    async def get_by_artefact(artefact_id: str) -> List[Dict[str, Any]]:
+        async with connection_cursor(dict_cursor=True) as cur:
+            await cur.execute(
+                """
+                SELECT
+                    chunk_id,
+                    artefact_id,
+                    chunk_type,
+                    content,
+                    metadata
+                FROM chunks
+                WHERE artefact_id = %s
+                ORDER BY chunk_id
+                """,
+                (artefact_id,),
+            )
+            rows = await cur.fetchall()
+            return [dict(row) for row in rows]
+
+    @staticmethod
+    async def get_with_documents(chunk_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        ids = sorted({chunk_id for chunk_id in chunk_ids if chunk_id})
+        if not ids:
+            return {}
+        async with connection_cursor(dict_cursor=True) as cur:
+            await cur.execute(
+                """
+                SELECT chunk_id, content, artefact_id, document_id
+                FROM chunks
+                WHERE chunk_id = ANY(%s)
+                """,
+                (ids,),
+            )
+            rows = await cur.fetchall()
+            return {row["chunk_id"]: dict(row) for row in rows}
+
+
+class AsyncAccessRuleRepository:
+    @staticmethod
+    async def insert(rule: AccessRule) -> None:
+        async with connection_cursor() as cur:
+            await cur.execute(
+                """
+                INSERT INTO access_rules (
+                    document_id,
+                    project_code,
+                    discipline,
+                    classification,
+                    commercial_sensitivity,
+                    allowed_roles
+                ) VALUES (%s, %s, %s, %s, %s, %s)
+                RETURNING rule_id
+                """,
+                (
+                    rule.document_id,
+                    rule.project_code,
+                    rule.discipline,
+                    rule.classification,
+                    rule.commercial_sensitivity,
+                    rule.allowed_roles,
+                ),
+            )
+            returned = await cur.fetchone()
+            if returned:
+                rule.rule_id = returned[0]
+
+    @staticmethod
+    async def get_by_document(document_id: str) -> List[Dict[str, Any]]:
+        async with connection_cursor(dict_cursor=True) as cur:
+            await cur.execute(
+                """
+                SELECT
+                    rule_id,
+                    document_id,
+                    project_code,
+                    discipline,
+                    classification,
+                    commercial_sensitivity,
+                    allowed_roles,
+                    created_at
+                FROM access_rules
+                WHERE document_id = %s
+                ORDER BY rule_id
+                """,
+                (document_id,),
+            )
+            rows = await cur.fetchall()
+            return [dict(row) for row in rows]
+
+
+class AsyncAuditLogRepository:
+    @staticmethod
+    async def insert_event(event: AuditLog) -> None:
+        details, context, digest = _split_context(event.details)
+        details, decision_set, set_digest = _split_decision_set(details)
+        async with connection_cursor() as cur:
+            context_id = _context_ids.get(digest) if digest else None
+            if digest and context_id is None:
+                await cur.execute(
+                    """
+                    INSERT INTO audit_contexts (context_hash, context) VALUES (%s, %s)
+                    ON CONFLICT (context_hash) DO NOTHING
+                    """,
+                    (digest, Jsonb(context)),
+                )
+                await cur.execute(
+                    "SELECT context_id FROM audit_contexts WHERE context_hash = %s", (digest,)
+                )
+                context_id = (await cur.fetchone())[0]
+            decision_set_id = _decision_set_ids.get(set_digest) if set_digest else None
+            if set_digest and decision_set_id is None:
+                await cur.execute(
+                    """
+                    INSERT INTO audit_decision_sets (decision_set_hash, allowed_document_ids, denied_document_ids)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (decision_set_hash) DO NOTHING
+                    """,
+                    (set_digest, decision_set[0], decision_set[1]),
+                )
+                await cur.execute(
+                    "SELECT decision_set_id FROM audit_decision_sets WHERE decision_set_hash = %s", (set_digest,)
+                )
+                decision_set_id = (await cur.fetchone())[0]
+            await cur.execute(
+                """
+                INSERT INTO audit_log (
+                    actor,
+                    action,
+                    document_id,
+                    version_id,
+                    model_version,
+                    index_version,
+                    details,
+                    context_id,
+                    decision_set_id
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                RETURNING audit_id
+                """,
+                (
+                    event.actor,
+                    event.action,
+                    event.document_id,
+                    event.version_id,
+                    event.model_version,
+                    event.index_version,
+                    Jsonb(details) if details is not None else None,
+                    context_id,
+                    decision_set_id,
+                ),
+            )
+            returned = await cur.fetchone()
+            if returned:
+                event.audit_id = returned[0]
+        if digest:
+            _remember_contexts({digest: context_id})
+        if set_digest:
+            _remember_decision_sets({set_digest: decision_set_id})
+
+    @staticmethod
+    async def query_recent(limit: int = 50) -> List[Dict[str, Any]]:
+        async with connection_cursor(dict_cursor=True) as cur:
+            await cur.execute(
+                """
+                SELECT
+                    audit_id,
+                    actor,
+                    action,
+                    document_id,
+                    version_id,
+                    model_version,
+                    index_version,
+                    details,
+                    created_at
+                FROM audit_log_expanded
+                ORDER BY created_at DESC
+                LIMIT %s
+                """,
+                (limit,),
+            )
+            rows = await cur.fetchall()
+            return [dict(row) for row in rows]
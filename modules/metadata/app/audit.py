@@ -1,15 +1,20 @@
 """Audit logging helper with strict inserts."""
 
+import contextlib
+import contextvars
 import os
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from dotenv import load_dotenv
 from psycopg2.extras import Json
 
 from . import models
+from .audit_async import AuditQueueFullError, flush_async_writer, get_async_writer
+from .audit_spool import get_spool
+from .config import settings
 from .repository import AuditLogRepository
 
 _ENV_PATH = Path(__file__).resolve().parents[3] / "env" / ".env"
@@ -18,6 +23,20 @@ if _ENV_PATH.exists():
 
 _DEFAULT_ACTOR = os.getenv("PLK_ACTOR", "local_user")
 
+# Recorded on every event as details.write_mode: "sync" events were committed
+# before the caller continued, "spool" events were fsync'd locally first and
+# "async" events were only queued.
+_WRITE_MODES = {"sync": "sync", "buffered": "sync", "copy": "sync", "spool": "spool", "async": "async"}
+
+_buffer: contextvars.ContextVar[Optional[List[models.AuditLog]]] = contextvars.ContextVar(
+    "audit_buffer", default=None
+)
+
+
+def reason_kind(reason: str) -> str:
+    """Decision reason without its rule prefix: "rule_12:role_mismatch" -> "role_mismatch"."""
+    return reason.split(":", 1)[-1]
+
 
 def _context_summary(context: Any) -> dict:
     return {
@@ -45,6 +64,18 @@ class AuditLogError(RuntimeError):
 
 
 def _insert_or_raise(event: models.AuditLog) -> None:
+    if event.details is not None:
+        event.details["write_mode"] = _WRITE_MODES.get(settings.audit_mode, settings.audit_mode)
+    pending = _buffer.get()
+    if pending is not None:
+        pending.append(event)
+        return
+    if settings.audit_mode == "spool":
+        _spool_or_raise([event])
+        return
+    if settings.audit_mode == "async":
+        _submit_or_raise([event])
+        return
     try:
         AuditLogRepository.insert_event(event)
     except Exception as exc:  # noqa: BLE001 - raise for fail-closed audit
@@ -52,10 +83,72 @@ def _insert_or_raise(event: models.AuditLog) -> None:
         raise AuditLogError("audit logging failed") from exc
 
 
+def _flush_or_raise(events: List[models.AuditLog]) -> None:
+    if settings.audit_mode == "spool":
+        _spool_or_raise(events)
+        return
+    try:
+        if settings.audit_mode == "copy":
+            AuditLogRepository.copy_events(events)
+        else:
+            AuditLogRepository.insert_events(events)
+    except Exception as exc:  # noqa: BLE001 - raise for fail-closed audit
+        print(f"[audit] failed to flush {len(events)} audit events: {exc}", file=sys.stderr)
+        raise AuditLogError("audit logging failed") from exc
+
+
+def _spool_or_raise(events: List[models.AuditLog]) -> None:
+    try:
+        get_spool().append(events)
+    except Exception as exc:  # noqa: BLE001 - raise for fail-closed audit
+        print(f"[audit] failed to spool {len(events)} audit events: {exc}", file=sys.stderr)
+        raise AuditLogError("audit logging failed") from exc
+
+
+def _submit_or_raise(events: List[models.AuditLog]) -> None:
+    try:
+        get_async_writer().submit(events)
+    except AuditQueueFullError as exc:
+        print(f"[audit] {exc}", file=sys.stderr)
+        raise AuditLogError("audit queue full") from exc
+
+
 class AuditLogger:
     def __init__(self, actor: Optional[str] = None):
         self.actor = actor or _DEFAULT_ACTOR
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for events queued in async mode to reach Postgres (call on shutdown)."""
+        return flush_async_writer(timeout)
+
+    @contextlib.contextmanager
+    def buffered(self):
+        """
+        Collect the events emitted inside the block and write them with one
+        multi-row INSERT when it exits (PLK_AUDIT_MODE=buffered), one COPY
+        (PLK_AUDIT_MODE=copy) or one spool fsync (PLK_AUDIT_MODE=spool); a
+        no-op in sync and async mode. The block
+        only completes once the flush is durable, so a caller that returns
+        its response after the block stays fail-closed.
+        Events are also flushed when the block raises, matching what sync
+        mode would already have written. Nested blocks join the outer one.
+        """
+        if settings.audit_mode not in ("buffered", "copy", "spool") or _buffer.get() is not None:
+            yield
+            return
+        events: List[models.AuditLog] = []
+        token = _buffer.set(events)
+        try:
+            yield
+        except BaseException:
+            _buffer.reset(token)
+            with contextlib.suppress(AuditLogError):
+                # The original error already aborts the request.
+                _flush_or_raise(events)
+            raise
+        _buffer.reset(token)
+        _flush_or_raise(events)
+
     def _log_event(
         self,
         *,
@@ -117,6 +210,64 @@ class AuditLogger:
         )
         _insert_or_raise(event)
 
+    def authz_batch(self, *, context: Any, decisions: Iterable[Any], query_id: Optional[str]) -> None:
+        """One AUTHZ_BATCH row for a candidate set of decisions, see authz_batch_summary."""
+        allowed: List[str] = []
+        denied: List[str] = []
+        deny_reasons: Dict[str, int] = {}
+        for decision in decisions:
+            document_id = getattr(decision, "document_id", None)
+            if getattr(decision, "allowed", False):
+                allowed.append(document_id)
+                continue
+            denied.append(document_id)
+            for kind in {reason_kind(reason) for reason in getattr(decision, "reasons", []) or []}:
+                deny_reasons[kind] = deny_reasons.get(kind, 0) + 1
+        self.authz_batch_summary(
+            context=context,
+            allowed_count=len(allowed),
+            denied_count=len(denied),
+            deny_reasons=deny_reasons,
+            allowed_document_ids=allowed,
+            denied_document_ids=denied,
+            query_id=query_id,
+        )
+
+    def authz_batch_summary(
+        self,
+        *,
+        context: Any,
+        allowed_count: int,
+        denied_count: int,
+        deny_reasons: Dict[str, int],
+        allowed_document_ids: Iterable[str],
+        denied_document_ids: Iterable[str],
+        query_id: Optional[str],
+    ) -> None:
+        """
+        One AUTHZ_BATCH row: counts, how many denied documents had each
+        reason kind (see reason_kind), and the complete sorted allowed and
+        denied document ids. The id lists are stored once per distinct pair
+        in audit_decision_sets and referenced from the row, so repeated
+        queries under the same context and rules add no more than the row.
+        """
+        event = models.AuditLog(
+            actor=getattr(context, "user", None) or self.actor,
+            action="AUTHZ_BATCH",
+            details={
+                "query_id": _require_query_id(query_id),
+                "timestamp": _event_timestamp(),
+                "context": _context_summary(context),
+                "evaluated_count": allowed_count + denied_count,
+                "allowed_count": allowed_count,
+                "denied_count": denied_count,
+                "allowed_document_ids": sorted(allowed_document_ids),
+                "denied_document_ids": sorted(denied_document_ids),
+                "deny_reasons": deny_reasons,
+            },
+        )
+        _insert_or_raise(event)
+
     def search_query(
         self,
         *,
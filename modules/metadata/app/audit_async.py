@@ -0,0 +1,153 @@
+"""Fire-and-forget audit writer (PLK_AUDIT_MODE=async) for non-compliance deployments."""
+
+import atexit
+import queue
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from . import models
+from .config import settings
+from .repository import AuditLogRepository
+
+
+class AuditQueueFullError(RuntimeError):
+    pass
+
+
+class AsyncAuditWriter:
+    """
+    Bounded in-process queue drained by a background thread in batches.
+
+    ``submit`` returns as soon as the events are queued. When the queue is
+    full it blocks for up to ``put_timeout`` seconds and then either raises
+    AuditQueueFullError (``overflow="block"``) or drops the events and counts
+    them (``overflow="drop"``). Failed batches are reported and counted, not
+    retried: this mode trades the fail-closed guarantee for latency.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.2,
+        put_timeout: float = 1.0,
+        overflow: str = "block",
+    ):
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"Unknown audit overflow policy: {overflow}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.overflow = overflow
+
+        self._queue: "queue.Queue[models.AuditLog]" = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"submitted": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+        self._stop = threading.Event()
+        self._worker = threading.Thread(target=self._run, name="audit-async-writer", daemon=True)
+        self._worker.start()
+
+    def submit(self, events: Sequence[models.AuditLog]) -> None:
+        for index, event in enumerate(events):
+            try:
+                self._queue.put(event, timeout=self.put_timeout)
+            except queue.Full:
+                unsent = len(events) - index
+                if self.overflow == "block":
+                    self._count("submitted", index)
+                    raise AuditQueueFullError(
+                        f"audit queue full ({self._queue.maxsize} events) for {self.put_timeout}s"
+                    ) from None
+                self._count("submitted", index)
+                self._count("dropped", unsent)
+                print(f"[audit] queue full, dropped {unsent} audit events", file=sys.stderr)
+                return
+        self._count("submitted", len(events))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event has been written (or failed); False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """Flush-on-shutdown hook: drain the queue, then stop the worker."""
+        self.flush(timeout)
+        self._stop.set()
+        self._worker.join(timeout)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot["queued"] = self._queue.qsize()
+        return snapshot
+
+    def _count(self, key: str, amount: int) -> None:
+        with self._lock:
+            self._stats[key] += amount
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                AuditLogRepository.insert_events(batch)
+                self._count("written", len(batch))
+            except Exception as exc:  # noqa: BLE001 - async mode reports and carries on
+                self._count("failed", len(batch))
+                print(f"[audit] async write of {len(batch)} audit events failed: {exc}", file=sys.stderr)
+            finally:
+                self._count("batches", 1)
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _next_batch(self) -> List[models.AuditLog]:
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+
+_writer: Optional[AsyncAuditWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_async_writer() -> AsyncAuditWriter:
+    """Return the process-wide writer, starting it (and its shutdown flush) on first use."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                writer = AsyncAuditWriter(
+                    max_queue=settings.audit_async_queue_size,
+                    batch_size=settings.audit_async_batch_size,
+                    flush_interval=settings.audit_async_flush_interval,
+                    put_timeout=settings.audit_async_put_timeout,
+                    overflow=settings.audit_async_overflow,
+                )
+                atexit.register(writer.close)
+                _writer = writer
+    return _writer
+
+
+def flush_async_writer(timeout: Optional[float] = None) -> bool:
+    """Wait for queued async audit events to be written; a no-op if async mode never started."""
+    writer = _writer
+    return writer.flush(timeout) if writer is not None else True
@@ -0,0 +1,237 @@
+"""Audit log partition maintenance, archival, rollups and export."""
+
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+from .db import connection_cursor, transaction
+from .repository import DECISION_FILTERS, AuditLogRepository
+
+_PARTITION_NAME = re.compile(r"^audit_log_p(\d{4})(\d{2})$")
+
+# Distinct queries per actor; per document the number of queries that denied
+# it (per-document AUTHZ_DENY rows and every denied id of the AUTHZ_BATCH
+# rows' audit_decision_sets); and per actor the events in total and those the
+# audit UI's ALLOW/DENY filter matches, which the UI reads instead of
+# counting audit_log.
+_ROLLUP_SQL = f"""
+    INSERT INTO audit_daily_rollup (day, metric, subject, count)
+    SELECT %(day)s, 'queries_by_actor', actor, count(DISTINCT details->>'query_id')
+    FROM audit_log
+    WHERE created_at >= %(day)s AND created_at < %(next_day)s
+      AND action IN ('QUERY_RECEIVED', 'SEARCH_QUERY')
+    GROUP BY actor
+    UNION ALL
+    SELECT %(day)s, 'denials_by_document', document_id, count(DISTINCT query_id)
+    FROM (
+        SELECT document_id, details->>'query_id' AS query_id
+        FROM audit_log
+        WHERE created_at >= %(day)s AND created_at < %(next_day)s
+          AND action = 'AUTHZ_DENY'
+          AND document_id IS NOT NULL
+        UNION ALL
+        SELECT denied.document_id, a.details->>'query_id'
+        FROM audit_log a
+        JOIN audit_decision_sets s ON s.decision_set_id = a.decision_set_id
+        CROSS JOIN LATERAL unnest(s.denied_document_ids) AS denied(document_id)
+        WHERE a.created_at >= %(day)s AND a.created_at < %(next_day)s
+          AND a.action = 'AUTHZ_BATCH'
+    ) denials
+    GROUP BY document_id
+    UNION ALL
+    SELECT %(day)s, metric, actor, n
+    FROM (
+        SELECT
+            actor,
+            count(*) AS events,
+            count(*) FILTER (WHERE {DECISION_FILTERS["ALLOW"]}) AS allow_events,
+            count(*) FILTER (WHERE {DECISION_FILTERS["DENY"]}) AS deny_events
+        FROM audit_log
+        WHERE created_at >= %(day)s AND created_at < %(next_day)s
+        GROUP BY actor
+    ) per_actor
+    CROSS JOIN LATERAL (
+        VALUES ('events_by_actor', events), ('allow_events_by_actor', allow_events), ('deny_events_by_actor', deny_events)
+    ) AS metrics (metric, n)
+    WHERE n > 0
+"""
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def ensure_partitions(months_ahead: int = 3, *, start: Optional[date] = None) -> List[str]:
+    """Create monthly partitions from ``start``'s month through ``months_ahead`` months later."""
+    month = _month_start(start or date.today())
+    names = []
+    with transaction():
+        with connection_cursor() as cur:
+            for _ in range(months_ahead + 1):
+                cur.execute("SELECT audit_log_create_partition(%s)", (month,))
+                names.append(cur.fetchone()[0])
+                month = _next_month(month)
+    return names
+
+
+def list_partitions() -> List[Dict[str, Any]]:
+    """Monthly partitions of audit_log with their [lower, upper) bounds, oldest first."""
+    with connection_cursor() as cur:
+        cur.execute(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'audit_log'::regclass
+            ORDER BY c.relname
+            """
+        )
+        names = [row[0] for row in cur.fetchall()]
+    partitions = []
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if not match:
+            continue
+        lower = date(int(match.group(1)), int(match.group(2)), 1)
+        partitions.append({"name": name, "lower": lower, "upper": _next_month(lower)})
+    return partitions
+
+
+def refresh_rollup(day: date) -> int:
+    """Recompute audit_daily_rollup rows for ``day``; safe to re-run for late events."""
+    with transaction():
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_daily_rollup WHERE day = %s", (day,))
+            cur.execute(_ROLLUP_SQL, {"day": day, "next_day": day + timedelta(days=1)})
+            return cur.rowcount
+
+
+def detach_partitions(
+    before: date, *, archive_dir: Optional[Path] = None, drop: bool = False
+) -> List[str]:
+    """
+    Detach monthly partitions that end on or before ``before``.
+
+    Rollups for the partition's days are refreshed first so the audit UI
+    keeps its aggregates. With ``archive_dir`` the rows are written to
+    ``<partition>.csv.gz`` before detaching; ``drop`` removes the detached
+    table afterwards.
+    """
+    detached = []
+    for partition in list_partitions():
+        if partition["upper"] > before:
+            continue
+        name = partition["name"]
+        day = partition["lower"]
+        while day < partition["upper"]:
+            refresh_rollup(day)
+            day += timedelta(days=1)
+        if archive_dir is not None:
+            _archive_partition(name, Path(archive_dir))
+        with transaction():
+            with connection_cursor() as cur:
+                cur.execute(f'ALTER TABLE audit_log DETACH PARTITION "{name}"')
+                if drop:
+                    cur.execute(f'DROP TABLE "{name}"')
+        detached.append(name)
+    return detached
+
+
+def _archive_partition(name: str, archive_dir: Path) -> Path:
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    target = archive_dir / f"{name}.csv.gz"
+    partial = target.with_name(target.name + ".part")
+    with connection_cursor() as cur, gzip.open(partial, "wb") as fh:
+        cur.copy_expert(
+            # Join the interned context and decision sets so the archive stands on its own.
+            f'COPY (SELECT a.*, c.context, s.allowed_document_ids, s.denied_document_ids FROM "{name}" a '
+            "LEFT JOIN audit_contexts c ON c.context_id = a.context_id "
+            "LEFT JOIN audit_decision_sets s ON s.decision_set_id = a.decision_set_id "
+            "ORDER BY a.audit_id) TO STDOUT WITH (FORMAT csv, HEADER)",
+            fh,
+        )
+    os.replace(partial, target)
+    return target
+
+
+def export_jsonl(fh: IO[str], *, page_size: int = 1000, **filters: Any) -> int:
+    """Write events matching ``filters`` (see AuditLogRepository.query) as JSONL, oldest first."""
+    count = 0
+    for row in AuditLogRepository.iter_events(page_size=page_size, ascending=True, **filters):
+        fh.write(json.dumps(row, default=str) + "\n")
+        count += 1
+    return count
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Audit log partitions, archival, rollups and export")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("partitions", help="List monthly partitions")
+
+    ensure = sub.add_parser("ensure-partitions", help="Create upcoming monthly partitions")
+    ensure.add_argument("--months-ahead", type=int, default=3)
+
+    rollup = sub.add_parser("rollup", help="Refresh daily rollups")
+    rollup.add_argument("--day", type=date.fromisoformat, default=None, help="Last day (default: today)")
+    rollup.add_argument("--days", type=int, default=2, help="Number of days ending at --day")
+
+    detach = sub.add_parser("detach", help="Detach (and optionally archive/drop) old partitions")
+    detach.add_argument("--before", type=date.fromisoformat, required=True)
+    detach.add_argument("--archive-dir", type=Path, default=None)
+    detach.add_argument("--drop", action="store_true")
+
+    export = sub.add_parser("export", help="Stream matching events as JSONL")
+    export.add_argument("--out", default="-", help="Output file (default: stdout)")
+    export.add_argument("--action")
+    export.add_argument("--actor")
+    export.add_argument("--document-id")
+    export.add_argument("--query-id")
+    export.add_argument("--since", type=datetime.fromisoformat, default=None)
+    export.add_argument("--until", type=datetime.fromisoformat, default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "partitions":
+        for partition in list_partitions():
+            print(f"{partition['name']} [{partition['lower']}, {partition['upper']})")
+    elif args.command == "ensure-partitions":
+        for name in ensure_partitions(args.months_ahead):
+            print(name)
+    elif args.command == "rollup":
+        last = args.day or date.today()
+        for offset in range(args.days - 1, -1, -1):
+            day = last - timedelta(days=offset)
+            print(f"{day} {refresh_rollup(day)} rows")
+    elif args.command == "detach":
+        for name in detach_partitions(args.before, archive_dir=args.archive_dir, drop=args.drop):
+            print(f"detached {name}")
+    elif args.command == "export":
+        filters = {
+            "action": args.action,
+            "actor": args.actor,
+            "document_id": args.document_id,
+            "query_id": args.query_id,
+            "since": args.since,
+            "until": args.until,
+        }
+        if args.out == "-":
+            count = export_jsonl(sys.stdout, **filters)
+        else:
+            with open(args.out, "w", encoding="utf-8") as fh:
+                count = export_jsonl(fh, **filters)
+        print(f"exported {count} events", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
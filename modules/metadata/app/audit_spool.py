@@ -0,0 +1,418 @@
+"""Durable local write-ahead spool for audit events (PLK_AUDIT_MODE=spool)."""
+
+import argparse
+import atexit
+import json
+import os
+import sys
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import psycopg2
+
+from . import models
+from .config import settings
+from .repository import AuditLogRepository
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+    import msvcrt
+
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".jsonl"
+_WORKER_PREFIX = "worker-"
+_DEAD_LETTER = "dead-letter.jsonl"
+
+# Errors that retrying the same rows cannot fix (constraint violations, bad
+# values); anything else (connection loss, timeouts) is retried as is.
+_REJECTED_ERRORS = (psycopg2.IntegrityError, psycopg2.DataError)
+
+
+class SpoolLocked(RuntimeError):
+    """Another process (or spool instance) already owns the spool directory."""
+
+
+class AuditSpool:
+    """
+    Append-only, fsync'd JSONL segments drained to ``audit_log`` in bulk.
+
+    Every event gets a monotonically increasing sequence number. ``append``
+    returns only after the line is on disk. ``drain`` inserts spooled events
+    in sequence order, skipping any (spool_id, spool_seq) already stored,
+    then advances an fsync'd checkpoint. A crash between the two only causes
+    a replay that the database deduplicates, so each event lands exactly once.
+    Fully drained segments are deleted. Events the database rejects outright
+    are moved to ``dead-letter.jsonl`` with their error instead of blocking
+    every later event.
+
+    A spool owns its directory through an exclusive lock (``flock``, or
+    ``msvcrt.locking`` on Windows) held until ``stop``; a second owner would reuse the same spool_id and sequence
+    numbers, so opening a locked directory raises ``SpoolLocked``.
+    """
+
+    def __init__(self, directory: Path, *, segment_bytes: int = 16 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        self._lock_fd = _lock_directory(self.directory)
+        self.spool_id = self._load_spool_id()
+
+        self._append_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._checkpoint = self._read_checkpoint()
+        self._next_seq = max(self._checkpoint, self._recover_last_seq()) + 1
+        self._active: Optional[Path] = None
+        self._fh = None
+
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+
+    @property
+    def checkpoint(self) -> int:
+        """Sequence number of the last event known to be in audit_log."""
+        return self._checkpoint
+
+    # -- writing ---------------------------------------------------------
+
+    def append(self, events: Sequence[models.AuditLog]) -> List[int]:
+        """Durably spool ``events`` with one fsync and return their sequence numbers."""
+        if not events:
+            return []
+        with self._append_lock:
+            fh = self._segment_for_write()
+            seqs = []
+            lines = []
+            for event in events:
+                seq = self._next_seq
+                self._next_seq += 1
+                seqs.append(seq)
+                lines.append(json.dumps(_encode(seq, event), separators=(",", ":")) + "\n")
+            fh.write("".join(lines).encode("utf-8"))
+            fh.flush()
+            os.fsync(fh.fileno())
+            return seqs
+
+    def _segment_for_write(self):
+        if self._fh is not None and self._fh.tell() < self.segment_bytes:
+            return self._fh
+        if self._fh is not None:
+            self._fh.close()
+        self._active = self.directory / f"{_SEGMENT_PREFIX}{self._next_seq:020d}{_SEGMENT_SUFFIX}"
+        self._fh = open(self._active, "ab")
+        _fsync_dir(self.directory)
+        return self._fh
+
+    # -- draining --------------------------------------------------------
+
+    def pending(self) -> Iterator[Tuple[int, models.AuditLog]]:
+        """Yield spooled events newer than the checkpoint, in sequence order."""
+        checkpoint = self._checkpoint
+        for path in self._segments():
+            for seq, event in _read_segment(path):
+                if seq > checkpoint:
+                    yield seq, event
+
+    def drain(self, *, batch_size: int = 500) -> int:
+        """Insert pending events into audit_log; returns how many were drained."""
+        drained = 0
+        with self._drain_lock:
+            batch: List[Tuple[int, models.AuditLog]] = []
+            for item in self.pending():
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    drained += self._drain_batch(batch)
+                    batch = []
+            if batch:
+                drained += self._drain_batch(batch)
+            self._remove_drained_segments()
+        return drained
+
+    def _drain_batch(self, batch: List[Tuple[int, models.AuditLog]]) -> int:
+        try:
+            AuditLogRepository.insert_spooled(self.spool_id, batch)
+        except _REJECTED_ERRORS:
+            # Find the offending rows so the rest of the batch still lands.
+            self._drain_rows(batch)
+        self._write_checkpoint(batch[-1][0])
+        return len(batch)
+
+    def _drain_rows(self, batch: List[Tuple[int, models.AuditLog]]) -> None:
+        rejected = []
+        for item in batch:
+            try:
+                AuditLogRepository.insert_spooled(self.spool_id, [item])
+            except _REJECTED_ERRORS as exc:
+                rejected.append((item, exc))
+        if not rejected:
+            return
+        path = self.directory / _DEAD_LETTER
+        lines = []
+        for (seq, event), exc in rejected:
+            record = _encode(seq, event)
+            record["spool_id"] = self.spool_id
+            record["error"] = str(exc).strip()
+            lines.append(json.dumps(record, separators=(",", ":")) + "\n")
+        with open(path, "ab") as fh:
+            fh.write("".join(lines).encode("utf-8"))
+            fh.flush()
+            os.fsync(fh.fileno())
+        print(
+            f"[audit] ALERT: audit_log rejected {len(rejected)} spooled event(s); moved to {path}: "
+            f"{lines[0].strip()}",
+            file=sys.stderr,
+        )
+
+    def dead_letters(self) -> int:
+        """Number of events moved to the dead-letter file because audit_log rejected them."""
+        path = self.directory / _DEAD_LETTER
+        if not path.exists():
+            return 0
+        with open(path, "rb") as fh:
+            return sum(1 for _ in fh)
+
+    def _remove_drained_segments(self) -> None:
+        segments = self._segments()
+        # A segment's last seq is one below the next segment's first seq.
+        for path, following in zip(segments, segments[1:]):
+            if path == self._active:
+                continue
+            if _first_seq(following) - 1 <= self._checkpoint:
+                path.unlink()
+
+    # -- background worker ----------------------------------------------
+
+    def start(self, interval: float) -> None:
+        """Drain every ``interval`` seconds on a daemon thread (replaying any backlog first)."""
+        if self._worker is not None:
+            return
+        self._stop.clear()
+        self._worker = threading.Thread(
+            target=self._run, args=(interval,), name="audit-spool-drain", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self, *, final_drain: bool = True) -> None:
+        self._stop.set()
+        if self._worker is not None:
+            self._worker.join()
+            self._worker = None
+        if final_drain:
+            self._drain_quietly()
+        with self._append_lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+        if self._lock_fd is not None:
+            _unlock_directory(self._lock_fd)
+            self._lock_fd = None
+
+    def _run(self, interval: float) -> None:
+        while True:
+            self._drain_quietly()
+            if self._stop.wait(interval):
+                return
+
+    def _drain_quietly(self) -> None:
+        try:
+            self.drain(batch_size=settings.audit_spool_batch_size)
+        except Exception as exc:  # noqa: BLE001 - events stay spooled until the next attempt
+            print(f"[audit] spool drain failed, will retry: {exc}", file=sys.stderr)
+
+    # -- recovery ----------------------------------------------------------
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.directory.glob(f"{_SEGMENT_PREFIX}*{_SEGMENT_SUFFIX}"))
+
+    def _recover_last_seq(self) -> int:
+        segments = self._segments()
+        if not segments:
+            return 0
+        last = segments[-1]
+        _truncate_torn_tail(last)
+        seq = 0
+        for seq, _event in _read_segment(last):
+            pass
+        return seq or _first_seq(last) - 1
+
+    def _load_spool_id(self) -> str:
+        path = self.directory / "spool.id"
+        if path.exists():
+            return path.read_text(encoding="utf-8").strip()
+        spool_id = uuid.uuid4().hex
+        _atomic_write(path, spool_id)
+        return spool_id
+
+    def _read_checkpoint(self) -> int:
+        path = self.directory / "checkpoint"
+        if not path.exists():
+            return 0
+        return int(path.read_text(encoding="utf-8").strip() or 0)
+
+    def _write_checkpoint(self, seq: int) -> None:
+        _atomic_write(self.directory / "checkpoint", str(seq))
+        self._checkpoint = seq
+
+
+def claim_spool(root: Path, *, segment_bytes: int = 16 * 1024 * 1024) -> AuditSpool:
+    """
+    Open the first spool under ``root`` that no other process holds.
+
+    Each process gets its own ``worker-N`` subdirectory (and so its own
+    spool_id and sequence). Unlocked directories left by exited processes are
+    reused first, so their backlog is replayed by whoever claims them.
+    """
+    root = Path(root)
+    if (root / "spool.id").exists():
+        # Spool written directly into root before per-process subdirectories.
+        try:
+            return AuditSpool(root, segment_bytes=segment_bytes)
+        except SpoolLocked:
+            pass
+    n = 0
+    while True:
+        try:
+            return AuditSpool(root / f"{_WORKER_PREFIX}{n}", segment_bytes=segment_bytes)
+        except SpoolLocked:
+            n += 1
+
+
+def spool_directories(root: Path) -> List[Path]:
+    """Spool directories under ``root``, including a pre-subdirectory spool in root itself."""
+    root = Path(root)
+    found = [root] if (root / "spool.id").exists() else []
+    found.extend(sorted(p for p in root.glob(f"{_WORKER_PREFIX}*") if p.is_dir()))
+    return found
+
+
+def _lock_directory(directory: Path) -> int:
+    fd = os.open(directory / "lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:  # pragma: no cover - Windows
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+    except OSError:
+        os.close(fd)
+        raise SpoolLocked(f"audit spool {directory} is in use by another process") from None
+    return fd
+
+
+def _unlock_directory(fd: int) -> None:
+    if fcntl is None:  # pragma: no cover - Windows
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    os.close(fd)
+
+
+def _encode(seq: int, event: models.AuditLog) -> dict:
+    return {
+        "seq": seq,
+        "actor": event.actor,
+        "action": event.action,
+        "document_id": event.document_id,
+        "version_id": event.version_id,
+        "model_version": event.model_version,
+        "index_version": event.index_version,
+        "details": event.details,
+        "created_at": event.created_at or datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def _read_segment(path: Path) -> Iterator[Tuple[int, models.AuditLog]]:
+    with open(path, "rb") as fh:
+        for raw in fh:
+            if not raw.endswith(b"\n"):
+                # Being written right now (or torn by a crash); picked up next time.
+                return
+            record = json.loads(raw)
+            seq = record.pop("seq")
+            yield seq, models.AuditLog(**record)
+
+
+def _first_seq(path: Path) -> int:
+    return int(path.name[len(_SEGMENT_PREFIX) : -len(_SEGMENT_SUFFIX)])
+
+
+def _truncate_torn_tail(path: Path) -> None:
+    data = path.read_bytes()
+    end = data.rfind(b"\n") + 1
+    if end < len(data):
+        with open(path, "r+b") as fh:
+            fh.truncate(end)
+            os.fsync(fh.fileno())
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(text)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, path)
+    _fsync_dir(path.parent)
+
+
+def _fsync_dir(directory: Path) -> None:
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+_spool: Optional[AuditSpool] = None
+_spool_lock = threading.Lock()
+
+
+def get_spool() -> AuditSpool:
+    """Return the process-wide spool, replaying its backlog and starting the drain worker."""
+    global _spool
+    if _spool is None:
+        with _spool_lock:
+            if _spool is None:
+                spool = claim_spool(
+                    Path(settings.audit_spool_dir),
+                    segment_bytes=settings.audit_spool_segment_bytes,
+                )
+                spool.start(settings.audit_spool_drain_interval)
+                atexit.register(spool.stop)
+                _spool = spool
+    return _spool
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Inspect or drain the local audit spools")
+    parser.add_argument("--dir", default=settings.audit_spool_dir, help="Spool root directory")
+    parser.add_argument("--status", action="store_true", help="Show pending events without draining")
+    args = parser.parse_args(argv)
+
+    for directory in spool_directories(Path(args.dir)):
+        try:
+            spool = AuditSpool(directory, segment_bytes=settings.audit_spool_segment_bytes)
+        except SpoolLocked:
+            # A running process drains its own spool.
+            print(f"{directory}: in use, skipped")
+            continue
+        try:
+            if args.status:
+                pending = sum(1 for _ in spool.pending())
+                print(
+                    f"{directory}: spool_id={spool.spool_id} checkpoint={spool.checkpoint} "
+                    f"pending={pending} dead_letters={spool.dead_letters()}"
+                )
+            else:
+                drained = spool.drain(batch_size=settings.audit_spool_batch_size)
+                print(f"{directory}: drained {drained} events")
+        finally:
+            spool.stop(final_drain=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
+import argparse
 from pathlib import Path
+from typing import List
 
-from modules.metadata.app.db import connection_cursor
+from modules.metadata.app.audit_maintenance import ensure_partitions
+from modules.metadata.app.db import connection_cursor, transaction
+
+MIGRATIONS_DIR = Path(__file__).with_name("migrations")
+
+# Arbitrary constant shared by every process applying migrations.
+_MIGRATION_LOCK_ID = 7_402_113
 
 
 def ensure_schema() -> None:
@@ -8,9 +16,68 @@ def ensure_schema() -> None:
     sql = schema_path.read_text(encoding="utf-8")
     with connection_cursor() as cur:
         cur.execute(sql)
+    apply_migrations()
+    ensure_partitions()
+
+
+def _migration_files() -> List[Path]:
+    return sorted(MIGRATIONS_DIR.glob("*.sql"))
+
+
+def applied_migrations() -> List[str]:
+    with connection_cursor() as cur:
+        cur.execute("SELECT to_regclass('public.schema_migrations')")
+        if cur.fetchone()[0] is None:
+            return []
+        cur.execute("SELECT version FROM schema_migrations ORDER BY version")
+        return [row[0] for row in cur.fetchall()]
+
+
+def apply_migrations() -> List[str]:
+    """
+    Apply pending migrations from MIGRATIONS_DIR in filename order.
+
+    Each migration runs in its own transaction together with its
+    schema_migrations row, under an advisory lock so concurrent bootstraps
+    apply it once. Returns the versions applied by this call.
+    """
+    with connection_cursor() as cur:
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version TEXT PRIMARY KEY,
+                applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+
+    applied: List[str] = []
+    for path in _migration_files():
+        version = path.stem
+        with transaction():
+            with connection_cursor() as cur:
+                cur.execute("SELECT pg_advisory_xact_lock(%s)", (_MIGRATION_LOCK_ID,))
+                cur.execute("SELECT 1 FROM schema_migrations WHERE version = %s", (version,))
+                if cur.fetchone():
+                    continue
+                cur.execute(path.read_text(encoding="utf-8"))
+                cur.execute("INSERT INTO schema_migrations (version) VALUES (%s)", (version,))
+        applied.append(version)
+    return applied
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Create metadata schema and apply migrations")
+    parser.add_argument("--status", action="store_true", help="List applied and pending migrations")
+    args = parser.parse_args(argv)
 
+    if args.status:
+        done = set(applied_migrations())
+        for path in _migration_files():
+            state = "applied" if path.stem in done else "pending"
+            print(f"{path.stem} {state}")
+        return
 
-def main() -> None:
     ensure_schema()
 
 
@@ -1,6 +1,7 @@
 import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 
 from dotenv import load_dotenv
 
@@ -18,5 +19,41 @@ class Settings:
     db_host: str = os.getenv("POSTGRES_HOST", "localhost")
     db_port: int = int(os.getenv("POSTGRES_PORT", "5432"))
 
+    # Process-wide connection pool used by connection_cursor.
+    pool_min_size: int = int(os.getenv("POSTGRES_POOL_MIN_SIZE", "1"))
+    pool_max_size: int = int(os.getenv("POSTGRES_POOL_MAX_SIZE", "10"))
+    pool_timeout: float = float(os.getenv("POSTGRES_POOL_TIMEOUT", "30"))
+    pool_max_idle: float = float(os.getenv("POSTGRES_POOL_MAX_IDLE", "300"))
+    pool_health_check_after: float = float(os.getenv("POSTGRES_POOL_HEALTH_CHECK_AFTER", "30"))
+
+    # Optional read replica (libpq DSN) for read-only repository calls; reads
+    # fall back to the primary while it is unreachable.
+    read_dsn: Optional[str] = os.getenv("POSTGRES_READ_DSN") or None
+    read_retry_after: float = float(os.getenv("POSTGRES_READ_RETRY_AFTER", "30"))
+
+    # "sync" inserts every audit event as it happens; "buffered" collects the
+    # events of an AuditLogger.buffered() block and writes them in one INSERT
+    # ("copy" does the same with COPY, without returning audit_ids);
+    # "spool" fsyncs them to a local spool drained to audit_log in background;
+    # "async" only queues them for a background writer (not fail-closed, for
+    # benchmarking and low-sensitivity deployments).
+    audit_mode: str = os.getenv("PLK_AUDIT_MODE", "sync").lower()
+    audit_async_queue_size: int = int(os.getenv("PLK_AUDIT_ASYNC_QUEUE_SIZE", "10000"))
+    audit_async_batch_size: int = int(os.getenv("PLK_AUDIT_ASYNC_BATCH_SIZE", "500"))
+    audit_async_flush_interval: float = float(os.getenv("PLK_AUDIT_ASYNC_FLUSH_INTERVAL", "0.2"))
+    audit_async_put_timeout: float = float(os.getenv("PLK_AUDIT_ASYNC_PUT_TIMEOUT", "1"))
+    # "block" raises AuditLogError once the queue stays full past the timeout;
+    # "drop" discards and counts the events instead.
+    audit_async_overflow: str = os.getenv("PLK_AUDIT_ASYNC_OVERFLOW", "block").lower()
+    audit_spool_dir: str = os.getenv(
+        "PLK_AUDIT_SPOOL_DIR", str(Path(__file__).resolve().parents[3] / "var" / "audit_spool")
+    )
+    audit_spool_drain_interval: float = float(os.getenv("PLK_AUDIT_SPOOL_DRAIN_INTERVAL", "1"))
+    audit_spool_batch_size: int = int(os.getenv("PLK_AUDIT_SPOOL_BATCH_SIZE", "500"))
+    audit_spool_segment_bytes: int = int(os.getenv("PLK_AUDIT_SPOOL_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+
+    # Disable when connecting through a transaction-mode pooler (e.g. PgBouncer).
+    prepared_statements: bool = os.getenv("POSTGRES_PREPARED_STATEMENTS", "true").lower() == "true"
+
 
 settings = Settings()
@@ -1,10 +1,22 @@
 import contextlib
+import contextvars
+import re
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
 
 from .config import settings
 
 
+class PoolTimeoutError(RuntimeError):
+    pass
+
+
 def get_connection():
     """Create a new database connection using environment-backed settings."""
     return psycopg2.connect(
@@ -16,14 +28,390 @@ def get_connection():
     )
 
 
+class ConnectionPool:
+    """
+    Thread-safe, bounded pool of psycopg2 connections.
+
+    Idle connections are reused LIFO, probed with ``SELECT 1`` when they have
+    sat idle longer than ``health_check_after`` seconds, and closed once idle
+    longer than ``max_idle`` seconds (never dropping below ``min_size``).
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], "extensions.connection"],
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        max_idle: float = 300.0,
+        health_check_after: float = 30.0,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be >= 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+
+        self._cond = threading.Condition()
+        self._idle: List[Tuple[object, float]] = []
+        self._size = 0
+        self._closed = False
+        self._stats: Dict[str, int] = {
+            "checkouts": 0,
+            "waits": 0,
+            "creates": 0,
+            "evictions": 0,
+            "discards": 0,
+            "health_check_failures": 0,
+        }
+
+    def fill(self) -> None:
+        """Open connections until min_size are held by the pool."""
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            conn = self._create()
+            with self._cond:
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def getconn(self):
+        deadline = time.monotonic() + self.timeout
+        with self._cond:
+            waited = False
+            while True:
+                if self._closed:
+                    raise RuntimeError("connection pool is closed")
+                self._evict_idle_locked()
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn, last_used = None, None
+                    break
+                if not waited:
+                    self._stats["waits"] += 1
+                    waited = True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"no connection available within {self.timeout}s (max_size={self.max_size})"
+                    )
+                self._cond.wait(remaining)
+            self._stats["checkouts"] += 1
+
+        if conn is None:
+            return self._create()
+        if self._healthy(conn, last_used):
+            return conn
+        with self._cond:
+            self._stats["health_check_failures"] += 1
+        self._close_quietly(conn)
+        return self._create()
+
+    def putconn(self, conn, *, discard: bool = False) -> None:
+        if not discard and not conn.closed:
+            discard = conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE
+        with self._cond:
+            if discard or conn.closed or self._closed:
+                self._size -= 1
+                self._stats["discards"] += 1
+                keep = False
+            else:
+                self._idle.append((conn, time.monotonic()))
+                keep = True
+            self._cond.notify()
+        if not keep:
+            self._close_quietly(conn)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._size -= len(idle)
+            self._idle = []
+            self._cond.notify_all()
+        for conn in idle:
+            self._close_quietly(conn)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            snapshot = dict(self._stats)
+            snapshot["size"] = self._size
+            snapshot["idle"] = len(self._idle)
+            snapshot["in_use"] = self._size - len(self._idle)
+            return snapshot
+
+    def _create(self):
+        try:
+            conn = self._connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["creates"] += 1
+        return conn
+
+    def _healthy(self, conn, last_used: float) -> bool:
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_after:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:  # noqa: BLE001 - any failure means the connection is unusable
+            return False
+
+    def _evict_idle_locked(self) -> None:
+        # Oldest idle connections sit at the bottom of the LIFO stack.
+        now = time.monotonic()
+        while self._idle and self._size > self.min_size:
+            conn, last_used = self._idle[0]
+            if now - last_used < self.max_idle:
+                break
+            self._idle.pop(0)
+            self._size -= 1
+            self._stats["evictions"] += 1
+            self._close_quietly(conn)
+
+    @staticmethod
+    def _close_quietly(conn) -> None:
+        try:
+            conn.close()
+        except Exception:  # noqa: BLE001 - already broken connections may raise on close
+            pass
+
+
+_pool: Optional[ConnectionPool] = None
+_read_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+_replica_retry_at = 0.0
+
+
+def get_read_connection():
+    """Create a read-only connection to the replica named by POSTGRES_READ_DSN."""
+    conn = psycopg2.connect(settings.read_dsn)
+    conn.set_session(readonly=True)
+    return conn
+
+
+def _new_pool(connect: Callable[[], "extensions.connection"]) -> ConnectionPool:
+    pool = ConnectionPool(
+        connect,
+        min_size=settings.pool_min_size,
+        max_size=settings.pool_max_size,
+        timeout=settings.pool_timeout,
+        max_idle=settings.pool_max_idle,
+        health_check_after=settings.pool_health_check_after,
+    )
+    pool.fill()
+    return pool
+
+
+def get_pool() -> ConnectionPool:
+    """Return the process-wide pool, creating it from settings on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _new_pool(get_connection)
+    return _pool
+
+
+def get_read_pool() -> Optional[ConnectionPool]:
+    """Return the replica pool, or None when no POSTGRES_READ_DSN is configured."""
+    global _read_pool
+    if not settings.read_dsn:
+        return None
+    if _read_pool is None:
+        with _pool_lock:
+            if _read_pool is None:
+                _read_pool = _new_pool(get_read_connection)
+    return _read_pool
+
+
+def close_pool() -> None:
+    """Close idle pooled connections and drop the process-wide pools."""
+    global _pool, _read_pool
+    with _pool_lock:
+        pools, _pool, _read_pool = (_pool, _read_pool), None, None
+    for pool in pools:
+        if pool is not None:
+            pool.close()
+
+
+def pool_stats() -> Dict[str, int]:
+    return get_pool().stats()
+
+
+def read_pool_stats() -> Optional[Dict[str, int]]:
+    pool = get_read_pool()
+    return pool.stats() if pool is not None else None
+
+
+def _checkout(read_only: bool) -> Tuple[ConnectionPool, Any]:
+    """Pick the replica for read-only work when it is reachable, else the primary."""
+    global _replica_retry_at
+    if read_only and settings.read_dsn and time.monotonic() >= _replica_retry_at:
+        try:
+            pool = get_read_pool()
+            return pool, pool.getconn()
+        except (psycopg2.OperationalError, PoolTimeoutError):
+            # Back off so an unreachable replica costs one failed connect per window.
+            _replica_retry_at = time.monotonic() + settings.read_retry_after
+    pool = get_pool()
+    return pool, pool.getconn()
+
+
+_active_connection: contextvars.ContextVar = contextvars.ContextVar(
+    "metadata_active_connection", default=None
+)
+_after_commit: contextvars.ContextVar = contextvars.ContextVar("metadata_after_commit", default=None)
+
+
+def after_commit(callback: Callable[[], None]) -> None:
+    """
+    Run ``callback`` once the caller's writes are committed: when the
+    outermost transaction() block commits, or right away outside one (each
+    connection_cursor block commits on exit). Dropped if the unit rolls back.
+    """
+    pending = _after_commit.get()
+    if pending is None:
+        callback()
+    else:
+        pending.append(callback)
+
+
+@contextlib.contextmanager
+def transaction():
+    """
+    Unit of work spanning several repository calls.
+
+    Every connection_cursor opened inside the block runs on the same pooled
+    connection and nothing is committed until the outermost block exits
+    cleanly; any exception rolls the whole unit back. Nested blocks join the
+    enclosing unit.
+    """
+    active = _active_connection.get()
+    if active is not None:
+        yield active
+        return
+    pool = get_pool()
+    conn = pool.getconn()
+    token = _active_connection.set(conn)
+    callbacks: List[Callable[[], None]] = []
+    pending_token = _after_commit.set(callbacks)
+    discard = False
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        discard = not _rollback_quietly(conn)
+        raise
+    finally:
+        _after_commit.reset(pending_token)
+        _active_connection.reset(token)
+        pool.putconn(conn, discard=discard)
+    for callback in callbacks:
+        callback()
+
+
 @contextlib.contextmanager
-def connection_cursor(*, dict_cursor: bool = False):
-    """Context manager yielding a cursor with automatic commit/close."""
-    conn = get_connection()
+def connection_cursor(
+    *,
+    dict_cursor: bool = False,
+    name: Optional[str] = None,
+    itersize: Optional[int] = None,
+    read_only: bool = False,
+):
+    """
+    Context manager yielding a pooled cursor with automatic commit/rollback.
+
+    Passing ``name`` opens a server-side (named) cursor that streams rows in
+    batches of ``itersize`` instead of materialising the result client-side.
+    ``read_only`` callers are served from the read replica when one is
+    configured and reachable; inside transaction() they stay on the primary
+    so they see the unit's own writes.
+    """
+    cursor_factory = RealDictCursor if dict_cursor else None
+    active = _active_connection.get()
+    if active is not None:
+        # Commit/rollback belong to the enclosing transaction().
+        with _open_cursor(active, cursor_factory, name, itersize) as cur:
+            yield cur
+        return
+    pool, conn = _checkout(read_only)
+    discard = False
     try:
-        cursor_factory = RealDictCursor if dict_cursor else None
-        with conn.cursor(cursor_factory=cursor_factory) as cur:
+        with _open_cursor(conn, cursor_factory, name, itersize) as cur:
             yield cur
         conn.commit()
+    except BaseException:
+        discard = not _rollback_quietly(conn)
+        raise
     finally:
-        conn.close()
+        pool.putconn(conn, discard=discard)
+
+
+_PLACEHOLDER = re.compile(r"\$(\d+)")
+_prepared: "weakref.WeakKeyDictionary[Any, Set[str]]" = weakref.WeakKeyDictionary()
+_prepared_lock = threading.Lock()
+
+
+def execute_prepared(cur, name: str, sql: str, params: Sequence[Any] = ()) -> None:
+    """
+    Execute ``sql`` (written with ``$1..$n`` placeholders) as a named
+    server-side prepared statement.
+
+    The statement is prepared once per pooled connection and then only
+    EXECUTEd, so Postgres skips parsing and planning on repeat calls.
+    Prepared statements outlive transaction rollbacks, so the per-connection
+    registry stays valid for the life of the connection.
+    """
+    if not settings.prepared_statements:
+        # Same statement text, bound client-side: $n -> %(pn)s.
+        cur.execute(
+            _PLACEHOLDER.sub(lambda m: f"%(p{m.group(1)})s", sql),
+            {f"p{i}": value for i, value in enumerate(params, start=1)},
+        )
+        return
+    conn = cur.connection
+    with _prepared_lock:
+        names = _prepared.setdefault(conn, set())
+    if name not in names:
+        cur.execute(f"PREPARE {name} AS {sql}")
+        names.add(name)
+    if params:
+        placeholders = ", ".join(["%s"] * len(params))
+        cur.execute(f"EXECUTE {name} ({placeholders})", tuple(params))
+    else:
+        cur.execute(f"EXECUTE {name}")
+
+
+def _open_cursor(conn, cursor_factory, name: Optional[str], itersize: Optional[int]):
+    cur = conn.cursor(name=name, cursor_factory=cursor_factory)
+    if itersize:
+        cur.itersize = itersize
+    return cur
+
+
+def _rollback_quietly(conn) -> bool:
+    try:
+        conn.rollback()
+        return True
+    except Exception:  # noqa: BLE001 - caller discards the connection instead
+        return False
@@ -0,0 +1,7 @@
+-- Secondary indexes for lineage joins, authority fetches and audit reads.
+CREATE INDEX IF NOT EXISTS idx_artefacts_version_id ON artefacts (version_id);
+CREATE INDEX IF NOT EXISTS idx_document_versions_document_id ON document_versions (document_id);
+CREATE INDEX IF NOT EXISTS idx_document_versions_checksum ON document_versions (checksum);
+CREATE INDEX IF NOT EXISTS idx_chunks_artefact_id ON chunks (artefact_id);
+CREATE INDEX IF NOT EXISTS idx_access_rules_document_id ON access_rules (document_id);
+CREATE INDEX IF NOT EXISTS idx_audit_log_created_at ON audit_log (created_at);
@@ -0,0 +1,14 @@
+-- Carry version_id/document_id on chunks so lineage reads avoid the
+-- chunks -> artefacts -> document_versions joins.
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS version_id TEXT REFERENCES document_versions (version_id);
+ALTER TABLE chunks ADD COLUMN IF NOT EXISTS document_id TEXT REFERENCES documents (document_id);
+
+UPDATE chunks c
+SET version_id = a.version_id,
+    document_id = dv.document_id
+FROM artefacts a
+JOIN document_versions dv ON dv.version_id = a.version_id
+WHERE c.artefact_id = a.artefact_id
+  AND (c.version_id IS NULL OR c.document_id IS NULL);
+
+CREATE INDEX IF NOT EXISTS idx_chunks_document_id ON chunks (document_id);
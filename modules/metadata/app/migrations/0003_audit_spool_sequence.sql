@@ -0,0 +1,7 @@
+-- Idempotency key for events drained from a local audit spool: replaying a
+-- batch after a crash inserts nothing twice. NULLs (direct inserts) never
+-- conflict.
+ALTER TABLE audit_log ADD COLUMN IF NOT EXISTS spool_id TEXT;
+ALTER TABLE audit_log ADD COLUMN IF NOT EXISTS spool_seq BIGINT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_audit_log_spool_seq ON audit_log (spool_id, spool_seq);
@@ -0,0 +1,99 @@
+-- Monthly range partitions for audit_log so time-bounded reads prune to the
+-- months they touch and old months can be detached/archived cheaply. Rows
+-- outside every monthly partition land in audit_log_default rather than
+-- failing the (fail-closed) audit insert.
+ALTER TABLE audit_log RENAME TO audit_log_unpartitioned;
+
+CREATE TABLE audit_log (
+    audit_id BIGINT NOT NULL DEFAULT nextval('audit_log_audit_id_seq'),
+    actor TEXT NOT NULL,
+    action TEXT NOT NULL,
+    document_id TEXT REFERENCES documents(document_id),
+    version_id TEXT REFERENCES document_versions(version_id),
+    model_version TEXT,
+    index_version TEXT,
+    details JSONB,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    spool_id TEXT,
+    spool_seq BIGINT
+) PARTITION BY RANGE (created_at);
+
+ALTER SEQUENCE audit_log_audit_id_seq OWNED BY audit_log.audit_id;
+
+CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT;
+
+-- Creates the partition covering month_start's month (audit_log_pYYYYMM) if
+-- missing, moving any rows already parked in the default partition into it.
+CREATE OR REPLACE FUNCTION audit_log_create_partition(month_start DATE) RETURNS TEXT AS $$
+DECLARE
+    lower_bound DATE := date_trunc('month', month_start)::date;
+    upper_bound DATE := (date_trunc('month', month_start) + INTERVAL '1 month')::date;
+    partition_name TEXT := 'audit_log_p' || to_char(month_start, 'YYYYMM');
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+    IF EXISTS (
+        SELECT 1 FROM audit_log_default WHERE created_at >= lower_bound AND created_at < upper_bound
+    ) THEN
+        EXECUTE format('CREATE TABLE %I (LIKE audit_log INCLUDING DEFAULTS)', partition_name);
+        EXECUTE format(
+            'WITH moved AS (DELETE FROM audit_log_default WHERE created_at >= %L AND created_at < %L RETURNING *) '
+            'INSERT INTO %I SELECT * FROM moved',
+            lower_bound, upper_bound, partition_name
+        );
+        EXECUTE format(
+            'ALTER TABLE audit_log ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, lower_bound, upper_bound
+        );
+    ELSE
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF audit_log FOR VALUES FROM (%L) TO (%L)',
+            partition_name, lower_bound, upper_bound
+        );
+    END IF;
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    month_start DATE;
+BEGIN
+    FOR month_start IN
+        SELECT generate_series(
+            date_trunc('month', COALESCE((SELECT min(created_at) FROM audit_log_unpartitioned), now())),
+            date_trunc('month', now()) + INTERVAL '3 months',
+            INTERVAL '1 month'
+        )::date
+    LOOP
+        PERFORM audit_log_create_partition(month_start);
+    END LOOP;
+END;
+$$;
+
+INSERT INTO audit_log (
+    audit_id, actor, action, document_id, version_id, model_version,
+    index_version, details, created_at, spool_id, spool_seq
+)
+SELECT
+    audit_id, actor, action, document_id, version_id, model_version,
+    index_version, details, created_at, spool_id, spool_seq
+FROM audit_log_unpartitioned;
+
+DROP TABLE audit_log_unpartitioned;
+
+-- Unique constraints on a partitioned table must include the partition key.
+ALTER TABLE audit_log ADD PRIMARY KEY (audit_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_audit_log_created_at ON audit_log (created_at);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_audit_log_spool_seq ON audit_log (spool_id, spool_seq, created_at);
+
+-- Daily aggregates for the audit UI, refreshed by audit_maintenance rollup.
+CREATE TABLE IF NOT EXISTS audit_daily_rollup (
+    day DATE NOT NULL,
+    metric TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    count BIGINT NOT NULL,
+    refreshed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (day, metric, subject)
+);
@@ -0,0 +1,30 @@
+-- Authority context snapshots are stored once per distinct content hash and
+-- referenced from audit_log instead of being repeated in every row's details.
+CREATE TABLE IF NOT EXISTS audit_contexts (
+    context_id BIGSERIAL PRIMARY KEY,
+    context_hash TEXT NOT NULL UNIQUE,
+    context JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE audit_log ADD COLUMN IF NOT EXISTS context_id BIGINT REFERENCES audit_contexts (context_id);
+
+-- Rows in the pre-interning shape (details.context inline, no context_id)
+-- pass through unchanged.
+CREATE OR REPLACE VIEW audit_log_expanded AS
+SELECT
+    a.audit_id,
+    a.actor,
+    a.action,
+    a.document_id,
+    a.version_id,
+    a.model_version,
+    a.index_version,
+    CASE
+        WHEN c.context_id IS NULL THEN a.details
+        ELSE COALESCE(a.details, '{}'::jsonb) || jsonb_build_object('context', c.context)
+    END AS details,
+    a.created_at,
+    a.context_id
+FROM audit_log a
+LEFT JOIN audit_contexts c ON c.context_id = a.context_id;
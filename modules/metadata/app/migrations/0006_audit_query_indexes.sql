@@ -0,0 +1,28 @@
+-- Keyset pagination orders by (created_at, audit_id); each filter gets an
+-- index leading with its column so filtered pages are index range scans.
+DROP INDEX IF EXISTS idx_audit_log_created_at;
+CREATE INDEX IF NOT EXISTS idx_audit_log_created_at_id ON audit_log (created_at, audit_id);
+CREATE INDEX IF NOT EXISTS idx_audit_log_actor_created_at ON audit_log (actor, created_at, audit_id);
+CREATE INDEX IF NOT EXISTS idx_audit_log_action_created_at ON audit_log (action, created_at, audit_id);
+CREATE INDEX IF NOT EXISTS idx_audit_log_document_created_at ON audit_log (document_id, created_at, audit_id);
+CREATE INDEX IF NOT EXISTS idx_audit_log_query_id ON audit_log ((details->>'query_id'), created_at, audit_id);
+
+-- Expose query_id so filters on the view reach idx_audit_log_query_id.
+CREATE OR REPLACE VIEW audit_log_expanded AS
+SELECT
+    a.audit_id,
+    a.actor,
+    a.action,
+    a.document_id,
+    a.version_id,
+    a.model_version,
+    a.index_version,
+    CASE
+        WHEN c.context_id IS NULL THEN a.details
+        ELSE COALESCE(a.details, '{}'::jsonb) || jsonb_build_object('context', c.context)
+    END AS details,
+    a.created_at,
+    a.context_id,
+    a.details->>'query_id' AS query_id
+FROM audit_log a
+LEFT JOIN audit_contexts c ON c.context_id = a.context_id;
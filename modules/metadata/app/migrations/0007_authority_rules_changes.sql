@@ -0,0 +1,62 @@
+-- Changes to the inputs of authority evaluation. Each transaction writing
+-- documents or access_rules records its own id, so concurrent writers never
+-- wait on a shared row. A process labels its compiled rule index with the
+-- snapshot it was read in and rebuilds once a change committed that the
+-- snapshot does not see.
+CREATE TABLE IF NOT EXISTS authority_rules_changes (
+    xid xid8 PRIMARY KEY,
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- Newest change deleted by authority_rules_prune_changes. A snapshot whose
+-- xmin is not above it may have missed a deleted change and must rebuild.
+CREATE TABLE IF NOT EXISTS authority_rules_watermark (
+    singleton BOOLEAN PRIMARY KEY DEFAULT TRUE CHECK (singleton),
+    pruned_through xid8
+);
+
+INSERT INTO authority_rules_watermark (singleton, pruned_through) VALUES (TRUE, NULL)
+ON CONFLICT (singleton) DO NOTHING;
+
+CREATE OR REPLACE FUNCTION authority_rules_record_change() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    -- One row per transaction; later statements of the same one conflict with
+    -- their own row only, never with another writer's.
+    INSERT INTO authority_rules_changes (xid) VALUES (pg_current_xact_id())
+    ON CONFLICT (xid) DO NOTHING;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION authority_rules_prune_changes(keep INTERVAL) RETURNS BIGINT
+LANGUAGE plpgsql AS $$
+DECLARE
+    newest xid8;
+    removed BIGINT;
+BEGIN
+    WITH gone AS (
+        DELETE FROM authority_rules_changes WHERE changed_at < now() - keep RETURNING xid
+    )
+    SELECT max(xid), count(*) INTO newest, removed FROM gone;
+    IF newest IS NOT NULL THEN
+        UPDATE authority_rules_watermark SET pruned_through = GREATEST(pruned_through, newest);
+    END IF;
+    RETURN removed;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS documents_authority_rules_change ON documents;
+CREATE TRIGGER documents_authority_rules_change
+AFTER INSERT OR DELETE OR UPDATE OF document_id, authority_level ON documents
+FOR EACH STATEMENT EXECUTE FUNCTION authority_rules_record_change();
+
+DROP TRIGGER IF EXISTS documents_authority_rules_change_truncate ON documents;
+CREATE TRIGGER documents_authority_rules_change_truncate
+AFTER TRUNCATE ON documents
+FOR EACH STATEMENT EXECUTE FUNCTION authority_rules_record_change();
+
+DROP TRIGGER IF EXISTS access_rules_authority_rules_change ON access_rules;
+CREATE TRIGGER access_rules_authority_rules_change
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON access_rules
+FOR EACH STATEMENT EXECUTE FUNCTION authority_rules_record_change();
@@ -0,0 +1,38 @@
+-- Complete allowed/denied document id sets of AUTHZ_BATCH events, stored once
+-- per distinct content hash (the same context under the same rules yields
+-- the same sets) and referenced from audit_log, like audit_contexts. Large
+-- arrays are compressed by TOAST.
+CREATE TABLE IF NOT EXISTS audit_decision_sets (
+    decision_set_id BIGSERIAL PRIMARY KEY,
+    decision_set_hash TEXT NOT NULL UNIQUE,
+    allowed_document_ids TEXT[] NOT NULL,
+    denied_document_ids TEXT[] NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE audit_log ADD COLUMN IF NOT EXISTS decision_set_id BIGINT REFERENCES audit_decision_sets (decision_set_id);
+
+-- The id lists are separate columns rather than folded into details, so
+-- readers that only need the counts never fetch (or decompress) them.
+CREATE OR REPLACE VIEW audit_log_expanded AS
+SELECT
+    a.audit_id,
+    a.actor,
+    a.action,
+    a.document_id,
+    a.version_id,
+    a.model_version,
+    a.index_version,
+    CASE
+        WHEN c.context_id IS NULL THEN a.details
+        ELSE COALESCE(a.details, '{}'::jsonb) || jsonb_build_object('context', c.context)
+    END AS details,
+    a.created_at,
+    a.context_id,
+    a.details->>'query_id' AS query_id,
+    a.decision_set_id,
+    s.allowed_document_ids,
+    s.denied_document_ids
+FROM audit_log a
+LEFT JOIN audit_contexts c ON c.context_id = a.context_id
+LEFT JOIN audit_decision_sets s ON s.decision_set_id = a.decision_set_id;
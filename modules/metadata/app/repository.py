@@ -1,6 +1,12 @@
-from typing import List, Optional, Dict, Any
-from psycopg2.extras import Json
-from .db import connection_cursor
+import csv
+import hashlib
+import io
+import json
+import uuid
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Sequence, Tuple
+from psycopg2.extras import Json, execute_values
+from .db import after_commit, connection_cursor, execute_prepared
 from .models import (
     Document,
     DocumentVersion,
@@ -42,7 +48,7 @@ class DocumentRepository:
 
     @staticmethod
     def get(document_id: str) -> Optional[Dict[str, Any]]:
-        with connection_cursor(dict_cursor=True) as cur:
+        with connection_cursor(dict_cursor=True, read_only=True) as cur:
             cur.execute(
                 """
                 SELECT
@@ -209,8 +215,19 @@ class ChunkRepository:
                     artefact_id,
                     chunk_type,
                     content,
-                    metadata
-                ) VALUES (%s, %s, %s, %s, %s)
+                    metadata,
+                    version_id,
+                    document_id
+                ) VALUES (
+                    %s, %s, %s, %s, %s,
+                    (SELECT a.version_id FROM artefacts a WHERE a.artefact_id = %s),
+                    (
+                        SELECT dv.document_id
+                        FROM artefacts a
+                        JOIN document_versions dv ON a.version_id = dv.version_id
+                        WHERE a.artefact_id = %s
+                    )
+                )
                 ON CONFLICT (chunk_id) DO NOTHING
                 """,
                 (
@@ -219,9 +236,82 @@ class ChunkRepository:
                     chunk.chunk_type,
                     chunk.content,
                     Json(chunk.metadata),
+                    chunk.artefact_id,
+                    chunk.artefact_id,
                 ),
             )
 
+    @staticmethod
+    def bulk_insert(chunks: Iterable[Chunk], *, page_size: int = 5000) -> int:
+        """
+        COPY chunks into a session-local staging table, then merge them with
+        the same ON CONFLICT (chunk_id) DO NOTHING semantics as insert().
+
+        Returns the number of rows actually inserted.
+        """
+        inserted = 0
+        with connection_cursor() as cur:
+            cur.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS chunks_bulk_staging
+                    (LIKE chunks INCLUDING DEFAULTS)
+                    ON COMMIT DELETE ROWS
+                """
+            )
+            page: List[Chunk] = []
+            for chunk in chunks:
+                page.append(chunk)
+                if len(page) >= page_size:
+                    inserted += ChunkRepository._copy_page(cur, page)
+                    page = []
+            if page:
+                inserted += ChunkRepository._copy_page(cur, page)
+        return inserted
+
+    @staticmethod
+    def _copy_page(cur, page: List[Chunk]) -> int:
+        buffer = io.StringIO()
+        # Quote every value so empty content stays '' and only metadata maps to NULL.
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        for chunk in page:
+            writer.writerow(
+                [
+                    chunk.chunk_id,
+                    chunk.artefact_id,
+                    chunk.chunk_type,
+                    chunk.content,
+                    json.dumps(chunk.metadata) if chunk.metadata is not None else None,
+                ]
+            )
+        buffer.seek(0)
+        cur.execute("TRUNCATE chunks_bulk_staging")
+        cur.copy_expert(
+            """
+            COPY chunks_bulk_staging (chunk_id, artefact_id, chunk_type, content, metadata)
+            FROM STDIN WITH (FORMAT csv, FORCE_NULL (metadata))
+            """,
+            buffer,
+        )
+        cur.execute(
+            """
+            INSERT INTO chunks (
+                chunk_id,
+                artefact_id,
+                chunk_type,
+                content,
+                metadata,
+                version_id,
+                document_id
+            )
+            SELECT s.chunk_id, s.artefact_id, s.chunk_type, s.content, s.metadata, a.version_id, dv.document_id
+            FROM chunks_bulk_staging s
+            LEFT JOIN artefacts a ON s.artefact_id = a.artefact_id
+            LEFT JOIN document_versions dv ON a.version_id = dv.version_id
+            ON CONFLICT (chunk_id) DO NOTHING
+            """
+        )
+        return cur.rowcount
+
     @staticmethod
     def get_by_artefact(artefact_id: str) -> List[Dict[str, Any]]:
         with connection_cursor(dict_cursor=True) as cur:
@@ -244,25 +334,95 @@ class ChunkRepository:
 
     @staticmethod
     def list_all_with_lineage() -> List[Dict[str, Any]]:
-        """Fetch all chunks with document_id resolved via artefact -> version."""
-        with connection_cursor(dict_cursor=True) as cur:
-            cur.execute(
-                """
-                SELECT
-                    c.chunk_id,
-                    c.artefact_id,
-                    c.chunk_type,
-                    c.content,
-                    c.metadata,
-                    dv.document_id
-                FROM chunks c
-                JOIN artefacts a ON c.artefact_id = a.artefact_id
-                JOIN document_versions dv ON a.version_id = dv.version_id
-                ORDER BY c.chunk_id
-                """
+        """Fetch all chunks with their denormalised version_id/document_id."""
+        return list(ChunkRepository.iter_all_with_lineage())
+
+    @staticmethod
+    def iter_all_with_lineage(
+        *,
+        itersize: int = 2000,
+        page_size: Optional[int] = None,
+        after_chunk_id: Optional[str] = None,
+        artefact_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream chunks with lineage in chunk_id order with bounded memory.
+
+        By default rows come from one server-side cursor fetched ``itersize``
+        rows at a time. With ``page_size`` set, rows are read instead as
+        keyset pages (``chunk_id > last seen``), each on its own short
+        transaction, which suits slow consumers such as embedding.
+        ``after_chunk_id`` resumes after a previously seen chunk.
+        """
+        if page_size is None:
+            query, params = ChunkRepository._lineage_query(
+                after_chunk_id=after_chunk_id, artefact_id=artefact_id, document_id=document_id
             )
-            rows = cur.fetchall()
-            return [dict(row) for row in rows]
+            with connection_cursor(
+                dict_cursor=True, name=f"chunk_lineage_{uuid.uuid4().hex}", itersize=itersize
+            ) as cur:
+                cur.execute(query, params)
+                for row in cur:
+                    yield dict(row)
+            return
+
+        last_chunk_id = after_chunk_id
+        while True:
+            query, params = ChunkRepository._lineage_query(
+                after_chunk_id=last_chunk_id,
+                artefact_id=artefact_id,
+                document_id=document_id,
+                limit=page_size,
+            )
+            with connection_cursor(dict_cursor=True) as cur:
+                cur.execute(query, params)
+                rows = cur.fetchall()
+            for row in rows:
+                yield dict(row)
+            if len(rows) < page_size:
+                return
+            last_chunk_id = rows[-1]["chunk_id"]
+
+    @staticmethod
+    def _lineage_query(
+        *,
+        after_chunk_id: Optional[str] = None,
+        artefact_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple:
+        # Chunks whose artefact has no version (hence no document) have no
+        # lineage and were never indexed; keep them out as the old joins did.
+        conditions: List[str] = ["c.document_id IS NOT NULL"]
+        params: List[Any] = []
+        if after_chunk_id is not None:
+            conditions.append("c.chunk_id > %s")
+            params.append(after_chunk_id)
+        if artefact_id is not None:
+            conditions.append("c.artefact_id = %s")
+            params.append(artefact_id)
+        if document_id is not None:
+            conditions.append("c.document_id = %s")
+            params.append(document_id)
+        where = f"WHERE {' AND '.join(conditions)}"
+        query = f"""
+            SELECT
+                c.chunk_id,
+                c.artefact_id,
+                c.chunk_type,
+                c.content,
+                c.metadata,
+                c.version_id,
+                c.document_id
+            FROM chunks c
+            {where}
+            ORDER BY c.chunk_id
+            """
+        if limit is not None:
+            query += " LIMIT %s"
+            params.append(limit)
+        return query, tuple(params)
 
 
 class AccessRuleRepository:
@@ -296,7 +456,7 @@ class AccessRuleRepository:
 
     @staticmethod
     def get_by_document(document_id: str) -> List[Dict[str, Any]]:
-        with connection_cursor(dict_cursor=True) as cur:
+        with connection_cursor(dict_cursor=True, read_only=True) as cur:
             cur.execute(
                 """
                 SELECT
@@ -318,11 +478,163 @@ class AccessRuleRepository:
             return [dict(row) for row in rows]
 
 
+# Events the audit UI's decision filter matches: per-document decisions, and
+# AUTHZ_BATCH rows that allowed (denied) at least one document.
+DECISION_FILTERS = {
+    "ALLOW": (
+        "(details->'decision'->>'decision' = 'ALLOW'"
+        " OR (action = 'AUTHZ_BATCH' AND (details->>'allowed_count')::int > 0))"
+    ),
+    "DENY": (
+        "(details->'decision'->>'decision' = 'DENY'"
+        " OR (action = 'AUTHZ_BATCH' AND (details->>'denied_count')::int > 0))"
+    ),
+}
+
+_CONTEXT_CACHE_SIZE = 10_000
+_context_ids: Dict[str, int] = {}
+_decision_set_ids: Dict[str, int] = {}
+
+# AUTHZ_BATCH details keys moved to audit_decision_sets.
+_DECISION_SET_KEYS = ("allowed_document_ids", "denied_document_ids")
+
+
+def _split_context(details: Optional[Dict[str, Any]]) -> Tuple[Optional[Dict[str, Any]], Any, Optional[str]]:
+    """Split ``details["context"]`` off an audit payload and hash it canonically."""
+    if not details or "context" not in details:
+        return details, None, None
+    rest = {key: value for key, value in details.items() if key != "context"}
+    context = details["context"]
+    canonical = json.dumps(context, sort_keys=True, separators=(",", ":"), default=str)
+    return rest, context, hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _intern_contexts(cur, contexts: Dict[str, Any]) -> Dict[str, int]:
+    """Map context hashes to audit_contexts ids, inserting snapshots not stored yet."""
+    ids = {digest: _context_ids[digest] for digest in contexts if digest in _context_ids}
+    missing = [digest for digest in contexts if digest not in ids]
+    if missing:
+        execute_values(
+            cur,
+            """
+            INSERT INTO audit_contexts (context_hash, context) VALUES %s
+            ON CONFLICT (context_hash) DO NOTHING
+            """,
+            [(digest, Json(contexts[digest])) for digest in missing],
+        )
+        cur.execute(
+            "SELECT context_hash, context_id FROM audit_contexts WHERE context_hash = ANY(%s)",
+            (missing,),
+        )
+        ids.update(cur.fetchall())
+    return ids
+
+
+def _split_decision_set(
+    details: Optional[Dict[str, Any]],
+) -> Tuple[Optional[Dict[str, Any]], Optional[Tuple[List[str], List[str]]], Optional[str]]:
+    """Split the AUTHZ_BATCH allowed/denied id lists off an audit payload and hash them."""
+    if not details or not all(key in details for key in _DECISION_SET_KEYS):
+        return details, None, None
+    rest = {key: value for key, value in details.items() if key not in _DECISION_SET_KEYS}
+    document_ids = (list(details["allowed_document_ids"]), list(details["denied_document_ids"]))
+    canonical = json.dumps(document_ids, separators=(",", ":"))
+    return rest, document_ids, hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _intern_decision_sets(cur, sets: Dict[str, Tuple[List[str], List[str]]]) -> Dict[str, int]:
+    """Map decision set hashes to audit_decision_sets ids, inserting sets not stored yet."""
+    ids = {digest: _decision_set_ids[digest] for digest in sets if digest in _decision_set_ids}
+    missing = [digest for digest in sets if digest not in ids]
+    if missing:
+        execute_values(
+            cur,
+            """
+            INSERT INTO audit_decision_sets (decision_set_hash, allowed_document_ids, denied_document_ids)
+            VALUES %s
+            ON CONFLICT (decision_set_hash) DO NOTHING
+            """,
+            [(digest, sets[digest][0], sets[digest][1]) for digest in missing],
+        )
+        cur.execute(
+            """
+            SELECT decision_set_hash, decision_set_id
+            FROM audit_decision_sets
+            WHERE decision_set_hash = ANY(%s)
+            """,
+            (missing,),
+        )
+        ids.update(cur.fetchall())
+    return ids
+
+
+def _remember_contexts(ids: Dict[str, int]) -> None:
+    """
+    Cache context ids once the audit_contexts rows behind them are committed.
+    Inside transaction() that is when the unit commits: caching them earlier
+    would hand ids of rolled-back rows to later inserts, which then fail the
+    context_id foreign key.
+    """
+    _remember_after_commit(_context_ids, ids)
+
+
+def _remember_decision_sets(ids: Dict[str, int]) -> None:
+    """Cache decision set ids once committed, for the same reason as _remember_contexts."""
+    _remember_after_commit(_decision_set_ids, ids)
+
+
+def _remember_after_commit(cache: Dict[str, int], ids: Dict[str, int]) -> None:
+    def remember() -> None:
+        if len(cache) + len(ids) > _CONTEXT_CACHE_SIZE:
+            cache.clear()
+        cache.update(ids)
+
+    if ids:
+        after_commit(remember)
+
+
+def _remember_interned(interned: Tuple[Dict[str, int], Dict[str, int]]) -> None:
+    context_ids, decision_set_ids = interned
+    _remember_contexts(context_ids)
+    _remember_decision_sets(decision_set_ids)
+
+
+def _audit_rows(
+    cur, events: Sequence[AuditLog]
+) -> Tuple[List[tuple], Tuple[Dict[str, int], Dict[str, int]]]:
+    """Column values for events, with their context snapshots and decision sets interned."""
+    split = []
+    for event in events:
+        details, context, context_digest = _split_context(event.details)
+        details, decision_set, set_digest = _split_decision_set(details)
+        split.append((details, context, context_digest, decision_set, set_digest))
+    context_ids = _intern_contexts(cur, {digest: context for _, context, digest, _, _ in split if digest})
+    set_ids = _intern_decision_sets(cur, {digest: sets for _, _, _, sets, digest in split if digest})
+    rows = [
+        (
+            event.actor,
+            event.action,
+            event.document_id,
+            event.version_id,
+            event.model_version,
+            event.index_version,
+            Json(details) if details is not None else None,
+            context_ids[context_digest] if context_digest else None,
+            set_ids[set_digest] if set_digest else None,
+        )
+        for event, (details, _, context_digest, _, set_digest) in zip(events, split)
+    ]
+    return rows, (context_ids, set_ids)
+
+
 class AuditLogRepository:
     @staticmethod
     def insert_event(event: AuditLog) -> None:
         with connection_cursor() as cur:
-            cur.execute(
+            rows, interned = _audit_rows(cur, [event])
+            execute_prepared(
+                cur,
+                "audit_log_insert",
                 """
                 INSERT INTO audit_log (
                     actor,
@@ -331,29 +643,175 @@ class AuditLogRepository:
                     version_id,
                     model_version,
                     index_version,
-                    details
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    details,
+                    context_id,
+                    decision_set_id
+                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
                 RETURNING audit_id
                 """,
-                (
-                    event.actor,
-                    event.action,
-                    event.document_id,
-                    event.version_id,
-                    event.model_version,
-                    event.index_version,
-                    Json(event.details) if event.details is not None else None,
-                ),
+                rows[0],
             )
             returned = cur.fetchone()
             if returned:
                 event.audit_id = returned[0]
+        _remember_interned(interned)
 
     @staticmethod
-    def query_recent(limit: int = 50) -> List[Dict[str, Any]]:
-        with connection_cursor(dict_cursor=True) as cur:
-            cur.execute(
+    def insert_events(events: Sequence[AuditLog]) -> None:
+        """Insert several events with one multi-row INSERT, assigning audit_ids in order."""
+        if not events:
+            return
+        with connection_cursor() as cur:
+            rows, interned = _audit_rows(cur, events)
+            returned = execute_values(
+                cur,
                 """
+                INSERT INTO audit_log (
+                    actor,
+                    action,
+                    document_id,
+                    version_id,
+                    model_version,
+                    index_version,
+                    details,
+                    context_id,
+                    decision_set_id
+                ) VALUES %s
+                RETURNING audit_id
+                """,
+                rows,
+                page_size=len(events),
+                fetch=True,
+            )
+        _remember_interned(interned)
+        for event, row in zip(events, returned):
+            event.audit_id = row[0]
+
+    @staticmethod
+    def copy_events(events: Sequence[AuditLog]) -> int:
+        """
+        Bulk-load events with COPY (PLK_AUDIT_MODE=copy). Cheaper than the
+        multi-row INSERT for large batches, but audit_ids are not assigned
+        back to the events.
+        """
+        if not events:
+            return 0
+        with connection_cursor() as cur:
+            rows, interned = _audit_rows(cur, events)
+            buffer = io.StringIO()
+            # Same quoting as chunk bulk loads: quoted empty values become NULL.
+            writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+            for row in rows:
+                details = row[6]
+                writer.writerow(row[:6] + (json.dumps(details.adapted) if details is not None else None,) + row[7:])
+            buffer.seek(0)
+            cur.copy_expert(
+                """
+                COPY audit_log (
+                    actor,
+                    action,
+                    document_id,
+                    version_id,
+                    model_version,
+                    index_version,
+                    details,
+                    context_id,
+                    decision_set_id
+                ) FROM STDIN WITH (
+                    FORMAT csv,
+                    FORCE_NULL (document_id, version_id, model_version, index_version, details, context_id, decision_set_id)
+                )
+                """,
+                buffer,
+            )
+        _remember_interned(interned)
+        return len(rows)
+
+    @staticmethod
+    def insert_spooled(spool_id: str, events: Sequence[Tuple[int, AuditLog]]) -> int:
+        """
+        Insert (spool_seq, event) pairs drained from a local spool, keeping
+        their original timestamps. Pairs already present are skipped, so a
+        replayed batch is harmless. Returns the number of new rows.
+        """
+        if not events:
+            return 0
+        with connection_cursor() as cur:
+            rows, interned = _audit_rows(cur, [event for _, event in events])
+            returned = execute_values(
+                cur,
+                """
+                INSERT INTO audit_log (
+                    actor,
+                    action,
+                    document_id,
+                    version_id,
+                    model_version,
+                    index_version,
+                    details,
+                    context_id,
+                    decision_set_id,
+                    created_at,
+                    spool_id,
+                    spool_seq
+                ) VALUES %s
+                ON CONFLICT (spool_id, spool_seq, created_at) DO NOTHING
+                RETURNING audit_id
+                """,
+                [row + (event.created_at, spool_id, seq) for row, (seq, event) in zip(rows, events)],
+                page_size=len(events),
+                fetch=True,
+            )
+        _remember_interned(interned)
+        return len(returned)
+
+    @staticmethod
+    def query_recent(limit: int = 50, *, since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Newest events first; ``since`` bounds the scan to the partitions it covers."""
+        return AuditLogRepository.query(limit=limit, since=since)
+
+    @staticmethod
+    def query(
+        *,
+        action: Optional[str] = None,
+        actor: Optional[str] = None,
+        document_id: Optional[str] = None,
+        query_id: Optional[str] = None,
+        decision: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        cursor: Optional[Tuple[datetime, int]] = None,
+        ascending: bool = False,
+        limit: int = 50,
+        decision_sets: bool = True,
+    ) -> List[Dict[str, Any]]:
+        """
+        One keyset page of audit events ordered by (created_at, audit_id),
+        newest first unless ``ascending``. Pass the last row's
+        ``(created_at, audit_id)`` as ``cursor`` to fetch the next page.
+        ``since``/``until`` ([since, until)) prune partitions; ``decision``
+        (ALLOW or DENY) keeps the events in DECISION_FILTERS. AUTHZ_BATCH
+        details get their complete allowed/denied id lists back unless
+        ``decision_sets`` is False, which skips reading them.
+        """
+        clauses, params = AuditLogRepository._event_filters(
+            action=action,
+            actor=actor,
+            document_id=document_id,
+            query_id=query_id,
+            decision=decision,
+            since=since,
+            until=until,
+        )
+        if cursor is not None:
+            clauses.append(f"(created_at, audit_id) {'>' if ascending else '<'} (%s, %s)")
+            params.extend(cursor)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        direction = "ASC" if ascending else "DESC"
+        params.append(limit)
+        with connection_cursor(dict_cursor=True, read_only=True) as cur:
+            cur.execute(
+                f"""
                 SELECT
                     audit_id,
                     actor,
@@ -364,11 +822,200 @@ class AuditLogRepository:
                     index_version,
                     details,
                     created_at
-                FROM audit_log
-                ORDER BY created_at DESC
+                    {", allowed_document_ids, denied_document_ids" if decision_sets else ""}
+                FROM audit_log_expanded
+                {where}
+                ORDER BY created_at {direction}, audit_id {direction}
                 LIMIT %s
                 """,
-                (limit,),
+                tuple(params),
             )
-            rows = cur.fetchall()
-            return [dict(row) for row in rows]
+            rows = [dict(row) for row in cur.fetchall()]
+        if decision_sets:
+            for row in rows:
+                allowed, denied = row.pop("allowed_document_ids"), row.pop("denied_document_ids")
+                if allowed is not None:
+                    row["details"] = {
+                        **(row["details"] or {}),
+                        "allowed_document_ids": allowed,
+                        "denied_document_ids": denied,
+                    }
+        return rows
+
+    @staticmethod
+    def _event_filters(
+        *,
+        action: Optional[str] = None,
+        actor: Optional[str] = None,
+        document_id: Optional[str] = None,
+        query_id: Optional[str] = None,
+        decision: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[str], List[Any]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for column, value in (
+            ("action", action),
+            ("actor", actor),
+            ("document_id", document_id),
+            ("query_id", query_id),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = %s")
+                params.append(value)
+        if decision is not None:
+            if decision not in DECISION_FILTERS:
+                raise ValueError(
+                    f"Unknown audit decision {decision!r}; expected one of {sorted(DECISION_FILTERS)}"
+                )
+            clauses.append(DECISION_FILTERS[decision])
+        if since is not None:
+            clauses.append("created_at >= %s")
+            params.append(since)
+        if until is not None:
+            clauses.append("created_at < %s")
+            params.append(until)
+        return clauses, params
+
+    @staticmethod
+    def count_events(
+        *,
+        actor: Optional[str] = None,
+        decision: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> int:
+        """Live count of events matching the ``query`` filters in [since, until)."""
+        clauses, params = AuditLogRepository._event_filters(
+            actor=actor, decision=decision, since=since, until=until
+        )
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with connection_cursor(read_only=True) as cur:
+            cur.execute(f"SELECT count(*) FROM audit_log {where}", tuple(params))
+            return int(cur.fetchone()[0])
+
+    @staticmethod
+    def iter_events(*, page_size: int = 1000, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """Stream every event matching ``filters`` (see ``query``) one keyset page at a time."""
+        cursor = filters.pop("cursor", None)
+        while True:
+            page = AuditLogRepository.query(cursor=cursor, limit=page_size, **filters)
+            yield from page
+            if len(page) < page_size:
+                return
+            cursor = (page[-1]["created_at"], page[-1]["audit_id"])
+
+    @staticmethod
+    def daily_rollup(metric: str, start_day: date, end_day: date) -> List[Dict[str, Any]]:
+        """Precomputed per-day counts (see audit_maintenance) for ``start_day``..``end_day``."""
+        with connection_cursor(dict_cursor=True, read_only=True) as cur:
+            cur.execute(
+                """
+                SELECT day, subject, count
+                FROM audit_daily_rollup
+                WHERE metric = %s AND day BETWEEN %s AND %s
+                ORDER BY day, count DESC, subject
+                """,
+                (metric, start_day, end_day),
+            )
+            return [dict(row) for row in cur.fetchall()]
+
+    @staticmethod
+    def rollup_total(
+        metric: str,
+        *,
+        subject: Optional[str] = None,
+        start_day: Optional[date] = None,
+        end_day: Optional[date] = None,
+    ) -> int:
+        """Sum of a daily rollup metric, optionally for one subject and a day range."""
+        clauses = ["metric = %s"]
+        params: List[Any] = [metric]
+        for clause, value in (("subject = %s", subject), ("day >= %s", start_day), ("day <= %s", end_day)):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        with connection_cursor(read_only=True) as cur:
+            cur.execute(
+                f"SELECT COALESCE(sum(count), 0) FROM audit_daily_rollup WHERE {' AND '.join(clauses)}",
+                tuple(params),
+            )
+            return int(cur.fetchone()[0])
+
+    @staticmethod
+    def rollup_covered_through() -> Optional[date]:
+        """Last day whose rollup was refreshed after the day had ended; later days are only in audit_log."""
+        with connection_cursor(read_only=True) as cur:
+            cur.execute("SELECT max(day) FROM audit_daily_rollup WHERE refreshed_at >= day + 1")
+            return cur.fetchone()[0]
+
+    @staticmethod
+    def event_total(
+        *,
+        actor: Optional[str] = None,
+        decision: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> int:
+        """
+        Number of events ``query`` would page through for these filters.
+
+        Whole days up to ``rollup_covered_through`` come from the
+        events_by_actor rollups; partial days at either end of
+        [since, until) and days not rolled up yet are counted live, so the
+        total is right before (and between) scheduled ``rollup`` runs.
+        """
+        metric = {None: "events_by_actor", "ALLOW": "allow_events_by_actor", "DENY": "deny_events_by_actor"}.get(
+            decision
+        )
+        if metric is None:
+            raise ValueError(f"Unknown audit decision {decision!r}; expected one of {sorted(DECISION_FILTERS)}")
+        covered = AuditLogRepository.rollup_covered_through()
+        first_day = None
+        if since is not None:
+            first_day = since.date() if since.time() == time.min else since.date() + timedelta(days=1)
+        last_day = covered
+        if covered is not None and until is not None:
+            last_day = min(covered, until.date() - timedelta(days=1))
+        if last_day is None or (first_day is not None and first_day > last_day):
+            return AuditLogRepository.count_events(actor=actor, decision=decision, since=since, until=until)
+
+        tzinfo = (since or until or datetime.min).tzinfo
+        total = AuditLogRepository.rollup_total(metric, subject=actor, start_day=first_day, end_day=last_day)
+        if first_day is not None and since < datetime.combine(first_day, time.min, tzinfo):
+            total += AuditLogRepository.count_events(
+                actor=actor, decision=decision, since=since, until=datetime.combine(first_day, time.min, tzinfo)
+            )
+        total += AuditLogRepository.count_events(
+            actor=actor,
+            decision=decision,
+            since=datetime.combine(last_day + timedelta(days=1), time.min, tzinfo),
+            until=until,
+        )
+        return total
+
+    @staticmethod
+    def event_actors() -> List[str]:
+        """Every actor with events: the events_by_actor rollups plus actors seen live since they were refreshed."""
+        covered = AuditLogRepository.rollup_covered_through()
+        actors = set(AuditLogRepository.rollup_subjects("events_by_actor"))
+        clauses = ""
+        params: Tuple[Any, ...] = ()
+        if covered is not None:
+            clauses = "WHERE created_at >= %s"
+            params = (covered + timedelta(days=1),)
+        with connection_cursor(read_only=True) as cur:
+            cur.execute(f"SELECT DISTINCT actor FROM audit_log {clauses}", params)
+            actors.update(row[0] for row in cur.fetchall())
+        return sorted(actors)
+
+    @staticmethod
+    def rollup_subjects(metric: str) -> List[str]:
+        """Every subject a daily rollup metric has counted, e.g. actors for events_by_actor."""
+        with connection_cursor(read_only=True) as cur:
+            cur.execute(
+                "SELECT DISTINCT subject FROM audit_daily_rollup WHERE metric = %s ORDER BY subject",
+                (metric,),
+            )
+            return [row[0] for row in cur.fetchall()]
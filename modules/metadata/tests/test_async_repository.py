@@ -0,0 +1,87 @@
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+pytest.importorskip("psycopg")
+pytest.importorskip("psycopg_pool")
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.metadata.app import models  # type: ignore
+from modules.metadata.app.async_db import async_pool_stats, close_async_pool  # type: ignore
+from modules.metadata.app.async_repository import (  # type: ignore
+    AsyncAccessRuleRepository,
+    AsyncAuditLogRepository,
+    AsyncDocumentRepository,
+)
+from modules.metadata.app.config import settings  # type: ignore
+from modules.metadata.app.db import connection_cursor  # type: ignore
+
+
+def _db_available() -> bool:
+    try:
+        conn = psycopg2.connect(
+            dbname=settings.db_name,
+            user=settings.db_user,
+            password=settings.db_password,
+            host=settings.db_host,
+            port=settings.db_port,
+            connect_timeout=1,
+        )
+        conn.close()
+        return True
+    except Exception:
+        return False
+
+
+pytestmark = pytest.mark.skipif(
+    not _db_available(),
+    reason="Postgres not available (set POSTGRES_* env vars and start service)",
+)
+
+
+def test_async_repositories_roundtrip_concurrently():
+    doc_ids = [f"doc-{uuid.uuid4()}" for _ in range(4)]
+
+    async def scenario():
+        try:
+            await asyncio.gather(
+                *(
+                    AsyncDocumentRepository.insert(
+                        models.Document(
+                            document_id=doc_id, title="Async", document_type="TEST", authority_level="DRAFT"
+                        )
+                    )
+                    for doc_id in doc_ids
+                )
+            )
+            rule = models.AccessRule(document_id=doc_ids[0], allowed_roles=["viewer"])
+            await AsyncAccessRuleRepository.insert(rule)
+            event = models.AuditLog(actor="tester", action="ASYNC_TEST", document_id=doc_ids[0], details={"k": 1})
+            await AsyncAuditLogRepository.insert_event(event)
+
+            fetched = await asyncio.gather(*(AsyncDocumentRepository.get(doc_id) for doc_id in doc_ids))
+            rules = await AsyncAccessRuleRepository.get_by_document(doc_ids[0])
+            stats = await async_pool_stats()
+            return fetched, rules, event, stats
+        finally:
+            await close_async_pool()
+
+    fetched, rules, event, stats = asyncio.run(scenario())
+    try:
+        assert [row["document_id"] for row in fetched] == doc_ids
+        assert [r["rule_id"] for r in rules] == [rules[0]["rule_id"]]
+        assert rules[0]["allowed_roles"] == ["viewer"]
+        assert event.audit_id is not None
+        assert stats["pool_max"] == settings.pool_max_size
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE document_id = ANY(%s)", (doc_ids,))
+            cur.execute("DELETE FROM access_rules WHERE document_id = ANY(%s)", (doc_ids,))
+            cur.execute("DELETE FROM documents WHERE document_id = ANY(%s)", (doc_ids,))
@@ -0,0 +1,112 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.metadata.app import audit as audit_module  # noqa: E402
+from modules.metadata.app import audit_async, models  # noqa: E402
+
+
+@pytest.fixture
+def written(monkeypatch):
+    batches = []
+
+    def fake_insert(events):
+        batches.append([event.action for event in events])
+        return list(range(len(events)))
+
+    monkeypatch.setattr(audit_async.AuditLogRepository, "insert_events", fake_insert)
+    return batches
+
+
+def _events(*actions):
+    return [models.AuditLog(actor="tester", action=action, details={"query_id": "q"}) for action in actions]
+
+
+def _wait_until_taken(writer):
+    deadline = time.monotonic() + 5
+    while writer.stats()["queued"] and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+def test_writer_batches_and_flushes_on_close(written):
+    writer = audit_async.AsyncAuditWriter(batch_size=2, flush_interval=0.05)
+    writer.submit(_events("A", "B", "C"))
+    writer.close(timeout=5)
+
+    assert [action for batch in written for action in batch] == ["A", "B", "C"]
+    assert max(len(batch) for batch in written) <= 2
+    stats = writer.stats()
+    assert stats["submitted"] == stats["written"] == 3
+    assert stats["queued"] == 0
+
+
+def test_writer_backpressure_blocks_then_raises(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(audit_async.AuditLogRepository, "insert_events", lambda events: release.wait(5))
+    writer = audit_async.AsyncAuditWriter(max_queue=1, batch_size=1, flush_interval=0.01, put_timeout=0.05)
+    try:
+        writer.submit(_events("A"))  # taken by the worker, which then stalls
+        _wait_until_taken(writer)
+        writer.submit(_events("B"))  # fills the queue
+        with pytest.raises(audit_async.AuditQueueFullError):
+            writer.submit(_events("C"))
+    finally:
+        release.set()
+        writer.close(timeout=5)
+
+
+def test_writer_drop_policy_counts_dropped_events(monkeypatch):
+    release = threading.Event()
+    monkeypatch.setattr(audit_async.AuditLogRepository, "insert_events", lambda events: release.wait(5))
+    writer = audit_async.AsyncAuditWriter(
+        max_queue=1, batch_size=1, flush_interval=0.01, put_timeout=0.05, overflow="drop"
+    )
+    try:
+        writer.submit(_events("A"))
+        _wait_until_taken(writer)
+        writer.submit(_events("B"))
+        writer.submit(_events("C", "D"))
+    finally:
+        release.set()
+        writer.close(timeout=5)
+
+    assert writer.stats()["dropped"] == 2
+
+
+def test_async_mode_marks_events_and_surfaces_full_queue(monkeypatch):
+    submitted = []
+
+    class _Writer:
+        def submit(self, events):
+            if len(submitted) >= 1:
+                raise audit_async.AuditQueueFullError("full")
+            submitted.extend(events)
+
+    monkeypatch.setattr(audit_module.settings, "audit_mode", "async")
+    monkeypatch.setattr(audit_module, "get_async_writer", lambda: _Writer())
+    logger = audit_module.AuditLogger(actor="tester")
+
+    logger.search_query(actor=None, query="pumps", query_id="q1", context={"role": "engineer"})
+    assert submitted[0].details["write_mode"] == "async"
+
+    with pytest.raises(audit_module.AuditLogError):
+        logger.search_query(actor=None, query="valves", query_id="q2", context={"role": "engineer"})
+
+
+def test_sync_mode_marks_events_as_sync(monkeypatch):
+    inserted = []
+    monkeypatch.setattr(audit_module.settings, "audit_mode", "sync")
+    monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", inserted.append)
+
+    audit_module.AuditLogger(actor="tester").search_query(actor=None, query="pumps", query_id="q1", context={})
+
+    assert inserted[0].details["write_mode"] == "sync"
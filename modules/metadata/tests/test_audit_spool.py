@@ -0,0 +1,168 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.metadata.app import audit as audit_module  # noqa: E402
+from modules.metadata.app import audit_spool, models  # noqa: E402
+
+
+@pytest.fixture
+def drained(monkeypatch):
+    rows = []
+
+    def fake_insert(spool_id, events):
+        rows.extend((spool_id, seq, event.action) for seq, event in events)
+        return len(events)
+
+    monkeypatch.setattr(audit_spool.AuditLogRepository, "insert_spooled", fake_insert)
+    return rows
+
+
+def _events(*actions):
+    return [models.AuditLog(actor="tester", action=action, details={"query_id": "q"}) for action in actions]
+
+
+def test_spool_drains_in_sequence_and_checkpoints(tmp_path, drained):
+    spool = audit_spool.AuditSpool(tmp_path)
+    assert spool.append(_events("A", "B")) == [1, 2]
+    assert spool.append(_events("C")) == [3]
+
+    assert spool.drain() == 3
+    assert [(seq, action) for _, seq, action in drained] == [(1, "A"), (2, "B"), (3, "C")]
+    assert spool.drain() == 0
+    assert (tmp_path / "checkpoint").read_text() == "3"
+
+
+def test_spool_replays_backlog_after_restart(tmp_path, drained):
+    first = audit_spool.AuditSpool(tmp_path)
+    first.append(_events("A", "B"))
+    first.drain()
+    first.append(_events("C"))
+    segment = first._active
+    first.stop(final_drain=False)
+    with open(segment, "ab") as fh:
+        fh.write(b'{"seq": 4, "actor": "tor')  # crash mid-write
+
+    restarted = audit_spool.AuditSpool(tmp_path)
+    assert restarted.spool_id == first.spool_id
+    assert restarted.append(_events("D")) == [4]
+    assert restarted.drain() == 2
+    assert [action for _, _, action in drained] == ["A", "B", "C", "D"]
+
+
+def test_failed_drain_keeps_events_for_retry(tmp_path, drained, monkeypatch):
+    spool = audit_spool.AuditSpool(tmp_path)
+    spool.append(_events("A"))
+
+    def db_down(spool_id, events):
+        raise RuntimeError("db down")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(audit_spool.AuditLogRepository, "insert_spooled", db_down)
+        with pytest.raises(RuntimeError):
+            spool.drain()
+
+    assert spool.drain() == 1
+    assert [action for _, _, action in drained] == ["A"]
+
+
+def test_rejected_events_are_dead_lettered_without_blocking_the_drain(tmp_path, drained, monkeypatch):
+    spool = audit_spool.AuditSpool(tmp_path)
+    spool.append(_events("A", "BAD", "C"))
+    insert = audit_spool.AuditLogRepository.insert_spooled
+
+    def reject_bad(spool_id, events):
+        if any(event.action == "BAD" for _, event in events):
+            raise audit_spool.psycopg2.IntegrityError("violates foreign key constraint")
+        return insert(spool_id, events)
+
+    monkeypatch.setattr(audit_spool.AuditLogRepository, "insert_spooled", reject_bad)
+    assert spool.drain() == 3
+    assert [action for _, _, action in drained] == ["A", "C"]
+    assert spool.checkpoint == 3
+    assert spool.dead_letters() == 1
+    assert '"action":"BAD"' in (tmp_path / "dead-letter.jsonl").read_text()
+
+
+def test_drained_segments_are_removed(tmp_path, drained):
+    spool = audit_spool.AuditSpool(tmp_path, segment_bytes=1)
+    for action in ("A", "B", "C"):
+        spool.append(_events(action))
+    assert len(spool._segments()) == 3
+
+    spool.drain()
+    assert spool._segments() == [spool._active]
+
+
+def test_spool_directory_is_owned_by_one_spool_at_a_time(tmp_path, drained):
+    owner = audit_spool.AuditSpool(tmp_path)
+    with pytest.raises(audit_spool.SpoolLocked):
+        audit_spool.AuditSpool(tmp_path)
+
+    owner.stop(final_drain=False)
+    assert audit_spool.AuditSpool(tmp_path).spool_id == owner.spool_id
+
+
+def test_spool_directory_is_locked_without_fcntl(tmp_path, drained, monkeypatch):
+    held = set()
+
+    class FakeMsvcrt:
+        LK_NBLCK, LK_UNLCK = 2, 0
+
+        @staticmethod
+        def locking(fd, mode, nbytes):
+            inode = os.fstat(fd).st_ino
+            if mode == FakeMsvcrt.LK_UNLCK:
+                held.discard(inode)
+            elif inode in held:
+                raise OSError("locked")
+            else:
+                held.add(inode)
+
+    monkeypatch.setattr(audit_spool, "fcntl", None)
+    monkeypatch.setattr(audit_spool, "msvcrt", FakeMsvcrt, raising=False)
+    first = audit_spool.claim_spool(tmp_path)
+    second = audit_spool.claim_spool(tmp_path)
+    assert first.spool_id != second.spool_id
+
+    first.stop(final_drain=False)
+    assert audit_spool.claim_spool(tmp_path).directory == first.directory
+
+
+def test_claimed_spools_get_distinct_ids_and_reuse_released_directories(tmp_path, drained):
+    first = audit_spool.claim_spool(tmp_path)
+    second = audit_spool.claim_spool(tmp_path)
+    assert first.directory != second.directory
+    assert first.spool_id != second.spool_id
+    assert first.append(_events("A")) == second.append(_events("B")) == [1]
+
+    first.stop(final_drain=False)
+    reclaimed = audit_spool.claim_spool(tmp_path)
+    assert reclaimed.directory == first.directory
+    assert reclaimed.drain() == 1
+    assert drained == [(first.spool_id, 1, "A")]
+
+
+def test_spool_mode_acknowledges_after_local_write(tmp_path, monkeypatch):
+    spool = audit_spool.AuditSpool(tmp_path)
+    monkeypatch.setattr(audit_module.settings, "audit_mode", "spool")
+    monkeypatch.setattr(audit_module, "get_spool", lambda: spool)
+
+    def fail_insert(_event):
+        raise AssertionError("spool mode must not write to Postgres inline")
+
+    monkeypatch.setattr(audit_module.AuditLogRepository, "insert_event", fail_insert)
+    logger = audit_module.AuditLogger(actor="tester")
+    with logger.buffered():
+        logger.query_received(actor=None, query_id="q", context=None, outcome={})
+        logger.response_returned(actor=None, query_id="q", context=None, outcome={})
+
+    assert [event.action for _, event in spool.pending()] == ["QUERY_RECEIVED", "RESPONSE_RETURNED"]
@@ -0,0 +1,234 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("psycopg2")
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from psycopg2 import extensions  # noqa: E402
+
+from modules.metadata.app import db  # noqa: E402
+
+
+class _FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.connection = conn
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        if self.conn.broken:
+            raise RuntimeError("server closed the connection")
+        self.conn.executed.append(sql)
+        self.conn.params.append(params)
+
+
+class _FakeConnection:
+    def __init__(self):
+        self.closed = 0
+        self.broken = False
+        self.executed = []
+        self.params = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self, name=None, cursor_factory=None):
+        return _FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = 1
+
+    def get_transaction_status(self):
+        return extensions.TRANSACTION_STATUS_IDLE
+
+
+def _pool(**kwargs) -> db.ConnectionPool:
+    return db.ConnectionPool(_FakeConnection, **kwargs)
+
+
+def test_pool_reuses_returned_connection():
+    pool = _pool(max_size=2)
+    first = pool.getconn()
+    pool.putconn(first)
+    second = pool.getconn()
+
+    assert second is first
+    stats = pool.stats()
+    assert stats["creates"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["in_use"] == 1
+
+
+def test_pool_times_out_when_exhausted():
+    pool = _pool(max_size=1, timeout=0.05)
+    pool.getconn()
+
+    with pytest.raises(db.PoolTimeoutError):
+        pool.getconn()
+    assert pool.stats()["waits"] == 1
+
+
+def test_pool_evicts_idle_connections_above_min_size():
+    pool = _pool(min_size=1, max_size=3, max_idle=0.0)
+    conns = [pool.getconn() for _ in range(3)]
+    for conn in conns:
+        pool.putconn(conn)
+
+    pool.getconn()
+    stats = pool.stats()
+    assert stats["evictions"] == 2
+    assert stats["size"] == 1
+
+
+def test_pool_replaces_connection_failing_health_check():
+    pool = _pool(max_size=1, health_check_after=0.0)
+    conn = pool.getconn()
+    pool.putconn(conn)
+    conn.broken = True
+
+    replacement = pool.getconn()
+    assert replacement is not conn
+    assert conn.closed
+    assert pool.stats()["health_check_failures"] == 1
+
+
+def test_connection_cursor_rolls_back_and_returns_connection(monkeypatch):
+    pool = _pool(max_size=1)
+    monkeypatch.setattr(db, "_pool", pool)
+
+    with pytest.raises(ValueError):
+        with db.connection_cursor() as cur:
+            cur.execute("SELECT 1")
+            raise ValueError("boom")
+
+    with db.connection_cursor() as cur:
+        cur.execute("SELECT 2")
+
+    conn = cur.conn
+    assert conn.rollbacks == 1
+    assert conn.commits == 1
+    assert pool.stats()["creates"] == 1
+
+
+def test_transaction_shares_one_connection_and_commits_once(monkeypatch):
+    pool = _pool(max_size=2)
+    monkeypatch.setattr(db, "_pool", pool)
+
+    with db.transaction() as conn:
+        with db.connection_cursor() as first:
+            first.execute("INSERT 1")
+        with db.transaction():
+            with db.connection_cursor(dict_cursor=True) as second:
+                second.execute("INSERT 2")
+
+    assert first.conn is conn and second.conn is conn
+    assert conn.commits == 1
+    assert conn.executed == ["INSERT 1", "INSERT 2"]
+    assert pool.stats()["checkouts"] == 1
+
+
+def test_transaction_rolls_back_on_error(monkeypatch):
+    pool = _pool(max_size=1)
+    monkeypatch.setattr(db, "_pool", pool)
+
+    with pytest.raises(ValueError):
+        with db.transaction() as conn:
+            with db.connection_cursor() as cur:
+                cur.execute("INSERT 1")
+            raise ValueError("boom")
+
+    assert conn.commits == 0
+    assert conn.rollbacks == 1
+    assert pool.stats()["in_use"] == 0
+
+
+def test_execute_prepared_prepares_once_per_connection(monkeypatch):
+    monkeypatch.setattr(db.settings, "prepared_statements", True)
+    conn = _FakeConnection()
+    cur = conn.cursor()
+
+    db.execute_prepared(cur, "stmt_a", "SELECT $1, $2", ("x", [1, 2]))
+    db.execute_prepared(cur, "stmt_a", "SELECT $1, $2", ("y", []))
+
+    assert conn.executed == [
+        "PREPARE stmt_a AS SELECT $1, $2",
+        "EXECUTE stmt_a (%s, %s)",
+        "EXECUTE stmt_a (%s, %s)",
+    ]
+    assert conn.params[-1] == ("y", [])
+
+    other = _FakeConnection()
+    db.execute_prepared(other.cursor(), "stmt_a", "SELECT $1, $2", ("z", []))
+    assert other.executed[0] == "PREPARE stmt_a AS SELECT $1, $2"
+
+
+def test_execute_prepared_binds_client_side_when_disabled(monkeypatch):
+    monkeypatch.setattr(db.settings, "prepared_statements", False)
+    conn = _FakeConnection()
+
+    db.execute_prepared(conn.cursor(), "stmt_b", "SELECT $1 WHERE x = ANY($2)", ("a", ["b"]))
+
+    assert conn.executed == ["SELECT %(p1)s WHERE x = ANY(%(p2)s)"]
+    assert conn.params == [{"p1": "a", "p2": ["b"]}]
+
+
+def _route_pools(monkeypatch, read_connect):
+    primary = _pool(max_size=2)
+    replica = db.ConnectionPool(read_connect, max_size=2)
+    monkeypatch.setattr(db.settings, "read_dsn", "host=replica")
+    monkeypatch.setattr(db, "_pool", primary)
+    monkeypatch.setattr(db, "_read_pool", replica)
+    monkeypatch.setattr(db, "_replica_retry_at", 0.0)
+    return primary, replica
+
+
+def test_read_only_cursor_routes_to_replica(monkeypatch):
+    primary, replica = _route_pools(monkeypatch, _FakeConnection)
+
+    with db.connection_cursor(read_only=True) as read_cur:
+        read_cur.execute("SELECT 1")
+    with db.connection_cursor() as write_cur:
+        write_cur.execute("INSERT 1")
+    with db.transaction() as conn:
+        with db.connection_cursor(read_only=True) as joined:
+            joined.execute("SELECT 2")
+
+    assert replica.stats()["checkouts"] == 1
+    assert primary.stats()["checkouts"] == 2
+    assert read_cur.conn is not write_cur.conn
+    assert joined.conn is conn
+
+
+def test_read_only_cursor_falls_back_to_primary_when_replica_down(monkeypatch):
+    attempts = []
+
+    def unreachable():
+        attempts.append(1)
+        raise db.psycopg2.OperationalError("could not connect to server")
+
+    primary, replica = _route_pools(monkeypatch, unreachable)
+    monkeypatch.setattr(db.settings, "read_retry_after", 60.0)
+
+    for _ in range(2):
+        with db.connection_cursor(read_only=True) as cur:
+            cur.execute("SELECT 1")
+
+    assert primary.stats()["checkouts"] == 2
+    # The second read skips the replica until the retry window passes.
+    assert len(attempts) == 1
+    assert replica.stats()["size"] == 0
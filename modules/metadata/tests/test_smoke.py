@@ -1,18 +1,32 @@
+import io
+import json
 import sys
 import uuid
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[3]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from modules.metadata.app import models
+from modules.metadata.app.audit_maintenance import export_jsonl, refresh_rollup
+from modules.metadata.app.bootstrap import apply_migrations
 from modules.metadata.app.repository import (
     DocumentRepository,
     DocumentVersionRepository,
     ArtefactRepository,
+    ChunkRepository,
+    AuditLogRepository,
 )
-from modules.metadata.app.db import connection_cursor
+from modules.metadata.app.db import connection_cursor, transaction
+
+
+@pytest.fixture(scope="module", autouse=True)
+def migrated():
+    apply_migrations()
 
 
 def test_insert_and_readback_roundtrip():
@@ -61,6 +75,118 @@ def test_insert_and_readback_roundtrip():
     _cleanup_rows(artefact_id=artefact_id, ver_id=ver_id, doc_id=doc_id)
 
 
+def test_transaction_is_atomic_across_repositories():
+    doc_id = f"doc-{uuid.uuid4()}"
+    ver_id = f"ver-{uuid.uuid4()}"
+
+    try:
+        with transaction():
+            DocumentRepository.insert(
+                models.Document(
+                    document_id=doc_id,
+                    title="Rolled Back",
+                    document_type="TEST",
+                    authority_level="DRAFT",
+                )
+            )
+            DocumentVersionRepository.insert(
+                models.DocumentVersion(
+                    version_id=ver_id,
+                    document_id=doc_id,
+                    version_label="A",
+                    source_path="/tmp/file.pdf",
+                    checksum="abc123",
+                )
+            )
+            assert DocumentRepository.get(doc_id) is not None
+            raise RuntimeError("abort unit of work")
+    except RuntimeError:
+        pass
+
+    assert DocumentRepository.get(doc_id) is None
+    assert DocumentVersionRepository.get(ver_id) is None
+
+
+def _seed_lineage() -> tuple:
+    doc_id = f"doc-{uuid.uuid4()}"
+    ver_id = f"ver-{uuid.uuid4()}"
+    artefact_id = f"art-{uuid.uuid4()}"
+    DocumentRepository.insert(
+        models.Document(document_id=doc_id, title="Bulk", document_type="TEST", authority_level="DRAFT")
+    )
+    DocumentVersionRepository.insert(
+        models.DocumentVersion(
+            version_id=ver_id, document_id=doc_id, version_label="A", source_path="/tmp/f", checksum="c"
+        )
+    )
+    ArtefactRepository.insert(
+        models.Artefact(
+            artefact_id=artefact_id, version_id=ver_id, artefact_type="EXTRACTED_TEXT", storage_path="s3://b/k"
+        )
+    )
+    return doc_id, ver_id, artefact_id
+
+
+def _make_chunks(artefact_id: str, count: int) -> list:
+    return [
+        models.Chunk(
+            chunk_id=f"{artefact_id}-{i}",
+            artefact_id=artefact_id,
+            chunk_type="TEXT",
+            content=f'line "{i}",\nwith, commas',
+            metadata={"chunk_index": i} if i else None,
+        )
+        for i in range(count)
+    ]
+
+
+def test_chunk_bulk_insert_skips_existing_rows():
+    doc_id, ver_id, artefact_id = _seed_lineage()
+    chunks = _make_chunks(artefact_id, 3)
+    try:
+        ChunkRepository.insert(chunks[0])
+        assert ChunkRepository.bulk_insert(chunks[:2], page_size=1) == 1
+        assert ChunkRepository.bulk_insert(chunks) == 1
+        lineage = list(ChunkRepository.iter_all_with_lineage(artefact_id=artefact_id))
+        assert {(r["version_id"], r["document_id"]) for r in lineage} == {(ver_id, doc_id)}
+
+        rows = ChunkRepository.get_by_artefact(artefact_id)
+        assert [r["chunk_id"] for r in rows] == [c.chunk_id for c in chunks]
+        assert rows[0]["metadata"] is None
+        assert rows[1]["metadata"] == {"chunk_index": 1}
+        assert rows[2]["content"] == chunks[2].content
+    finally:
+        _cleanup_rows(artefact_id=artefact_id, ver_id=ver_id, doc_id=doc_id)
+
+
+def test_iter_all_with_lineage_streams_and_pages():
+    doc_id, ver_id, artefact_id = _seed_lineage()
+    chunks = _make_chunks(artefact_id, 5)
+    expected = [c.chunk_id for c in chunks]
+    try:
+        ChunkRepository.bulk_insert(chunks)
+
+        streamed = list(ChunkRepository.iter_all_with_lineage(itersize=2, artefact_id=artefact_id))
+        assert [r["chunk_id"] for r in streamed] == expected
+        assert all(r["document_id"] == doc_id and r["version_id"] == ver_id for r in streamed)
+
+        paged = ChunkRepository.iter_all_with_lineage(page_size=2, document_id=doc_id)
+        assert [r["chunk_id"] for r in paged] == expected
+
+        resumed = ChunkRepository.iter_all_with_lineage(
+            page_size=2, after_chunk_id=expected[2], artefact_id=artefact_id
+        )
+        assert [r["chunk_id"] for r in resumed] == expected[3:]
+
+        # Chunks without lineage are not streamed for indexing.
+        with connection_cursor() as cur:
+            cur.execute("UPDATE chunks SET document_id = NULL WHERE chunk_id = %s", (expected[0],))
+        streamed = ChunkRepository.iter_all_with_lineage(artefact_id=artefact_id)
+        assert [r["chunk_id"] for r in streamed] == expected[1:]
+    finally:
+        _cleanup_rows(artefact_id=artefact_id, ver_id=ver_id, doc_id=doc_id)
+
+
 def _cleanup_rows(*, artefact_id: str, ver_id: str, doc_id: str) -> None:
     # Hard delete in dependency order to keep test idempotent.
     with connection_cursor() as cur:
@@ -69,3 +195,300 @@ def _cleanup_rows(*, artefact_id: str, ver_id: str, doc_id: str) -> None:
         cur.execute("DELETE FROM document_versions WHERE version_id = %s", (ver_id,))
         cur.execute("DELETE FROM access_rules WHERE document_id = %s", (doc_id,))
         cur.execute("DELETE FROM documents WHERE document_id = %s", (doc_id,))
+
+
+def test_audit_insert_events_writes_batch_in_order():
+    query_id = f"q-{uuid.uuid4()}"
+    events = [
+        models.AuditLog(actor="tester", action=action, details={"query_id": query_id})
+        for action in ("QUERY_RECEIVED", "SEARCH_QUERY", "RESPONSE_RETURNED")
+    ]
+    try:
+        AuditLogRepository.insert_events(events)
+        ids = [event.audit_id for event in events]
+        assert all(ids) and ids == sorted(ids)
+
+        with connection_cursor() as cur:
+            cur.execute(
+                "SELECT action FROM audit_log WHERE details->>'query_id' = %s ORDER BY audit_id",
+                (query_id,),
+            )
+            assert [row[0] for row in cur.fetchall()] == [event.action for event in events]
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE details->>'query_id' = %s", (query_id,))
+
+
+def test_audit_copy_events_round_trips_nulls_and_contexts():
+    query_id = f"q-{uuid.uuid4()}"
+    context = {"user": "tester", "roles": ["viewer"], "project_codes": [query_id]}
+    events = [
+        models.AuditLog(actor="tester", action="QUERY_RECEIVED", details={"query_id": query_id, "context": context}),
+        models.AuditLog(actor="tester", action="AUTHZ_DENY", model_version="m-1", details={"query_id": query_id, "note": ""}),
+    ]
+    try:
+        assert AuditLogRepository.copy_events(events) == 2
+
+        rows = AuditLogRepository.query(query_id=query_id, ascending=True)
+        assert [row["action"] for row in rows] == ["QUERY_RECEIVED", "AUTHZ_DENY"]
+        assert rows[0]["document_id"] is None and rows[0]["details"]["context"] == context
+        assert rows[1]["model_version"] == "m-1" and rows[1]["details"]["note"] == ""
+    finally:
+        with connection_cursor() as cur:
+            cur.execute(
+                "DELETE FROM audit_log WHERE details->>'query_id' = %s RETURNING context_id", (query_id,)
+            )
+            context_ids = [row[0] for row in cur.fetchall() if row[0] is not None]
+            cur.execute("DELETE FROM audit_contexts WHERE context_id = ANY(%s)", (context_ids,))
+
+
+def test_audit_insert_spooled_is_idempotent_per_sequence():
+    spool_id = f"spool-{uuid.uuid4()}"
+    batch = [
+        (seq, models.AuditLog(actor="tester", action="QUERY_RECEIVED", created_at="2026-01-02T03:04:05+00:00"))
+        for seq in (1, 2)
+    ]
+    try:
+        assert AuditLogRepository.insert_spooled(spool_id, batch) == 2
+        assert AuditLogRepository.insert_spooled(spool_id, batch) == 0
+
+        with connection_cursor() as cur:
+            cur.execute("SELECT count(*) FROM audit_log WHERE spool_id = %s", (spool_id,))
+            assert cur.fetchone()[0] == 2
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE spool_id = %s", (spool_id,))
+
+
+def test_audit_context_snapshots_are_interned():
+    query_id = f"q-{uuid.uuid4()}"
+    context = {"user": "tester", "roles": ["viewer"], "project_codes": [query_id]}
+    events = [
+        models.AuditLog(actor="tester", action=action, details={"query_id": query_id, "context": context})
+        for action in ("QUERY_RECEIVED", "RESPONSE_RETURNED")
+    ]
+    try:
+        AuditLogRepository.insert_events(events[:1])
+        AuditLogRepository.insert_event(events[1])
+
+        with connection_cursor() as cur:
+            cur.execute(
+                "SELECT context_id, details ? 'context' FROM audit_log WHERE details->>'query_id' = %s",
+                (query_id,),
+            )
+            rows = cur.fetchall()
+            assert len({context_id for context_id, _ in rows}) == 1
+            assert not any(inline for _, inline in rows)
+
+        recent = AuditLogRepository.query_recent(10)
+        expanded = [row for row in recent if row["details"].get("query_id") == query_id]
+        assert [row["details"]["context"] for row in expanded] == [context, context]
+    finally:
+        with connection_cursor() as cur:
+            cur.execute(
+                "DELETE FROM audit_log WHERE details->>'query_id' = %s RETURNING context_id", (query_id,)
+            )
+            context_ids = list({row[0] for row in cur.fetchall()})
+            cur.execute("DELETE FROM audit_contexts WHERE context_id = ANY(%s)", (context_ids,))
+
+
+def test_context_ids_from_rolled_back_units_are_not_reused():
+    query_id = f"q-{uuid.uuid4()}"
+    context = {"user": "tester", "roles": ["viewer"], "project_codes": [query_id]}
+
+    def event():
+        details = {"query_id": query_id, "context": context}
+        return models.AuditLog(actor="tester", action="QUERY_RECEIVED", details=details)
+
+    try:
+        with pytest.raises(RuntimeError):
+            with transaction():
+                AuditLogRepository.insert_event(event())
+                raise RuntimeError("abort the unit")
+
+        # The rolled-back audit_contexts row must not be served from the cache.
+        AuditLogRepository.insert_event(event())
+        with transaction():
+            AuditLogRepository.insert_events([event()])
+        rows = AuditLogRepository.query(query_id=query_id)
+        assert [row["details"]["context"] for row in rows] == [context, context]
+    finally:
+        with connection_cursor() as cur:
+            cur.execute(
+                "DELETE FROM audit_log WHERE details->>'query_id' = %s RETURNING context_id", (query_id,)
+            )
+            context_ids = list({row[0] for row in cur.fetchall()})
+            cur.execute("DELETE FROM audit_contexts WHERE context_id = ANY(%s)", (context_ids,))
+
+
+def test_audit_query_pages_by_keyset_and_exports_jsonl():
+    actor = f"auditor-{uuid.uuid4()}"
+    events = [
+        models.AuditLog(actor=actor, action=action, details={"query_id": f"{actor}-{i % 2}"})
+        for i, action in enumerate(["QUERY_RECEIVED", "AUTHZ_DENY", "AUTHZ_DENY", "AUTHZ_ALLOW", "AUTHZ_DENY"])
+    ]
+    try:
+        AuditLogRepository.insert_events(events)
+        newest_first = [event.audit_id for event in reversed(events)]
+
+        pages, cursor = [], None
+        while True:
+            page = AuditLogRepository.query(actor=actor, cursor=cursor, limit=2)
+            pages.append([row["audit_id"] for row in page])
+            if len(page) < 2:
+                break
+            cursor = (page[-1]["created_at"], page[-1]["audit_id"])
+        assert pages == [newest_first[0:2], newest_first[2:4], newest_first[4:]]
+
+        denies = AuditLogRepository.query(actor=actor, action="AUTHZ_DENY", query_id=f"{actor}-0")
+        assert [row["audit_id"] for row in denies] == [events[4].audit_id, events[2].audit_id]
+
+        out = io.StringIO()
+        assert export_jsonl(out, page_size=2, actor=actor) == 5
+        exported = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [row["audit_id"] for row in exported] == [event.audit_id for event in events]
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE actor = %s", (actor,))
+
+
+def test_audit_query_filters_by_decision_including_batches():
+    actor = f"auditor-{uuid.uuid4()}"
+    events = [
+        models.AuditLog(actor=actor, action="AUTHZ_ALLOW", details={"decision": {"decision": "ALLOW"}}),
+        models.AuditLog(actor=actor, action="AUTHZ_DENY", details={"decision": {"decision": "DENY"}}),
+        models.AuditLog(actor=actor, action="AUTHZ_BATCH", details={"allowed_count": 0, "denied_count": 2}),
+        models.AuditLog(actor=actor, action="QUERY_RECEIVED", details={"query_id": "q-1"}),
+    ]
+    try:
+        AuditLogRepository.insert_events(events)
+
+        def ids(decision):
+            return [row["audit_id"] for row in AuditLogRepository.query(actor=actor, decision=decision)]
+
+        assert ids("ALLOW") == [events[0].audit_id]
+        assert ids("DENY") == [events[2].audit_id, events[1].audit_id]
+        with pytest.raises(ValueError, match="ALLOW"):
+            ids("MAYBE")
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE actor = %s", (actor,))
+
+
+def test_rollup_counts_batch_denials_once_per_query():
+    actor = f"auditor-{uuid.uuid4()}"
+    # More than a page of ids: batch rows keep every denied document.
+    denied_docs = sorted(f"doc-{uuid.uuid4()}" for _ in range(250))
+    day = date(2001, 2, 3)
+    events = [
+        models.AuditLog(
+            actor=actor,
+            action="AUTHZ_BATCH",
+            details={"query_id": query_id, "allowed_document_ids": [], "denied_document_ids": denied_docs},
+        )
+        for query_id in ("q-1", "q-1", "q-2")
+    ]
+    try:
+        AuditLogRepository.insert_events(events)
+        with connection_cursor() as cur:
+            cur.execute("UPDATE audit_log SET created_at = %s WHERE actor = %s", (datetime(2001, 2, 3, 9), actor))
+        refresh_rollup(day)
+
+        rows = AuditLogRepository.daily_rollup("denials_by_document", day, day)
+        counts = {row["subject"]: row["count"] for row in rows if row["subject"] in denied_docs}
+        assert counts == {document_id: 2 for document_id in denied_docs}
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE actor = %s", (actor,))
+            cur.execute("DELETE FROM audit_daily_rollup WHERE day = %s", (day,))
+
+
+def test_batch_decision_sets_are_stored_once_and_expanded_on_read():
+    actor = f"auditor-{uuid.uuid4()}"
+    allowed, denied = [f"doc-{uuid.uuid4()}"], sorted(f"doc-{uuid.uuid4()}" for _ in range(3))
+    events = [
+        models.AuditLog(
+            actor=actor,
+            action="AUTHZ_BATCH",
+            details={"query_id": query_id, "allowed_document_ids": allowed, "denied_document_ids": denied},
+        )
+        for query_id in ("q-1", "q-2")
+    ]
+    try:
+        AuditLogRepository.insert_events(events[:1])
+        AuditLogRepository.insert_event(events[1])
+        with connection_cursor() as cur:
+            cur.execute("SELECT DISTINCT decision_set_id, details FROM audit_log WHERE actor = %s", (actor,))
+            stored = cur.fetchall()
+        assert len({set_id for set_id, _ in stored}) == 1
+        assert all("denied_document_ids" not in details for _, details in stored)
+
+        rows = AuditLogRepository.query(actor=actor, ascending=True)
+        assert [row["details"]["query_id"] for row in rows] == ["q-1", "q-2"]
+        assert all(row["details"]["allowed_document_ids"] == allowed for row in rows)
+        assert all(row["details"]["denied_document_ids"] == denied for row in rows)
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE actor = %s", (actor,))
+
+
+def test_rollup_counts_events_per_actor_and_decision():
+    actor = f"auditor-{uuid.uuid4()}"
+    day = date(2001, 2, 4)
+    events = [
+        models.AuditLog(actor=actor, action="QUERY_RECEIVED", details={"query_id": "q-1"}),
+        models.AuditLog(actor=actor, action="AUTHZ_ALLOW", details={"decision": {"decision": "ALLOW"}}),
+        models.AuditLog(actor=actor, action="AUTHZ_DENY", details={"decision": {"decision": "DENY"}}),
+        models.AuditLog(actor=actor, action="AUTHZ_BATCH", details={"allowed_count": 0, "denied_count": 3}),
+    ]
+    try:
+        AuditLogRepository.insert_events(events)
+        with connection_cursor() as cur:
+            cur.execute("UPDATE audit_log SET created_at = %s WHERE actor = %s", (datetime(2001, 2, 4, 9), actor))
+        refresh_rollup(day)
+
+        totals = {
+            metric: AuditLogRepository.rollup_total(metric, subject=actor, start_day=day, end_day=day)
+            for metric in ("events_by_actor", "allow_events_by_actor", "deny_events_by_actor")
+        }
+        assert totals == {"events_by_actor": 4, "allow_events_by_actor": 1, "deny_events_by_actor": 2}
+        assert AuditLogRepository.rollup_total("events_by_actor", subject=actor, start_day=day + timedelta(days=1)) == 0
+        assert actor in AuditLogRepository.rollup_subjects("events_by_actor")
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE actor = %s", (actor,))
+            cur.execute("DELETE FROM audit_daily_rollup WHERE day = %s", (day,))
+
+
+def test_event_total_counts_days_not_rolled_up_live(monkeypatch):
+    actor = f"auditor-{uuid.uuid4()}"
+    late_actor = f"auditor-{uuid.uuid4()}"
+    rolled, live = date(2001, 3, 1), date(2001, 3, 2)
+    events = [models.AuditLog(actor=actor, action="QUERY_RECEIVED", details={"query_id": f"q-{i}"}) for i in range(3)]
+    late = models.AuditLog(actor=late_actor, action="QUERY_RECEIVED", details={"query_id": "q-late"})
+    monkeypatch.setattr(AuditLogRepository, "rollup_covered_through", staticmethod(lambda: rolled))
+    try:
+        AuditLogRepository.insert_events(events + [late])
+        with connection_cursor() as cur:
+            cur.execute(
+                "UPDATE audit_log SET created_at = %s WHERE actor = %s", (datetime(2001, 3, 1, 9), actor)
+            )
+            cur.execute(
+                "UPDATE audit_log SET created_at = %s WHERE audit_id IN (%s, %s)",
+                (datetime(2001, 3, 2, 9), events[2].audit_id, late.audit_id),
+            )
+        refresh_rollup(rolled)
+        # Whole rolled-up days are read from the rollup, not audit_log.
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE audit_id = %s", (events[0].audit_id,))
+
+        assert AuditLogRepository.event_total(actor=actor) == 3
+        assert AuditLogRepository.event_total(actor=actor, since=datetime(2001, 3, 1)) == 3
+        assert AuditLogRepository.event_total(actor=actor, since=datetime(2001, 3, 1, 10)) == 1
+        assert AuditLogRepository.event_total(actor=actor, since=datetime(2001, 3, 1, 8), until=datetime(2001, 3, 2)) == 1
+        assert AuditLogRepository.event_total(actor=actor, until=datetime(2001, 3, 2, 9)) == 2
+        assert {actor, late_actor} <= set(AuditLogRepository.event_actors())
+    finally:
+        with connection_cursor() as cur:
+            cur.execute("DELETE FROM audit_log WHERE actor IN (%s, %s)", (actor, late_actor))
+            cur.execute("DELETE FROM audit_daily_rollup WHERE day IN (%s, %s)", (rolled, live))
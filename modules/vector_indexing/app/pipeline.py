@@ -1,11 +1,12 @@
 """Vector indexing pipeline using Qdrant."""
 
 import uuid
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, List, Optional
 
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
 
+from modules.authority.app.filters import authority_fields_for, document_authority_fields  # type: ignore
 from modules.metadata.app.repository import ChunkRepository  # type: ignore
 
 from .config import settings
@@ -26,7 +27,9 @@ def _batched(items: Iterable[Dict[str, Any]], size: int) -> Iterable[List[Dict[s
         yield batch
 
 
-def _to_payload(row: Dict[str, Any]) -> Dict[str, Any]:
+def _to_payload(
+    row: Dict[str, Any], authority: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
     meta = row.get("metadata") or {}
     return {
         "chunk_id": row["chunk_id"],
@@ -35,11 +38,14 @@ def _to_payload(row: Dict[str, Any]) -> Dict[str, Any]:
         "chunk_index": meta.get("chunk_index"),
         "char_start": meta.get("char_start"),
         "char_end": meta.get("char_end"),
+        **authority_fields_for(authority or {}, row["document_id"]),
     }
 
 
-def _to_point(row: Dict[str, Any]) -> qmodels.PointStruct:
-    payload = _to_payload(row)
+def _to_point(
+    row: Dict[str, Any], authority: Optional[Dict[str, Dict[str, Any]]] = None
+) -> qmodels.PointStruct:
+    payload = _to_payload(row, authority)
     vector = embed_text(row.get("content") or "")
     point_id = str(uuid.uuid5(uuid.NAMESPACE_URL, row["chunk_id"]))
     return qmodels.PointStruct(
@@ -54,10 +60,12 @@ def index_all_chunks() -> int:
     vector_size = get_embedding_dimension()
     recreate_collection(client, settings.collection_name, vector_size)
 
-    rows = ChunkRepository.list_all_with_lineage()
+    # Keyset pages keep no transaction open while batches are being embedded.
+    rows = ChunkRepository.iter_all_with_lineage(page_size=BATCH_SIZE * 16)
     total = 0
     for batch in _batched(rows, BATCH_SIZE):
-        points = [_to_point(r) for r in batch]
+        authority = document_authority_fields(r["document_id"] for r in batch)
+        points = [_to_point(r, authority) for r in batch]
         if points:
             client.upsert(collection_name=settings.collection_name, points=points, wait=True)
             total += len(points)
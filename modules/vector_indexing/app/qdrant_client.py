@@ -3,6 +3,8 @@
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
 
+from modules.authority.app.filters import QDRANT_INDEXED_FIELDS  # type: ignore
+
 from .config import settings
 
 
@@ -23,3 +25,10 @@ def get_client() -> QdrantClient:
 def recreate_collection(client: QdrantClient, collection_name: str, vector_size: int) -> None:
     vectors_config = qmodels.VectorParams(size=vector_size, distance=qmodels.Distance.COSINE)
     client.recreate_collection(collection_name=collection_name, vectors_config=vectors_config)
+    # Keyword indexes keep authority filters cheap at query time.
+    for field_name in QDRANT_INDEXED_FIELDS:
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=qmodels.PayloadSchemaType.KEYWORD,
+        )
@@ -11,7 +11,8 @@ if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from modules.authority.app.context import AuthorityContext  # type: ignore
-from modules.authority.app.engine import get_allowed_document_ids  # type: ignore
+from modules.authority.app.engine import get_allowed_acl_groups, get_allowed_document_ids  # type: ignore
+from modules.authority.app.filters import qdrant_acl_filter  # type: ignore
 from modules.authority.app.policy import load_default_context  # type: ignore
 from modules.metadata.app.audit import audit_logger  # type: ignore
 from .config import settings
@@ -36,6 +37,13 @@ def search(query: str, limit: int | None = None, *, context: AuthorityContext |
         )
         return
 
+    # A handful of ACL group ids instead of every allowed document id, when opted in.
+    acl_groups = get_allowed_acl_groups(ctx)
+    if acl_groups is None:
+        query_filter = {"must": [{"key": "document_id", "match": {"any": list(allowed_doc_ids)}}]}
+    else:
+        query_filter = qdrant_acl_filter(acl_groups)
+
     client = get_client()
     vector = embed_text(query)
     top_k = limit or settings.search_top_k
@@ -46,17 +54,12 @@ def search(query: str, limit: int | None = None, *, context: AuthorityContext |
         limit=top_k,
         with_payload=True,
         with_vectors=False,
-        query_filter={
-            "must": [
-                {
-                    "key": "document_id",
-                    "match": {"any": list(allowed_doc_ids)},
-                }
-            ]
-        },
+        query_filter=query_filter,
     )
 
     results: List[qmodels.ScoredPoint] = getattr(response, "points", [])
+    # Groups are indexed per point and can lag rule changes; the allowed set is authoritative.
+    results = [r for r in results if (r.payload or {}).get("document_id") in allowed_doc_ids]
 
     if not results:
         print("No results")
@@ -128,19 +128,28 @@ def _index_and_validate() -> Tuple[int, int]:
 def _fetch_audit_examples(query_id: str) -> List[str]:
     rows: List[str] = []
     with connection_cursor(dict_cursor=True) as cur:
+        # Per-document rows, or the AUTHZ_BATCH row listing every decision
+        # (PLK_AUTHZ_AUDIT_POLICY=batch, the default).
         cur.execute(
             """
-            SELECT action, document_id, details
-            FROM audit_log
-            WHERE details->>'query_id' = %s
-              AND action IN ('AUTHZ_ALLOW', 'AUTHZ_DENY')
+            SELECT action, document_id, details, allowed_document_ids, denied_document_ids
+            FROM audit_log_expanded
+            WHERE query_id = %s
+              AND action IN ('AUTHZ_ALLOW', 'AUTHZ_DENY', 'AUTHZ_BATCH')
             ORDER BY audit_id DESC
             LIMIT 2
             """,
             (query_id,),
         )
         for row in cur.fetchall():
-            rows.append(f"{row['action']} doc={row['document_id']} details={row['details']}")
+            details = row["details"] or {}
+            if row["action"] == "AUTHZ_BATCH":
+                rows.append(
+                    f"AUTHZ_BATCH allowed={row['allowed_document_ids']} "
+                    f"denied={row['denied_document_ids']} deny_reasons={details.get('deny_reasons')}"
+                )
+            else:
+                rows.append(f"{row['action']} doc={row['document_id']} details={details}")
     return rows
 
 
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+"""
+Benchmark: cost of audit logging per query.
+
+Drives AuditLogger through the events one hybrid search emits (query
+received, search, an AUTHZ_BATCH over the candidates, filtering, results,
+response) from several threads, once per audit mode:
+
+- sync: one INSERT per event,
+- buffered: one multi-row INSERT per query,
+- copy: one COPY per query.
+
+Reports events/s, p50/p99 audit write latency per query, pool connections
+opened and the peak number of server backends. Rows are written with actor
+``bench_audit`` and deleted afterwards unless --keep is given.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+load_dotenv(ROOT / "env" / ".env", override=False)
+load_dotenv(ROOT / "ops" / "docker" / ".env", override=False)
+
+from modules.metadata.app.audit import AuditLogger  # type: ignore
+from modules.metadata.app.config import settings  # type: ignore
+from modules.metadata.app.db import connection_cursor, get_connection, pool_stats  # type: ignore
+
+_ACTOR = "bench_audit"
+_MODES = ("sync", "buffered", "copy")
+_EVENTS_PER_QUERY = 7
+
+
+class _BackendSampler:
+    """Polls pg_stat_activity on its own connection and keeps the peak backend count."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        conn = get_connection()
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                while not self._stop.is_set():
+                    cur.execute(
+                        "SELECT count(*) FROM pg_stat_activity "
+                        "WHERE datname = current_database() AND pid <> pg_backend_pid()"
+                    )
+                    self.peak = max(self.peak, cur.fetchone()[0])
+                    self._stop.wait(self.interval)
+        finally:
+            conn.close()
+
+
+def _one_query(logger: AuditLogger, candidates: int) -> float:
+    query_id = f"bench-{uuid.uuid4()}"
+    context = SimpleNamespace(
+        user=_ACTOR,
+        roles=["engineer"],
+        project_codes=["BENCH"],
+        discipline="mechanical",
+        classification="internal",
+        commercial_sensitivity="low",
+    )
+    decisions = [
+        SimpleNamespace(document_id=f"bench-doc-{i}", allowed=i % 4 != 0, reasons=["role_mismatch"])
+        for i in range(candidates)
+    ]
+    allowed = [d.document_id for d in decisions if d.allowed]
+    start = time.perf_counter()
+    with logger.buffered():
+        logger.query_received(actor=None, query_id=query_id, context=context, outcome="ok")
+        logger.search_query(actor=None, query="pump seal failure", context=context, query_id=query_id)
+        logger.search_executed(actor=None, query_id=query_id, context=context, outcome=candidates)
+        logger.authz_batch(context=context, decisions=decisions, query_id=query_id)
+        logger.results_filtered(actor=None, query_id=query_id, context=context, outcome=len(allowed))
+        logger.search_results_returned(
+            actor=None, count=len(allowed), document_ids=allowed, context=context, query_id=query_id
+        )
+        logger.response_returned(actor=None, query_id=query_id, context=context, outcome="ok")
+    return (time.perf_counter() - start) * 1000
+
+
+def _run_mode(mode: str, *, queries: int, concurrency: int, candidates: int) -> None:
+    settings.audit_mode = mode
+    logger = AuditLogger(actor=_ACTOR)
+    before = pool_stats()
+    with _BackendSampler() as sampler, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        start = time.perf_counter()
+        latencies = list(executor.map(lambda _: _one_query(logger, candidates), range(queries)))
+        elapsed = time.perf_counter() - start
+    after = pool_stats()
+
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    events = queries * _EVENTS_PER_QUERY
+    print(
+        f"{mode:<9} events/s={events / elapsed:9.0f} "
+        f"p50={statistics.median(latencies):7.2f}ms p99={p99:7.2f}ms "
+        f"pool_opened={after['creates'] - before['creates']:3d} pool_size={after['size']:3d} "
+        f"peak_backends={sampler.peak:3d}"
+    )
+
+
+def _cleanup() -> int:
+    with connection_cursor() as cur:
+        cur.execute("DELETE FROM audit_log WHERE actor = %s", (_ACTOR,))
+        return cur.rowcount
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark audit logging modes")
+    parser.add_argument("--modes", nargs="+", choices=_MODES, default=list(_MODES))
+    parser.add_argument("--queries", type=int, default=2000, help="Queries per mode")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent query threads")
+    parser.add_argument("--candidates", type=int, default=50, help="Documents per AUTHZ_BATCH")
+    parser.add_argument("--keep", action="store_true", help="Keep the benchmark rows in audit_log")
+    args = parser.parse_args(argv)
+
+    print(
+        f"queries={args.queries} concurrency={args.concurrency} candidates={args.candidates} "
+        f"events_per_query={_EVENTS_PER_QUERY} pool_max={settings.pool_max_size}"
+    )
+    try:
+        for mode in args.modes:
+            _run_mode(mode, queries=args.queries, concurrency=args.concurrency, candidates=args.candidates)
+    finally:
+        if not args.keep:
+            print(f"deleted {_cleanup()} benchmark rows", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
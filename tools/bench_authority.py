@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+"""
+Benchmark: authority evaluation over synthetic document/rule corpora.
+
+Generates documents whose rules are drawn from a fixed number of rule-set
+templates (most real documents share theirs), then measures per corpus
+size:
+
+- row-by-row: _group_rows + _evaluate_grouped_document per document (the
+  engine path with PLK_AUTHORITY_RULE_INDEX=false),
+- index build: compiling the RuleIndex, with its traced memory,
+- index decisions: RuleIndex.decisions (per-document audit policies),
+- allowed set: RuleIndex.allowed_ids, the bitmap-only allowed_bits and
+  summary (what get_allowed_document_ids computes for batch audits),
+- cache hit: an AllowedSetCache lookup for an already computed context.
+
+Decision paths report decisions/s, set paths p50/p99 latency. Auditing is
+not included; see bench_audit.py. With --backend postgres the corpus is
+first loaded into the configured database (document ids prefixed
+``bench-auth-``, deleted afterwards unless --keep is given), and the fetch
+of all rules and of a 50-document candidate set is timed too. Every slow
+path runs until --budget seconds have passed, so 1M documents stay usable.
+"""
+
+import argparse
+import csv
+import io
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+load_dotenv(ROOT / "env" / ".env", override=False)
+load_dotenv(ROOT / "ops" / "docker" / ".env", override=False)
+
+from modules.authority.app import engine  # type: ignore
+from modules.authority.app.allowed_cache import AllowedSetCache  # type: ignore
+from modules.authority.app.context import AuthorityContext  # type: ignore
+from modules.authority.app.repository import fetch_documents_with_rules  # type: ignore
+from modules.authority.app.rule_index import RuleIndex  # type: ignore
+
+_PREFIX = "bench-auth-"
+_DISCIPLINES = ["civil", "electrical", "mechanical", "process", "piping", "structural"]
+_CLASSIFICATIONS = ["public", "internal", "confidential", "secret"]
+_SENSITIVITIES = ["low", "medium", "high"]
+_ROLES = [f"role_{i:02d}" for i in range(20)]
+
+
+class Corpus:
+    """Synthetic rows in the shape fetch_documents_with_rules returns, plus query contexts."""
+
+    def __init__(self, documents: int, *, rule_sets: int, projects: int, contexts: int, seed: int):
+        rng = random.Random(seed)
+        project_codes = [f"P{i:04d}" for i in range(projects)]
+
+        def maybe(values: List[str], unset: float) -> Optional[str]:
+            return None if rng.random() < unset else rng.choice(values)
+
+        templates = [
+            [
+                (
+                    maybe(project_codes, 0.1),
+                    maybe(_DISCIPLINES, 0.4),
+                    maybe(_CLASSIFICATIONS, 0.5),
+                    maybe(_SENSITIVITIES, 0.6),
+                    sorted(rng.sample(_ROLES, rng.randint(1, 3))),
+                )
+                for _ in range(rng.randint(1, 3))
+            ]
+            for _ in range(rule_sets)
+        ]
+        self.rows: List[Dict] = []
+        rule_id = 0
+        for i in range(documents):
+            document_id = f"{_PREFIX}{i:07d}"
+            level = "RUMOUR" if rng.random() < 0.02 else rng.choice(["AUTHORITATIVE", "DRAFT", "REFERENCE"])
+            base = {
+                "document_id": document_id,
+                "authority_level": level,
+                "document_project_code": None,
+                "rule_id": None,
+                "rule_project_code": None,
+                "discipline": None,
+                "classification": None,
+                "commercial_sensitivity": None,
+                "allowed_roles": None,
+            }
+            if rng.random() < 0.01:
+                self.rows.append(base)
+                continue
+            for project, discipline, classification, sensitivity, roles in rng.choice(templates):
+                rule_id += 1
+                self.rows.append(
+                    {
+                        **base,
+                        "rule_id": rule_id,
+                        "rule_project_code": project,
+                        "discipline": discipline,
+                        "classification": classification,
+                        "commercial_sensitivity": sensitivity,
+                        "allowed_roles": roles,
+                    }
+                )
+        self.contexts = [
+            AuthorityContext(
+                user=f"bench-{i}",
+                roles=rng.sample(_ROLES, rng.randint(1, 3)),
+                project_codes=rng.sample(project_codes, min(len(project_codes), rng.randint(1, 5))),
+                discipline=rng.choice(_DISCIPLINES),
+                classification=maybe(_CLASSIFICATIONS, 0.3),
+                commercial_sensitivity=maybe(_SENSITIVITIES, 0.3),
+            )
+            for i in range(contexts)
+        ]
+
+
+def _timed(fn: Callable[[object], object], items: list, budget: float) -> List[float]:
+    """Run fn over items until they are exhausted or ``budget`` seconds passed; ms per call."""
+    samples: List[float] = []
+    deadline = time.perf_counter() + budget
+    for item in items:
+        start = time.perf_counter()
+        fn(item)
+        samples.append((time.perf_counter() - start) * 1000)
+        if time.perf_counter() >= deadline:
+            break
+    return samples
+
+
+def _percentiles(samples: List[float]) -> Tuple[float, float]:
+    ordered = sorted(samples)
+    return statistics.median(ordered), ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+
+def _report_rate(name: str, samples: List[float], documents: int) -> None:
+    rate = documents * len(samples) / (sum(samples) / 1000)
+    print(f"  {name:<17} decisions/s={rate:11.0f} per_context={statistics.mean(samples):9.2f}ms n={len(samples)}")
+
+
+def _report_latency(name: str, samples: List[float], unit: str = "ms") -> None:
+    p50, p99 = _percentiles(samples)
+    scale = 1000 if unit == "us" else 1
+    print(f"  {name:<17} p50={p50 * scale:9.3f}{unit} p99={p99 * scale:9.3f}{unit} n={len(samples)}")
+
+
+def _traced(fn: Callable[[], object]) -> Tuple[object, float]:
+    """fn() and the MiB it left allocated."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        return result, (tracemalloc.get_traced_memory()[0] - before) / (1 << 20)
+    finally:
+        tracemalloc.stop()
+
+
+def _run_paths(rows: List[Dict], contexts: List[AuthorityContext], *, budget: float) -> None:
+    start = time.perf_counter()
+    grouped = engine._group_rows(rows)
+    group_ms = (time.perf_counter() - start) * 1000
+    documents = len(grouped)
+    print(f"  {'group rows':<17} {group_ms:9.1f}ms documents={documents}")
+    _report_rate(
+        "row-by-row",
+        _timed(lambda ctx: [engine._evaluate_grouped_document(ctx, d, grouped) for d in grouped], contexts, budget),
+        documents,
+    )
+    del grouped
+
+    start = time.perf_counter()
+    index = RuleIndex(rows)
+    build_ms = (time.perf_counter() - start) * 1000
+    _, index_mib = _traced(lambda: RuleIndex(rows))
+    stats = index.stats
+    print(
+        f"  {'index build':<17} {build_ms:9.1f}ms memory={index_mib:7.1f}MiB bitmaps={stats['bitmap_bytes'] / 1024:8.1f}KiB "
+        f"groups={stats['groups']} classes={stats['classes']}"
+    )
+    _report_rate("index decisions", _timed(index.decisions, contexts, budget), documents)
+
+    sizes = [len(index.allowed_ids(ctx)) for ctx in contexts]
+    print(f"  {'allowed docs':<17} mean={statistics.mean(sizes):11.0f} max={max(sizes)}")
+    _report_latency("allowed_ids", _timed(index.allowed_ids, contexts, budget))
+    _report_latency("allowed_bits", _timed(index.allowed_bits, contexts, budget))
+    _report_latency("summary", _timed(index.summary, contexts, budget))
+
+    cache: "AllowedSetCache[object]" = AllowedSetCache(max_entries=len(contexts), ttl=3600)
+    for ctx in contexts:
+        cache.get_or_compute(1, ctx, lambda: ctx)
+    _report_latency("cache hit", _timed(lambda ctx: cache.get_or_compute(1, ctx, lambda: None), contexts, budget), "us")
+
+
+def _copy(cur, table: str, columns: str, records: List[tuple]) -> None:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        writer.writerow(["" if value is None else value for value in record])
+    buffer.seek(0)
+    cur.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _load(rows: List[Dict]) -> None:
+    from modules.metadata.app.db import connection_cursor  # type: ignore
+
+    documents = {}
+    rules = []
+    for row in rows:
+        documents.setdefault(row["document_id"], row["authority_level"])
+        if row["rule_id"] is not None:
+            roles = "{" + ",".join(row["allowed_roles"]) + "}"
+            rules.append(
+                (
+                    row["document_id"],
+                    row["rule_project_code"],
+                    row["discipline"],
+                    row["classification"],
+                    row["commercial_sensitivity"],
+                    roles,
+                )
+            )
+    with connection_cursor() as cur:
+        _copy(
+            cur,
+            "documents",
+            "document_id, title, document_type, authority_level",
+            [(doc, "Bench", "BENCH", level) for doc, level in documents.items()],
+        )
+        _copy(
+            cur,
+            "access_rules",
+            "document_id, project_code, discipline, classification, commercial_sensitivity, allowed_roles",
+            rules,
+        )
+    # Fresh statistics, as autovacuum would have after a real bulk load.
+    with connection_cursor() as cur:
+        cur.execute("ANALYZE documents")
+        cur.execute("ANALYZE access_rules")
+
+
+def _cleanup() -> int:
+    from modules.metadata.app.db import connection_cursor  # type: ignore
+
+    with connection_cursor() as cur:
+        cur.execute("DELETE FROM access_rules WHERE document_id LIKE %s", (_PREFIX + "%",))
+        cur.execute("DELETE FROM documents WHERE document_id LIKE %s", (_PREFIX + "%",))
+        return cur.rowcount
+
+
+def _run_postgres(corpus: Corpus, *, budget: float, keep: bool) -> None:
+    from modules.metadata.app.bootstrap import apply_migrations  # type: ignore
+
+    apply_migrations()
+    _cleanup()
+    start = time.perf_counter()
+    _load(corpus.rows)
+    print(f"  {'load (COPY)':<17} {(time.perf_counter() - start) * 1000:9.1f}ms rows={len(corpus.rows)}")
+    try:
+        fetch_ms = _timed(lambda _: fetch_documents_with_rules(), [None] * 3, budget)
+        _report_latency("fetch all rules", fetch_ms)
+        candidates = sorted({row["document_id"] for row in corpus.rows})
+        rng = random.Random(0)
+        samples = [rng.sample(candidates, min(50, len(candidates))) for _ in range(200)]
+        _report_latency("fetch 50 docs", _timed(fetch_documents_with_rules, samples, budget))
+        # Every document in the database, as get_allowed_document_ids sees them.
+        _run_paths(fetch_documents_with_rules(), corpus.contexts, budget=budget)
+    finally:
+        if not keep:
+            print(f"deleted {_cleanup()} benchmark documents", file=sys.stderr)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark authority evaluation on synthetic corpora")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1_000, 100_000, 1_000_000], help="Document counts")
+    parser.add_argument("--backend", choices=("memory", "postgres"), default="memory")
+    parser.add_argument("--rule-sets", type=int, default=500, help="Distinct rule-set templates")
+    parser.add_argument("--projects", type=int, default=200, help="Distinct project codes")
+    parser.add_argument("--contexts", type=int, default=50, help="Query contexts evaluated per path")
+    parser.add_argument("--budget", type=float, default=10.0, help="Seconds per path before it stops early")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="Keep the loaded corpus in Postgres")
+    args = parser.parse_args(argv)
+
+    for size in args.sizes:
+        corpus, rows_mib = _traced(
+            lambda: Corpus(
+                size, rule_sets=args.rule_sets, projects=args.projects, contexts=args.contexts, seed=args.seed
+            )
+        )
+        print(
+            f"documents={size} rules={sum(1 for row in corpus.rows if row['rule_id'] is not None)} "
+            f"rule_sets={args.rule_sets} contexts={args.contexts} backend={args.backend} rows={rows_mib:.1f}MiB"
+        )
+        if args.backend == "postgres":
+            _run_postgres(corpus, budget=args.budget, keep=args.keep)
+        else:
+            _run_paths(corpus.rows, corpus.contexts, budget=args.budget)
+        del corpus
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark: parse/plan cost of the hot metadata queries.
+
+Compares, on one connection each:
+- the legacy IN (...) form (new statement text per list length),
+- the stable = ANY(%s) form bound client-side,
+- the same statement executed as a server-side prepared statement.
+
+Only reads are issued, so it is safe to run against a populated database.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+os.chdir(ROOT)
+
+load_dotenv(ROOT / "env" / ".env", override=False)
+load_dotenv(ROOT / "ops" / "docker" / ".env", override=False)
+
+from modules.metadata.app.db import get_connection  # type: ignore
+
+_RULES_SELECT = """
+    SELECT
+        d.document_id,
+        d.authority_level,
+        d.project_code AS document_project_code,
+        ar.rule_id,
+        ar.project_code AS rule_project_code,
+        ar.discipline,
+        ar.classification,
+        ar.commercial_sensitivity,
+        ar.allowed_roles
+    FROM documents d
+    LEFT JOIN access_rules ar ON ar.document_id = d.document_id
+"""
+
+
+def _sample_ids(cur, limit: int) -> list[str]:
+    cur.execute("SELECT document_id FROM documents ORDER BY document_id LIMIT %s", (limit,))
+    ids = [row[0] for row in cur.fetchall()]
+    return ids or [f"missing-{i}" for i in range(limit)]
+
+
+def _time(fn, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1_000_000)
+    return samples
+
+
+def _report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{label:<24} mean={statistics.mean(samples):8.1f}us "
+        f"p50={statistics.median(samples):8.1f}us p99={p99:8.1f}us"
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark prepared vs ad-hoc hot queries")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--max-ids", type=int, default=20, help="Upper bound on ids per lookup")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    conn = get_connection()
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            ids = _sample_ids(cur, args.max_ids)
+            lookups = [rng.sample(ids, rng.randint(1, len(ids))) for _ in range(args.iterations)]
+            it = iter(lookups * 3)
+
+            def in_list():
+                batch = next(it)
+                placeholders = ",".join(["%s"] * len(batch))
+                cur.execute(_RULES_SELECT + f" WHERE d.document_id IN ({placeholders})", tuple(batch))
+                cur.fetchall()
+
+            def any_adhoc():
+                cur.execute(_RULES_SELECT + " WHERE d.document_id = ANY(%s)", (next(it),))
+                cur.fetchall()
+
+            cur.execute("PREPARE bench_rules AS " + _RULES_SELECT + " WHERE d.document_id = ANY($1)")
+
+            def any_prepared():
+                cur.execute("EXECUTE bench_rules (%s)", (next(it),))
+                cur.fetchall()
+
+            print(f"iterations={args.iterations} ids_per_lookup=1..{len(ids)}")
+            _report("IN (...) ad-hoc", _time(in_list, args.iterations))
+            _report("= ANY(%s) ad-hoc", _time(any_adhoc, args.iterations))
+            _report("= ANY($1) prepared", _time(any_prepared, args.iterations))
+            cur.execute("DEALLOCATE bench_rules")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()